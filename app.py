@@ -1,16 +1,52 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Blueprint, Flask, render_template, request, jsonify, Response, stream_with_context, redirect, url_for
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
 from datetime import datetime
+import logging
 import os
 from dotenv import load_dotenv
 
-app = Flask(__name__)
-load_dotenv()
+db = SQLAlchemy()
+bp = Blueprint('main', __name__)
 
-# Configure database
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///faculty_research.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db = SQLAlchemy(app)
+logger = logging.getLogger(__name__)
+
+def create_app(config=None):
+    """
+    Build and configure the Flask application. Heavy modules (scrapers,
+    search, NumPy-backed metrics) are imported by the views that need them,
+    so creating an app only costs Flask and SQLAlchemy.
+    """
+    from core.logs import configure_logging, init_app as init_logging
+    from core.telemetry import init_app as init_telemetry
+    from core.profiling import init_app as init_profiling
+
+    load_dotenv()
+    flask_app = Flask(__name__)
+    flask_app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///faculty_research.db')
+    flask_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if config:
+        flask_app.config.update(config)
+
+    db.init_app(flask_app)
+    flask_app.register_blueprint(bp)
+    configure_logging()
+    init_logging(flask_app)
+    init_telemetry(flask_app)
+    init_profiling(flask_app)
+    return flask_app
+
+_app = None
+
+def __getattr__(name):
+    # `from app import app` (scripts, workers, gunicorn app:app) gets a
+    # process-wide instance created on first access
+    global _app
+    if name == 'app':
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Database Models
 class Faculty(db.Model):
@@ -19,6 +55,7 @@ class Faculty(db.Model):
     college = db.Column(db.String(200), nullable=False)
     department = db.Column(db.String(100), nullable=False)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    block_key = db.Column(db.String(120), index=True)  # initial + family name, see scrapers/name_index.py; set on flush
     publications = db.relationship('Publication', backref='faculty', lazy=True)
 
 class Publication(db.Model):
@@ -32,151 +69,377 @@ class Publication(db.Model):
     faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.id'), nullable=False)
     is_disambiguated = db.Column(db.Boolean, default=False)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    work_id = db.Column(db.Integer, db.ForeignKey('work.id'), index=True)  # canonical work, see core/works.py
+    row_version = db.Column(db.Integer, index=True)  # data version of the last update, see core/snapshot.py
+    normalized_title = db.Column(db.String(500))  # see core/titles.py, set on flush
+    fingerprint = db.Column(db.String(40))  # SHA-1 of normalized_title
+
+    __table_args__ = (
+        # Covers the per-faculty (id, year, citations) scans in core/streaming.py and core/metrics.py
+        db.Index('ix_publication_faculty_stats', 'faculty_id', 'year', 'citations'),
+        # Per-faculty duplicate checks by title
+        db.Index('ix_publication_faculty_fingerprint', 'faculty_id', 'fingerprint'),
+    )
+
+class Work(db.Model):
+    """Canonical publication, stored once however many faculty members authored it; their Publication rows point at it"""
+    id = db.Column(db.Integer, primary_key=True)
+    doi = db.Column(db.String(100), unique=True)  # lowercase; NULL when unknown
+    fingerprint = db.Column(db.String(40), nullable=False, index=True)  # hash of the normalized title
+    title = db.Column(db.String(500), nullable=False)
+    authors = db.Column(db.String(500))
+    journal = db.Column(db.String(200))
+    year = db.Column(db.Integer)
+    citations = db.Column(db.Integer, default=0)
+    last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+
+class CoauthorEdge(db.Model):
+    """Sparse co-authorship adjacency: papers a faculty member shares with a collaborator, maintained by core/coauthors.py"""
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.id'), primary_key=True)
+    collaborator_key = db.Column(db.String(120), primary_key=True)  # initial + family name
+    collaborator_name = db.Column(db.String(200))
+    collaborator_faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.id'), index=True)  # set when a stored faculty member
+    weight = db.Column(db.Integer, nullable=False, default=0)  # papers co-authored
+
+    __table_args__ = (
+        # Re-linking edges that name a refreshed faculty member
+        db.Index('ix_coauthor_edge_key', 'collaborator_key'),
+    )
 
-@app.route('/')
+class RefreshRun(db.Model):
+    """One pass of the scheduled refresh over every faculty member"""
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    items = db.relationship('RefreshRunItem', backref='run', lazy=True)
+
+class RefreshRunItem(db.Model):
+    """Per-faculty progress within a refresh run"""
+    __table_args__ = (db.UniqueConstraint('run_id', 'faculty_id'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('refresh_run.id'), nullable=False, index=True)
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.id'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, in_flight, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SchedulerLease(db.Model):
+    """Named lease used to elect a single scheduler across processes and hosts"""
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(200), nullable=False)
+    acquired_at = db.Column(db.DateTime, default=datetime.utcnow)
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class SearchJob(db.Model):
+    """Queued faculty search, processed by the worker pool in core/jobs.py"""
+    __table_args__ = (
+        # At most one queued or running job per normalized search
+        db.Index('ix_search_job_active_key', 'search_key', unique=True,
+                 sqlite_where=db.text("status IN ('queued', 'running')"),
+                 postgresql_where=db.text("status IN ('queued', 'running')")),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    search_key = db.Column(db.String(400), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    college = db.Column(db.String(200), nullable=False)
+    department = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, done, failed
+    stage = db.Column(db.String(200))
+    progress = db.Column(db.Integer, default=0)
+    result = db.Column(db.Text)  # JSON payload of the finished search
+    error = db.Column(db.Text)
+    worker = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SearchBatch(db.Model):
+    """Roster of searches submitted together through /search/batch or core/batch.py"""
+    id = db.Column(db.String(32), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)  # distinct roster rows
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SearchBatchItem(db.Model):
+    """Search job serving a batch row; coalesced rows share an existing job"""
+    batch_id = db.Column(db.String(32), db.ForeignKey('search_batch.id'), primary_key=True)
+    job_id = db.Column(db.String(32), db.ForeignKey('search_job.id'), primary_key=True)
+
+class SearchJobEvent(db.Model):
+    """Progress event emitted while a search job runs, replayed over SSE"""
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(32), db.ForeignKey('search_job.id'), nullable=False, index=True)
+    event = db.Column(db.String(50), nullable=False)
+    data = db.Column(db.Text)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class FacultyMetrics(db.Model):
+    """Precomputed bibliometrics per faculty member, maintained by core/metrics.py"""
+    faculty_id = db.Column(db.Integer, db.ForeignKey('faculty.id'), primary_key=True)
+    total_publications = db.Column(db.Integer, default=0)
+    total_citations = db.Column(db.Integer, default=0)
+    h_index = db.Column(db.Integer, default=0)
+    i10_index = db.Column(db.Integer, default=0)
+    g_index = db.Column(db.Integer, default=0)
+    citations_per_year = db.Column(db.Float, default=0)
+    m_quotient = db.Column(db.Float, default=0)
+    first_year = db.Column(db.Integer)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class DepartmentYearRollup(db.Model):
+    """Publication counts and citations per (college, department, year); year 0 means unknown"""
+    college = db.Column(db.String(200), primary_key=True)
+    department = db.Column(db.String(100), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True, index=True)
+    publications = db.Column(db.Integer, default=0)
+    citations = db.Column(db.Integer, default=0)
+
+class DepartmentRollup(db.Model):
+    """Per-department totals and h-index distribution, maintained by core/rollups.py"""
+    college = db.Column(db.String(200), primary_key=True)
+    department = db.Column(db.String(100), primary_key=True)
+    faculty_count = db.Column(db.Integer, default=0)
+    publications = db.Column(db.Integer, default=0)
+    citations = db.Column(db.Integer, default=0)
+    h_index_mean = db.Column(db.Float, default=0)
+    h_index_median = db.Column(db.Float, default=0)
+    h_index_max = db.Column(db.Integer, default=0)
+    h_index_histogram = db.Column(db.Text)  # JSON: bucket label -> faculty count
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class DataVersion(db.Model):
+    """Counter bumped on every publication write; dashboards push updates when it moves"""
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+def init_schema():
+    """
+    Create missing tables, and add nullable columns and indexes that were
+    introduced after an existing table was created.
+    """
+    db.create_all()
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+PUBLICATIONS_VERSION = 'publications'
+# Bumped only when publications are deleted, which incremental readers cannot see
+PUBLICATION_DELETES_VERSION = 'publication_deletes'
+
+def bump_data_version(session, name=PUBLICATIONS_VERSION):
+    """
+    Increment a data version inside the session's current transaction; returns
+    the new value. Bulk inserts bypass the flush hooks, so their writers pass
+    this value as row_version; publications inserted without one are stamped here.
+    """
+    table = DataVersion.__table__
+    version = session.execute(
+        table.update().where(table.c.name == name).values(version=table.c.version + 1).returning(table.c.version)
+    ).scalar()
+    if version is None:
+        session.execute(table.insert().values(name=name, version=1))
+        version = 1
+    if name == PUBLICATIONS_VERSION:
+        publications = Publication.__table__
+        session.execute(publications.update().where(publications.c.row_version.is_(None))
+                        .values(row_version=version))
+    return version
+
+@event.listens_for(db.session, 'before_flush')
+def _bump_on_publication_flush(session, flush_context, instances):
+    changed = [obj for obj in (*session.new, *session.dirty) if isinstance(obj, Publication)]
+    deleted = any(isinstance(obj, Publication) for obj in session.deleted)
+    if changed or deleted:
+        from core.titles import title_columns
+
+        version = bump_data_version(session)
+        for publication in changed:
+            publication.row_version = version
+            if publication.fingerprint is None or inspect(publication).attrs.title.history.has_changes():
+                for column, value in title_columns(publication.title).items():
+                    setattr(publication, column, value)
+    if deleted:
+        bump_data_version(session, PUBLICATION_DELETES_VERSION)
+
+@event.listens_for(db.session, 'before_flush')
+def _set_faculty_block_key(session, flush_context, instances):
+    for faculty in (*session.new, *session.dirty):
+        if isinstance(faculty, Faculty) and (faculty.block_key is None or
+                                             inspect(faculty).attrs.name.history.has_changes()):
+            from scrapers.name_index import block_key
+
+            faculty.block_key = block_key(faculty.name)
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _bump_on_publication_bulk_write(orm_execute_state):
+    # Bulk query.update()/delete() bypass the flush
+    mapper = orm_execute_state.bind_mapper
+    if ((orm_execute_state.is_update or orm_execute_state.is_delete) and
+            mapper is not None and mapper.class_ is Publication):
+        version = bump_data_version(orm_execute_state.session)
+        if orm_execute_state.is_update and isinstance(orm_execute_state.parameters, list):
+            # UPDATE by primary key with a list of rows: stamp each row, since
+            # .values() would turn the executemany into one statement per row
+            orm_execute_state.parameters = [dict(params, row_version=version)
+                                            for params in orm_execute_state.parameters]
+        elif orm_execute_state.is_update:
+            orm_execute_state.statement = orm_execute_state.statement.values(row_version=version)
+        else:
+            bump_data_version(orm_execute_state.session, PUBLICATION_DELETES_VERSION)
+
+@bp.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/search', methods=['POST'])
+@bp.route('/search', methods=['POST'])
 def search_faculty():
-    from scrapers.publication_scraper import PublicationScraper
+    """Queue a faculty search; progress and results are served from /jobs/<id>"""
+    from core.jobs import enqueue_search, ensure_worker_pool
     
-    data = request.json
+    data = request.json or {}
     college = data.get('college')
     faculty_name = data.get('name')
     department = data.get('department')
     
+    if not (college and faculty_name and department):
+        return jsonify({
+            'status': 'error',
+            'message': 'College, faculty name and department are required'
+        }), 400
+    
     try:
-        print(f"Processing search request for: {faculty_name}, {department}, {college}")
-        
-        # Check if faculty already exists
-        faculty = Faculty.query.filter_by(name=faculty_name, college=college, department=department).first()
-        
-        if not faculty:
-            # Create new faculty record
-            faculty = Faculty(name=faculty_name, college=college, department=department)
-            db.session.add(faculty)
-            db.session.commit()
-            print(f"Created new faculty record: {faculty.id}")
-        else:
-            print(f"Found existing faculty record: {faculty.id}")
-        
-        # Scrape publications with error handling
-        publications = []
-        try:
-            scraper = PublicationScraper()
-            publications = scraper.scrape_publications(faculty_name, department, college)
-            print(f"Scraper returned {len(publications)} publications")
-        except Exception as scrape_error:
-            print(f"Scraping error: {scrape_error}")
-            # Fallback: return a message about scraping failure but don't crash
-            return jsonify({
-                'status': 'partial_success',
-                'message': f'Faculty record created for {faculty_name}, but publication scraping failed: {str(scrape_error)}',
-                'faculty_id': faculty.id,
-                'publications_found': 0
-            })
-        
-        # Store publications in database
-        publications_added = 0
-        print(f"Starting to store {len(publications)} publications in database...")
-        
-        for i, pub in enumerate(publications):
-            try:
-                print(f"Processing publication {i+1}/{len(publications)}: {pub.get('title', 'No title')[:50]}...")
-                
-                # Check if publication already exists to avoid duplicates
-                existing_pub = Publication.query.filter_by(
-                    title=pub.get('title', ''),
-                    faculty_id=faculty.id
-                ).first()
-                
-                if existing_pub:
-                    print(f"  - Publication already exists, skipping")
-                    continue
-                
-                print(f"  - Creating new publication record")
-                new_pub = Publication(
-                    title=pub.get('title', ''),
-                    authors=pub.get('authors', ''),
-                    journal=pub.get('journal', ''),
-                    year=pub.get('year', 0),
-                    citations=pub.get('citations', 0),
-                    doi=pub.get('doi', ''),
-                    faculty_id=faculty.id
-                )
-                
-                print(f"  - Adding to database session")
-                db.session.add(new_pub)
-                publications_added += 1
-                print(f"  - Successfully queued publication {publications_added}")
-                
-            except Exception as pub_error:
-                print(f"ERROR adding publication {i+1}: {pub_error}")
-                import traceback
-                traceback.print_exc()
-                continue
-        
-        print(f"Attempting to commit {publications_added} publications to database...")
-        try:
-            db.session.commit()
-            print(f"SUCCESS: Committed {publications_added} publications to database")
-        except Exception as commit_error:
-            print(f"ERROR during database commit: {commit_error}")
-            import traceback
-            traceback.print_exc()
-            db.session.rollback()
-            raise commit_error
+        job = enqueue_search(faculty_name, department, college)
+        ensure_worker_pool()
+        logger.info("Search job %s (%s) for %s, %s, %s", job.id, job.status, faculty_name, department, college)
         
-        return jsonify({
-            'status': 'success',
-            'message': f'Found {len(publications)} publications for {faculty_name} ({publications_added} new)',
-            'faculty_id': faculty.id,
-            'faculty_name': faculty_name,
-            'publications_found': len(publications),
-            'publications_added': publications_added,
-            'redirect_url': f'/faculty/{faculty.id}'
+        response = jsonify({
+            'status': 'queued',
+            'job_id': job.id,
+            'status_url': f'/jobs/{job.id}'
         })
+        response.headers['Location'] = f'/jobs/{job.id}'
+        return response, 202
         
     except Exception as e:
-        print(f"Critical error in search_faculty: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error queueing search")
         db.session.rollback()
         return jsonify({
             'status': 'error', 
             'message': f'Search failed: {str(e)}'
         }), 500
 
-@app.route('/dashboard')
-def dashboard():
-    """Dashboard route with server-side data rendering"""
+ROSTER_FORMATS = {'.csv': 'csv', '.json': 'json'}
+
+@bp.route('/search/batch', methods=['POST'])
+def search_batch():
+    """Queue searches for a CSV or JSON roster of faculty members"""
+    from core.batch import enqueue_batch, parse_roster
+    from core.jobs import ensure_worker_pool
+    
+    if 'roster' in request.files:
+        upload = request.files['roster']
+        # The format comes from the file name; a part without one cannot be told apart
+        fmt = ROSTER_FORMATS.get(os.path.splitext(upload.filename or '')[1].lower())
+        if fmt is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Roster upload needs a file name ending in .csv or .json'
+            }), 400
+        text = upload.read().decode('utf-8-sig')
+    else:
+        text = request.get_data(as_text=True)
+        fmt = 'csv' if 'csv' in (request.content_type or '') else None
+    
     try:
-        # Get all faculty and their publications
-        faculty_list = Faculty.query.all()
-        all_publications = Publication.query.all()
-        
-        # Calculate metrics
-        total_publications = len(all_publications)
-        total_citations = sum(pub.citations for pub in all_publications)
-        
-        # Get publication trends by year
-        trends = {}
-        for pub in all_publications:
-            year = pub.year or 2023
-            if year not in trends:
-                trends[year] = {'count': 0, 'citations': 0}
-            trends[year]['count'] += 1
-            trends[year]['citations'] += pub.citations
+        rows = parse_roster(text, fmt)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    if not rows:
+        return jsonify({'status': 'error', 'message': 'Roster is empty'}), 400
+    
+    try:
+        batch = enqueue_batch(rows)
+        ensure_worker_pool()
+        logger.info("Search batch %s: %d roster rows queued", batch.id, len(rows))
         
-        publication_trends = [{'year': year, 'count': data['count'], 'citations': data['citations']} 
-                            for year, data in sorted(trends.items())]
+        response = jsonify({
+            'status': 'queued',
+            'batch_id': batch.id,
+            'rows': len(rows),
+            'status_url': f'/search/batch/{batch.id}'
+        })
+        response.headers['Location'] = f'/search/batch/{batch.id}'
+        return response, 202
         
-        # Get top publications by citations
-        top_publications = sorted(all_publications, key=lambda x: x.citations, reverse=True)[:5]
+    except Exception as e:
+        logger.exception("Error queueing search batch")
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Batch failed: {str(e)}'}), 500
+
+@bp.route('/search/batch/<batch_id>')
+def search_batch_status(batch_id):
+    """Progress report of a roster batch"""
+    from core.batch import batch_status
+    
+    batch = db.session.get(SearchBatch, batch_id)
+    if not batch:
+        return jsonify({'status': 'error', 'message': 'Batch not found'}), 404
+    return jsonify(batch_status(batch))
+
+@bp.route('/jobs/<job_id>')
+def search_job_status(job_id):
+    """Report progress and, once finished, the result of a queued search"""
+    from core.jobs import job_status
+    
+    job = db.session.get(SearchJob, job_id)
+    if not job:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+    return jsonify(job_status(job))
+
+@bp.route('/jobs/<job_id>/events')
+def search_job_events(job_id):
+    """Server-Sent Events stream of a search job's progress"""
+    from core.jobs import stream_job_events
+    
+    if not db.session.get(SearchJob, job_id):
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+    
+    last_event_id = request.headers.get('Last-Event-ID', type=int) or 0
+    return Response(
+        stream_with_context(stream_job_events(job_id, last_event_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@bp.route('/dashboard')
+def dashboard():
+    """Dashboard route with server-side data rendering"""
+    from core.streaming import PublicationAggregator, iter_publication_rows
+    
+    try:
+        # Stream (id, year, citations) instead of loading every publication
+        stats = PublicationAggregator().consume(iter_publication_rows())
+        total_publications = stats.total_publications
+        total_citations = stats.total_citations
+        publication_trends = stats.publication_trends()
+        top_publications = stats.top_publications()
         
         # Get last updated time
-        last_updated = faculty_list[0].last_updated if faculty_list else None
+        first_faculty = Faculty.query.order_by(Faculty.id).first()
+        last_updated = first_faculty.last_updated if first_faculty else None
         
         dashboard_data = {
             'total_publications': total_publications,
@@ -186,11 +449,11 @@ def dashboard():
             'publication_trends': publication_trends
         }
         
-        print(f"Dashboard data: {total_publications} publications, {total_citations} citations")
+        logger.debug("Dashboard data: %d publications, %d citations", total_publications, total_citations)
         return render_template('dashboard.html', data=dashboard_data)
         
     except Exception as e:
-        print(f"Dashboard error: {e}")
+        logger.exception("Dashboard error")
         # Return empty data if there's an error
         dashboard_data = {
             'total_publications': 0,
@@ -201,32 +464,22 @@ def dashboard():
         }
         return render_template('dashboard.html', data=dashboard_data)
 
-@app.route('/faculty/<int:faculty_id>')
+@bp.route('/faculty/<int:faculty_id>')
 def faculty_results(faculty_id):
     """Faculty-specific results page"""
+    from core.metrics import get_faculty_metrics
+    from core.streaming import PublicationAggregator, iter_publication_rows
+    
     try:
         # Get specific faculty and their publications
-        faculty = Faculty.query.get_or_404(faculty_id)
-        faculty_publications = Publication.query.filter_by(faculty_id=faculty_id).all()
-        
-        # Calculate metrics for this faculty only
-        total_publications = len(faculty_publications)
-        total_citations = sum(pub.citations for pub in faculty_publications)
-        
-        # Get publication trends by year for this faculty
-        trends = {}
-        for pub in faculty_publications:
-            year = pub.year or 2023
-            if year not in trends:
-                trends[year] = {'count': 0, 'citations': 0}
-            trends[year]['count'] += 1
-            trends[year]['citations'] += pub.citations
-        
-        publication_trends = [{'year': year, 'count': data['count'], 'citations': data['citations']} 
-                            for year, data in sorted(trends.items())]
-        
-        # Get top publications by citations for this faculty
-        top_publications = sorted(faculty_publications, key=lambda x: x.citations, reverse=True)[:5]
+        faculty = db.get_or_404(Faculty, faculty_id)
+        stats = PublicationAggregator().consume(
+            iter_publication_rows(filters=[Publication.faculty_id == faculty_id])
+        )
+        total_publications = stats.total_publications
+        total_citations = stats.total_citations
+        publication_trends = stats.publication_trends()
+        top_publications = stats.top_publications()
         
         faculty_data = {
             'faculty': faculty,
@@ -234,91 +487,107 @@ def faculty_results(faculty_id):
             'total_citations': total_citations,
             'last_updated': faculty.last_updated,
             'top_publications': top_publications,
-            'publication_trends': publication_trends
+            'publication_trends': publication_trends,
+            'metrics': get_faculty_metrics(faculty_id)
         }
         
-        print(f"Faculty {faculty.name}: {total_publications} publications, {total_citations} citations")
+        logger.debug("Faculty %s: %d publications, %d citations", faculty.name, total_publications, total_citations)
         return render_template('faculty_results.html', data=faculty_data)
         
     except Exception as e:
-        print(f"Faculty results error: {e}")
-        return redirect(url_for('dashboard'))
+        logger.exception("Faculty results error")
+        return redirect(url_for('main.dashboard'))
 
-@app.route('/api/dashboard')
+@bp.route('/api/faculty/<int:faculty_id>/metrics')
+def api_faculty_metrics(faculty_id):
+    """Precomputed h-index, i10-index, g-index, citations per year and m-quotient"""
+    from core.metrics import get_faculty_metrics
+    
+    if not db.session.get(Faculty, faculty_id):
+        return jsonify({'error': 'Faculty not found'}), 404
+    return jsonify(get_faculty_metrics(faculty_id))
+
+@bp.route('/api/faculty/<int:faculty_id>/collaborators')
+def api_faculty_collaborators(faculty_id):
+    """Top co-authors of a faculty member from the co-authorship graph"""
+    from core.coauthors import top_collaborators
+    
+    if not db.session.get(Faculty, faculty_id):
+        return jsonify({'error': 'Faculty not found'}), 404
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    return jsonify({'faculty_id': faculty_id, 'collaborators': top_collaborators(faculty_id, limit)})
+
+@bp.route('/api/collaboration/departments')
+def api_department_collaboration():
+    """Faculty collaboration counts within and across departments"""
+    from core.coauthors import department_collaboration
+    
+    return jsonify(department_collaboration(request.args.get('college')))
+
+@bp.route('/api/collaboration/components')
+def api_collaboration_components():
+    """Connected components of the faculty co-authorship graph"""
+    from core.coauthors import connected_components
+    
+    min_size = max(request.args.get('min_size', 2, type=int), 1)
+    return jsonify({'components': connected_components(min_size)})
+
+@bp.route('/api/dashboard')
 def api_dashboard():
-    from datetime import timedelta
+    from core.dashboard import dashboard_snapshot
     
     try:
-        # Get all faculty and their publications
-        faculty_list = Faculty.query.all()
-        all_publications = Publication.query.all()
-        
-        # Calculate metrics
-        total_publications = len(all_publications)
-        total_citations = sum(pub.citations for pub in all_publications)
-        
-        # Get publication trends by year
-        trends = {}
-        for pub in all_publications:
-            year = pub.year or 2023
-            if year not in trends:
-                trends[year] = {'count': 0, 'citations': 0}
-            trends[year]['count'] += 1
-            trends[year]['citations'] += pub.citations
-        
-        publication_trends = [{'year': year, 'count': data['count'], 'citations': data['citations']} 
-                            for year, data in sorted(trends.items())]
-        
-        # Get top publications by citations
-        top_publications = sorted(all_publications, key=lambda x: x.citations, reverse=True)[:5]
-        top_pubs_data = [{
-            'title': pub.title,
-            'journal': pub.journal,
-            'year': pub.year,
-            'citations': pub.citations
-        } for pub in top_publications]
-        
-        # Get last updated time
-        last_updated = max([f.last_updated for f in faculty_list]) if faculty_list else datetime.utcnow()
-        
-        return jsonify({
-            'totalPublications': total_publications,
-            'totalCitations': total_citations,
-            'publicationTrends': publication_trends,
-            'topPublications': top_pubs_data,
-            'lastUpdated': last_updated.isoformat(),
-            'nextUpdate': (last_updated.replace(hour=2, minute=0, second=0) + 
-                         timedelta(days=1)).isoformat()
-        })
+        version, payload = dashboard_snapshot(request.args.get('college'), request.args.get('department'))
+        return jsonify(dict(payload, dataVersion=version))
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-        publication_trends = [{
-            'year': pub.year,
-            'count': pub.count,
-            'citations': pub.citations
-        } for pub in publications]
-
-        top_pubs = [{
-            'title': pub.title,
-            'journal': pub.journal,
-            'year': pub.year,
-            'citations': pub.citations
-        } for pub in top_publications]
 
-        return jsonify({
-            'totalPublications': total_publications,
-            'totalCitations': total_citations,
-            'lastUpdated': last_updated.isoformat(),
-            'publicationTrends': publication_trends,
-            'topPublications': top_pubs
-        })
-    except Exception as e:
-        return jsonify({
-            'error': str(e)
-        }), 500
+@bp.route('/api/dashboard/stream')
+def api_dashboard_stream():
+    """Server-Sent Events: a dashboard snapshot, then deltas when publication data changes"""
+    from core.dashboard import stream_dashboard
+    
+    last_version = request.headers.get('Last-Event-ID', type=int)
+    return Response(
+        stream_with_context(stream_dashboard(request.args.get('college'), request.args.get('department'),
+                                             last_version)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@bp.route('/api/leaderboard')
+def api_leaderboard():
+    """Paginated department leaderboard served from the rollup cube"""
+    from core.rollups import leaderboard
+    
+    try:
+        return jsonify(leaderboard(
+            metric=request.args.get('metric', 'citations'),
+            years=request.args.get('years', type=int),
+            college=request.args.get('college'),
+            page=max(request.args.get('page', 1, type=int), 1),
+            limit=min(max(request.args.get('limit', 20, type=int), 1), 100)
+        ))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@bp.route('/api/departments')
+def api_departments():
+    """Colleges and departments available as dashboard filters"""
+    from core.rollups import list_departments
+    
+    return jsonify(list_departments())
+
+@bp.route('/metrics')
+def metrics():
+    """Prometheus text exposition of this process's counters and histograms"""
+    from core.telemetry import REGISTRY, CONTENT_TYPE
+    
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
 
 if __name__ == '__main__':
+    app = create_app()
     with app.app_context():
-        db.create_all()
+        init_schema()
     app.run(debug=True)
@@ -1,69 +1,149 @@
 import schedule
+import threading
 import time
 from datetime import datetime
-from app import Faculty
+from app import create_app, db, init_schema, Faculty
+from core.coauthors import refresh_coauthors
 from core.comparison import PublicationComparator
-from database import update_publications
+from core.logs import configure_logging
+from core.metrics import refresh_metrics
+from core.profiling import profile_job
+from core.rollups import refresh_rollups_for_faculty
+from core.search import store_changes
+from core.refresh_ledger import RefreshLedger
+from scheduler.lease import Lease
 import logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('update_log.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging(filename='update_log.log')
 
 comparator = PublicationComparator()
+ledger = RefreshLedger()
+lease = Lease('faculty-refresh-scheduler')
+
+# Longest uninterrupted wait while failed members back off
+RETRY_POLL_INTERVAL = 5
+
+def refresh_faculty(faculty):
+    """Refresh one faculty member, raising on failure so the ledger can retry it"""
+    logging.info(f"Updating publications for {faculty.name}")
+
+    # Get comparison report
+    report = comparator.generate_comparison_report(faculty.id)
+
+    if 'error' in report:
+        raise RuntimeError(report['error'])
+
+    # Apply the differences only; unchanged publications are left as stored
+    store_changes(faculty, report['changes'])
+    refresh_metrics([faculty.id])
+    refresh_rollups_for_faculty([faculty.id])
+    refresh_coauthors([faculty.id])
+
+    # Log changes
+    if report['changes']['added']:
+        logging.info(f"Added {len(report['changes']['added'])} new publications for {faculty.name}")
+    if report['changes']['updated']:
+        logging.info(f"Updated {len(report['changes']['updated'])} publications for {faculty.name}")
+    if report['changes']['removed']:
+        logging.info(f"Removed {len(report['changes']['removed'])} publications for {faculty.name}")
+
+def wait_for_retry(seconds, should_stop, stop=None):
+    """
+    Wait up to `seconds`, checking `should_stop()` every few seconds and
+    waking at once when the `stop` event is set; False if the wait was cut short.
+    """
+    deadline = time.monotonic() + seconds
+    pause = stop or threading.Event()
+    while not should_stop():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return True
+        pause.wait(min(remaining, RETRY_POLL_INTERVAL))
+    return False
+
+def update_all_faculty(should_continue=None, stop=None):
+    """
+    Update publications for all faculty members, in the current application
+    context.
+
+    Progress is checkpointed per faculty member in the refresh ledger, so a
+    run that dies halfway is resumed by the next call instead of restarted,
+    and failed members are retried with exponential backoff. The optional
+    `should_continue` callable is checked before each member and while
+    waiting for retries, so the run can stop early, e.g. when the scheduler
+    loses its lease; setting the optional `stop` event (on shutdown) ends
+    such a wait immediately.
+    """
+    def should_stop():
+        return (stop is not None and stop.is_set()) or (should_continue is not None and not should_continue())
 
-def update_all_faculty():
-    """Update publications for all faculty members"""
     try:
-        logging.info("Starting update process for all faculty members")
-        
-        # Get all faculty members
-        faculty_list = Faculty.query.all()
-        
-        if not faculty_list:
-            logging.warning("No faculty members found in database")
-            return
-            
-        for faculty in faculty_list:
-            logging.info(f"Updating publications for {faculty.name}")
-            
-            # Get comparison report
-            report = comparator.generate_comparison_report(faculty.id)
-            
-            if 'error' in report:
-                logging.error(f"Error updating {faculty.name}: {report['error']}")
+        init_schema()
+        run = ledger.open_run()
+        logging.info(f"Starting update process for all faculty members (run {run.id})")
+
+        while True:
+            if should_stop():
+                logging.warning(f"Update process paused (run {run.id}); the next run will resume it")
+                return
+
+            item = ledger.claim_next(run)
+
+            if item is None:
+                wait = ledger.seconds_until_retry(run)
+                if wait is None:
+                    break
+                logging.info(f"Waiting {wait:.0f}s before retrying failed faculty members")
+                # Not a plain sleep: backoffs last up to 15 minutes
+                if not wait_for_retry(wait, should_stop, stop):
+                    logging.warning(f"Update process paused (run {run.id}); the next run will resume it")
+                    return
                 continue
-                
-            # Update publications in database
-            update_publications(faculty.id, report['changes']['added'])
-            
-            # Log changes
-            if report['changes']['added']:
-                logging.info(f"Added {len(report['changes']['added'])} new publications for {faculty.name}")
-            if report['changes']['updated']:
-                logging.info(f"Updated {len(report['changes']['updated'])} publications for {faculty.name}")
-            if report['changes']['removed']:
-                logging.info(f"Removed {len(report['changes']['removed'])} publications for {faculty.name}")
-                
-        logging.info("Update process completed successfully")
-        
+
+            faculty = db.session.get(Faculty, item.faculty_id)
+            try:
+                if not faculty:
+                    raise RuntimeError('Faculty not found')
+                with profile_job(f"refresh faculty {faculty.id}"):
+                    refresh_faculty(faculty)
+                ledger.mark_done(item)
+            except Exception as e:
+                db.session.rollback()
+                logging.error(f"Error updating faculty {item.faculty_id} "
+                              f"(attempt {item.attempts}): {str(e)}")
+                ledger.mark_failed(item, str(e))
+
+        summary = ledger.finish_run(run)
+        logging.info(f"Update process completed (run {run.id}): {summary}")
+
     except Exception as e:
         logging.error(f"Error in update process: {str(e)}")
 
+def run_as_leader(app):
+    """Run the update in `app` only if this process holds the scheduler lease"""
+    with app.app_context():
+        init_schema()
+        if not lease.acquire():
+            logging.info("Another process holds the scheduler lease; skipping update")
+            return
+
+        try:
+            with lease.keep_alive(app=app):
+                update_all_faculty(should_continue=lambda: lease.held)
+        finally:
+            lease.release()
+
 def main():
+    app = create_app()
+
     # Schedule the update to run every day at 2 AM
-    schedule.every().day.at("02:00").do(update_all_faculty)
+    schedule.every().day.at("02:00").do(run_as_leader, app)
     
     logging.info("Update scheduler started")
     
     # Run initial update
-    update_all_faculty()
+    run_as_leader(app)
     
     # Keep the script running
     while True:
@@ -0,0 +1,216 @@
+"""
+Synthetic dataset generator.
+
+Fills a fresh SQLite database with the schema from app.py and realistic
+synthetic data: colleges and departments, faculty members with a skewed
+(log-normal) number of publications each, heavy-tailed (Pareto) citation
+counts that grow with paper age, papers shared between co-authors of the
+same department as one canonical work, and the derived metrics, rollups and
+co-authorship graph.
+
+    python -m benchmarks.generate_data --database /tmp/bench.db \\
+        --faculty 10000 --publications 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+FIRST_NAMES = [
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Elizabeth',
+    'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+    'Wei', 'Li', 'Hiroshi', 'Yuki', 'Priya', 'Anand', 'Rahul', 'Ananya', 'Mohammed', 'Fatima',
+    'Olga', 'Ivan', 'Lars', 'Ingrid', 'Pierre', 'Camille', 'Giulia', 'Marco', 'Sofia', 'Mateo',
+    'Chen', 'Min-jun', 'Seo-yeon', 'Kwame', 'Amara', 'Diego', 'Lucia', 'Noah', 'Emma', 'Arjun'
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Taylor', 'Thomas', 'Moore', 'Jackson', 'Martin', 'Lee',
+    'Wang', 'Zhang', 'Liu', 'Chen', 'Yang', 'Huang', 'Tanaka', 'Suzuki', 'Sato', 'Kim',
+    'Park', 'Patel', 'Sharma', 'Singh', 'Kumar', 'Khandare', 'Gupta', 'Iyer', 'Nguyen', 'Tran',
+    'Ivanov', 'Petrov', 'Muller', 'Schmidt', 'Rossi', 'Bianchi', 'Dubois', 'Laurent', 'Silva', 'Santos',
+    'Okafor', 'Mensah', 'Haddad', 'Cohen', 'Novak', 'Horvat', 'Larsen', 'Nielsen', 'Berg', 'Olsen'
+]
+DEPARTMENTS = [
+    'Computer Science', 'Electrical Engineering', 'Mechanical Engineering', 'Civil Engineering',
+    'Chemical Engineering', 'Physics', 'Chemistry', 'Mathematics', 'Statistics', 'Biology',
+    'Biochemistry', 'Neuroscience', 'Psychology', 'Economics', 'Sociology', 'Political Science',
+    'History', 'Philosophy', 'Linguistics', 'Earth Sciences', 'Materials Science', 'Public Health',
+    'Information Technology', 'Artificial Intelligence and Data Science', 'Electronics and Telecommunication'
+]
+COLLEGE_PREFIXES = ['Northern', 'Southern', 'Eastern', 'Western', 'Central', 'Coastal', 'Highland', 'Riverside']
+COLLEGE_KINDS = ['Institute of Technology', 'College of Engineering', 'University', 'College of Science']
+TITLE_WORDS = [
+    'learning', 'deep', 'neural', 'networks', 'graph', 'analysis', 'optimization', 'robust', 'efficient',
+    'scalable', 'distributed', 'models', 'estimation', 'inference', 'bayesian', 'dynamics', 'control',
+    'quantum', 'materials', 'synthesis', 'protein', 'structure', 'cellular', 'signals', 'imaging', 'sensor',
+    'energy', 'climate', 'policy', 'market', 'social', 'behavior', 'language', 'semantic', 'retrieval',
+    'adaptive', 'stochastic', 'nonlinear', 'spectral', 'thermal', 'fluid', 'catalysis', 'genomic', 'clinical'
+]
+JOURNALS = [
+    'Nature', 'Science', 'Physical Review Letters', 'IEEE Transactions on Neural Networks',
+    'Journal of Machine Learning Research', 'ACM Computing Surveys', 'Cell', 'The Lancet',
+    'Journal of the American Chemical Society', 'Annals of Statistics', 'Econometrica',
+    'IEEE Transactions on Power Systems', 'Journal of Fluid Mechanics', 'PLOS ONE', 'Scientific Reports',
+    'Proceedings of NeurIPS', 'Proceedings of ICML', 'Proceedings of CVPR', 'Applied Physics Letters',
+    'Journal of Applied Polymer Science'
+]
+
+INSERT_BATCH = 10000
+CURRENT_YEAR = 2025
+
+def use_database(path: str):
+    """Point app.py at `path`; must run before app is imported"""
+    if 'app' in sys.modules:
+        raise RuntimeError('app was imported before the benchmark database was selected')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.abspath(path)
+
+def _insert(conn, table, rows):
+    for start in range(0, len(rows), INSERT_BATCH):
+        conn.execute(table.insert(), rows[start:start + INSERT_BATCH])
+
+def generate(faculty_count: int, publication_count: int, colleges: int = 20, shared: float = 0.1,
+             seed: int = 42, aggregates: bool = True):
+    """Fill the current (empty) database; returns row counts"""
+    from sqlalchemy import event
+    from app import app, db, init_schema, bump_data_version, Faculty, Publication, Work
+    from core.titles import normalize_title, title_fingerprint
+    from scrapers.name_index import block_key
+
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+
+    with app.app_context():
+        @event.listens_for(db.engine, 'connect')
+        def _fast_writes(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=OFF')
+            cursor.close()
+
+        init_schema()
+        if db.session.query(Faculty.id).first() is not None:
+            raise SystemExit('The target database already has faculty; generate into a fresh file')
+
+        college_names = [f'{COLLEGE_PREFIXES[i % len(COLLEGE_PREFIXES)]} '
+                         f'{COLLEGE_KINDS[(i // len(COLLEGE_PREFIXES)) % len(COLLEGE_KINDS)]} {i + 1}'
+                         for i in range(colleges)]
+        units = [(college, department) for college in college_names
+                 for department in rng.choice(DEPARTMENTS, size=rng.integers(8, 16), replace=False)]
+
+        # Larger departments attract more faculty
+        unit_weights = rng.lognormal(0, 0.6, len(units))
+        unit_of = rng.choice(len(units), size=faculty_count, p=unit_weights / unit_weights.sum())
+        faculty_rows = []
+        for i in range(faculty_count):
+            college, department = units[unit_of[i]]
+            name = f"{FIRST_NAMES[rng.integers(len(FIRST_NAMES))]} {chr(65 + rng.integers(26))}. " \
+                   f"{LAST_NAMES[rng.integers(len(LAST_NAMES))]}"
+            faculty_rows.append({'id': i + 1, 'name': name, 'college': college, 'department': str(department),
+                                 'block_key': block_key(name)})
+
+        # Publications per faculty member: a few prolific authors, a long tail
+        weights = rng.lognormal(0, 1.2, faculty_count)
+        per_faculty = rng.multinomial(publication_count, weights / weights.sum())
+
+        ages = np.minimum(rng.gamma(2.0, 5.0, publication_count), CURRENT_YEAR - 1970).astype(int)
+        years = CURRENT_YEAR - ages
+        # Heavy-tailed citations that accumulate with age
+        citations = np.minimum(rng.pareto(1.3, publication_count) * 4 * (1 + ages / 5), 100000).astype(int)
+        share_draws = rng.random(publication_count)
+
+        # Written by bulk inserts, which bypass the flush hook that stamps row_version
+        version = bump_data_version(db.session)
+        db.session.commit()
+        work_rows, publication_rows = [], []
+        recent_works = {}  # department -> recent works available to co-authors
+        cursor = 0
+        for faculty in faculty_rows:
+            unit = (faculty['college'], faculty['department'])
+            pool = recent_works.setdefault(unit, deque(maxlen=200))
+            own = set()
+            for _ in range(per_faculty[faculty['id'] - 1]):
+                k = cursor
+                cursor += 1
+                work = None
+                if share_draws[k] < shared and pool:
+                    candidate = pool[rng.integers(len(pool))]
+                    if candidate['id'] not in own:
+                        work = candidate
+                if work is None:
+                    words = rng.choice(TITLE_WORDS, size=rng.integers(4, 9))
+                    title = ' '.join(words).capitalize() + f' ({len(work_rows) + 1})'
+                    coauthors = [f"{FIRST_NAMES[rng.integers(len(FIRST_NAMES))][0]}. "
+                                 f"{LAST_NAMES[rng.integers(len(LAST_NAMES))]}"
+                                 for _ in range(rng.integers(0, 6))]
+                    work = {
+                        'id': len(work_rows) + 1,
+                        'doi': f'10.5555/synthetic.{len(work_rows) + 1}' if rng.random() < 0.7 else None,
+                        'fingerprint': title_fingerprint(title),
+                        'title': title,
+                        'authors': ', '.join([faculty['name']] + coauthors)[:500],
+                        'journal': JOURNALS[rng.integers(len(JOURNALS))],
+                        'year': int(years[k]),
+                        'citations': int(citations[k])
+                    }
+                    work_rows.append(work)
+                    pool.append(work)
+                elif faculty['name'] not in work['authors']:
+                    work['authors'] = f"{work['authors']}, {faculty['name']}"[:500]
+                own.add(work['id'])
+                publication_rows.append({
+                    'title': work['title'],
+                    'normalized_title': normalize_title(work['title']),
+                    'fingerprint': work['fingerprint'],
+                    'authors': work['authors'],
+                    'journal': work['journal'],
+                    'year': work['year'],
+                    'citations': work['citations'],
+                    'doi': work['doi'] or '',
+                    'faculty_id': faculty['id'],
+                    'is_disambiguated': True,
+                    'work_id': work['id'],
+                    'row_version': version
+                })
+        print(f"Generated {len(faculty_rows)} faculty, {len(work_rows)} works, "
+              f"{len(publication_rows)} publications in {time.perf_counter() - started:.1f}s")
+
+        with db.engine.begin() as conn:
+            _insert(conn, Faculty.__table__, faculty_rows)
+            _insert(conn, Work.__table__, work_rows)
+            _insert(conn, Publication.__table__, publication_rows)
+        db.session.commit()
+        print(f"Inserted rows in {time.perf_counter() - started:.1f}s")
+
+        if aggregates:
+            from core.coauthors import refresh_coauthors
+            from core.metrics import refresh_metrics
+            from core.rollups import refresh_rollups
+            refresh_metrics()
+            refresh_rollups()
+            refresh_coauthors()
+            print(f"Computed metrics, rollups and co-authorship graph in {time.perf_counter() - started:.1f}s")
+
+    return {'faculty': len(faculty_rows), 'works': len(work_rows), 'publications': len(publication_rows)}
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill a fresh database with synthetic faculty and publications')
+    parser.add_argument('--database', required=True, help='SQLite file to create')
+    parser.add_argument('--faculty', type=int, default=10000)
+    parser.add_argument('--publications', type=int, default=1000000)
+    parser.add_argument('--colleges', type=int, default=20)
+    parser.add_argument('--shared', type=float, default=0.1, help='fraction of publications shared with a co-author')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-aggregates', action='store_true', help='skip metrics, rollups and the co-authorship graph')
+    args = parser.parse_args()
+
+    use_database(args.database)
+    generate(args.faculty, args.publications, args.colleges, args.shared, args.seed,
+             aggregates=not args.no_aggregates)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Import-time benchmark for the app's entry points.
+
+Each module is imported in fresh interpreters (median of --repeat runs), so
+the numbers are what a worker, scheduler or CLI tool pays before doing any
+work. 'app:create_app' also builds the application. --importtime lists the
+slowest imports of each entry point, from python -X importtime.
+
+    python -m benchmarks.import_time [--compare benchmarks/results/import-<commit>.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmarks.run_benchmarks import _commit
+
+ENTRY_POINTS = [
+    'app', 'app:create_app', 'check_database', 'core.jobs', 'core.search', 'core.comparison',
+    'core.metrics', 'scheduler.scheduler', 'scrapers.publication_scraper'
+]
+
+def _snippet(entry: str) -> str:
+    module, _, factory = entry.partition(':')
+    call = f'; {module}.{factory}()' if factory else ''
+    return (f'import time; start = time.perf_counter(); import {module}{call}; '
+            f'print(time.perf_counter() - start)')
+
+def measure(entry: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        child = subprocess.run([sys.executable, '-c', _snippet(entry)], capture_output=True, text=True,
+                               env=dict(os.environ, LOG_LEVEL='WARNING'))
+        if child.returncode != 0:
+            return {'error': child.stderr.strip().splitlines()[-1] if child.stderr.strip() else 'failed'}
+        timings.append(float(child.stdout.strip().splitlines()[-1]) * 1000)
+    return {'median_ms': statistics.median(timings), 'min_ms': min(timings), 'max_ms': max(timings)}
+
+def slowest_imports(entry: str, limit: int = 10) -> list:
+    """Top-level packages by cumulative import time"""
+    module = entry.partition(':')[0]
+    child = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                           capture_output=True, text=True)
+    packages = {}
+    for line in child.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        if cumulative.isdigit():
+            top = name.strip().split('.')[0]
+            packages[top] = max(packages.get(top, 0), int(cumulative))
+    ranked = sorted(packages.items(), key=lambda item: -item[1])
+    return [{'package': name, 'cumulative_ms': micros / 1000} for name, micros in ranked[:limit]]
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure import time of the entry points')
+    parser.add_argument('entries', nargs='*', default=ENTRY_POINTS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--importtime', action='store_true', help='also list the slowest imports')
+    parser.add_argument('--output', help='result file (default benchmarks/results/import-<commit>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f).get('entries', {})
+
+    results = {'commit': _commit(), 'created_at': datetime.utcnow().isoformat(),
+               'python': sys.version.split()[0], 'entries': {}}
+    for entry in args.entries:
+        result = measure(entry, args.repeat)
+        if args.importtime and 'error' not in result:
+            result['slowest'] = slowest_imports(entry)
+        results['entries'][entry] = result
+
+        if 'error' in result:
+            print(f"{entry:32s} failed: {result['error']}")
+            continue
+        line = f"{entry:32s} {result['median_ms']:8.1f} ms"
+        before = previous.get(entry, {}).get('median_ms')
+        if before:
+            line += f"   (was {before:.1f} ms, {(result['median_ms'] - before) / before * 100:+.0f}%)"
+        print(line)
+        for item in result.get('slowest', []):
+            print(f"    {item['package']:28s} {item['cumulative_ms']:8.1f} ms")
+
+    output = args.output or os.path.join('benchmarks', 'results', f"import-{results['commit']}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == '__main__':
+    main()
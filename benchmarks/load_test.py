@@ -0,0 +1,277 @@
+"""
+Load-test harness for mixed search and dashboard traffic.
+
+Starts the app in a subprocess (threaded development server, SEARCH_WORKERS
+search threads) with its scrapers pointed at benchmarks.stub_upstream, then
+replays a weighted mix of POST /search, GET /dashboard and GET /api/dashboard
+from a growing number of concurrent clients. For every concurrency level it
+reports throughput, latency percentiles and error rates per request type,
+plus how long the queued searches took to finish. Pass --target to load an
+already running instance instead (its scrapers must use the stub already).
+
+    python -m benchmarks.load_test --database /tmp/bench-copy.db --concurrency 1 4 16 32
+
+Searches write to the database; point --database at a copy.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+import requests
+
+from benchmarks.generate_data import FIRST_NAMES, LAST_NAMES, DEPARTMENTS
+from benchmarks.run_benchmarks import PERCENTILES, _commit
+from benchmarks.stub_upstream import StubUpstream
+
+DEFAULT_MIX = 'search=1,dashboard=1,api_dashboard=8'
+EXPECTED_STATUS = {'search': 202, 'dashboard': 200, 'api_dashboard': 200}
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in EXPECTED_STATUS:
+            raise SystemExit(f"Unknown request type '{kind}'; use {', '.join(EXPECTED_STATUS)}")
+        weights[kind] = float(weight or 1)
+    return weights
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_app(database: str, upstream: str, workers: int) -> tuple:
+    """Run the app in a subprocess; returns (process, base url) once it answers"""
+    port = _free_port()
+    tmp = tempfile.mkdtemp(prefix='load-test-')
+    env = dict(
+        os.environ,
+        DATABASE_URL='sqlite:///' + os.path.abspath(database),
+        SCHOLAR_URL=f'{upstream}/scholar',
+        CROSSREF_API_URL=f'{upstream}/works',
+        CROSSREF_INDEX_PATH=os.path.join(tmp, 'crossref.db'),
+        AUTHOR_INDEX_PATH=os.path.join(tmp, 'author_names.db'),
+        SEARCH_WORKERS=str(workers),
+        SEARCH_RESULT_TTL=os.environ.get('SEARCH_RESULT_TTL', '300'),
+        LOG_LEVEL=os.environ.get('LOG_LEVEL', 'WARNING')
+    )
+    process = subprocess.Popen([sys.executable, '-m', 'benchmarks.load_test', '--serve', '--port', str(port)], env=env)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit('The app server exited during startup')
+        try:
+            requests.get(f'{url}/api/departments', timeout=1)
+            return process, url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit('The app server did not start within 60s')
+
+def serve(port: int):
+    from app import app, init_schema
+
+    with app.app_context():
+        init_schema()
+    # Per-request access lines would dominate the run
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    app.run(host='127.0.0.1', port=port, threaded=True, debug=False, use_reloader=False)
+
+class Client(threading.Thread):
+    """One simulated user issuing requests back to back until the deadline"""
+
+    def __init__(self, base_url: str, weights: dict, names: list, deadline: float, seed: int):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.kinds = list(weights)
+        self.weights = [weights[kind] for kind in self.kinds]
+        self.names = names
+        self.deadline = deadline
+        self.random = random.Random(seed)
+        self.samples = []
+        self.job_ids = set()
+
+    def run(self):
+        session = requests.Session()
+        while time.monotonic() < self.deadline:
+            kind = self.random.choices(self.kinds, self.weights)[0]
+            start = time.perf_counter()
+            status, error = None, None
+            try:
+                if kind == 'search':
+                    name, department, college = self.random.choice(self.names)
+                    response = session.post(f'{self.base_url}/search', timeout=60,
+                                            json={'name': name, 'department': department, 'college': college})
+                    if response.status_code == 202:
+                        self.job_ids.add(response.json()['job_id'])
+                else:
+                    path = '/dashboard' if kind == 'dashboard' else '/api/dashboard'
+                    response = session.get(f'{self.base_url}{path}', timeout=60)
+                    response.content
+                status = response.status_code
+            except requests.RequestException as e:
+                error = type(e).__name__
+            elapsed = time.perf_counter() - start
+            self.samples.append((kind, elapsed, status == EXPECTED_STATUS[kind], status or error))
+
+def _latency_summary(latencies: list) -> dict:
+    values = np.array(latencies) * 1000
+    return dict({f'p{p}': float(np.percentile(values, p)) for p in PERCENTILES},
+                mean=float(values.mean()), max=float(values.max()))
+
+def drain_jobs(base_url: str, job_ids: set, timeout: float) -> dict:
+    """Wait for the level's searches to finish; returns completion statistics"""
+    pending, finished = set(job_ids), {}
+    deadline = time.monotonic() + timeout
+    session = requests.Session()
+    while pending and time.monotonic() < deadline:
+        for job_id in list(pending):
+            job = session.get(f'{base_url}/jobs/{job_id}', timeout=30).json()
+            if job['status'] in ('done', 'failed'):
+                finished[job_id] = job
+                pending.discard(job_id)
+        if pending:
+            time.sleep(0.5)
+
+    durations = [
+        (datetime.fromisoformat(job['finished_at']) - datetime.fromisoformat(job['created_at'])).total_seconds()
+        for job in finished.values() if job['finished_at'] and job['created_at']
+    ]
+    return {
+        'jobs': len(job_ids),
+        'done': sum(job['status'] == 'done' for job in finished.values()),
+        'failed': sum(job['status'] == 'failed' for job in finished.values()),
+        'unfinished': len(pending),
+        'completion_s': {key: value / 1000 for key, value in _latency_summary(durations).items()} if durations else None
+    }
+
+def run_level(base_url: str, concurrency: int, duration: float, weights: dict, names: list, drain: float) -> dict:
+    deadline = time.monotonic() + duration
+    clients = [Client(base_url, weights, names, deadline, seed=concurrency * 1000 + i) for i in range(concurrency)]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+
+    by_kind = defaultdict(list)
+    for client in clients:
+        for sample in client.samples:
+            by_kind[sample[0]].append(sample)
+
+    result = {'concurrency': concurrency, 'duration_s': elapsed, 'requests': {}}
+    for kind, samples in sorted(by_kind.items()):
+        errors = defaultdict(int)
+        for _, _, ok, status in samples:
+            if not ok:
+                errors[str(status)] += 1
+        result['requests'][kind] = {
+            'count': len(samples),
+            'throughput_rps': len(samples) / elapsed,
+            'error_rate': sum(errors.values()) / len(samples),
+            'errors': dict(errors),
+            'latency_ms': _latency_summary([latency for _, latency, _, _ in samples])
+        }
+    total = sum(len(samples) for samples in by_kind.values())
+    result['throughput_rps'] = total / elapsed
+    job_ids = set().union(*(client.job_ids for client in clients))
+    result['searches'] = drain_jobs(base_url, job_ids, drain) if job_ids else None
+    return result
+
+def _print_level(result: dict):
+    print(f"\nConcurrency {result['concurrency']}: {result['throughput_rps']:.1f} requests/s")
+    for kind, stats in result['requests'].items():
+        latency = stats['latency_ms']
+        print(f"  {kind:14s} {stats['count']:6d} req {stats['throughput_rps']:8.1f}/s  "
+              f"p50 {latency['p50']:8.1f} ms  p95 {latency['p95']:8.1f} ms  p99 {latency['p99']:8.1f} ms  "
+              f"errors {stats['error_rate'] * 100:.1f}%")
+    searches = result['searches']
+    if searches:
+        completion = searches['completion_s']
+        print(f"  searches: {searches['jobs']} jobs, {searches['done']} done, {searches['failed']} failed, "
+              f"{searches['unfinished']} unfinished"
+              + (f"; completion p50 {completion['p50']:.1f}s p95 {completion['p95']:.1f}s" if completion else ''))
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test mixed search and dashboard traffic')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--target', help='base URL of a running instance (default: start one)')
+    parser.add_argument('--database', help='database for the started instance (modified by searches; '
+                                           'default: a small generated one)')
+    parser.add_argument('--workers', type=int, default=4, help='SEARCH_WORKERS for the started instance')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--duration', type=float, default=20, help='seconds per concurrency level')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'request weights (default {DEFAULT_MIX})')
+    parser.add_argument('--names', type=int, default=200, help='distinct faculty searched')
+    parser.add_argument('--upstream-latency-ms', type=float, default=200)
+    parser.add_argument('--upstream-error-rate', type=float, default=0.0)
+    parser.add_argument('--drain', type=float, default=60, help='seconds to wait for searches after each level')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='result file (default benchmarks/results/load-<commit>.json)')
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    weights = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    names = [(f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{i}', rng.choice(DEPARTMENTS), 'Load Test College')
+             for i in range(args.names)]
+
+    upstream = StubUpstream(latency_ms=args.upstream_latency_ms, error_rate=args.upstream_error_rate).start()
+    process = None
+    try:
+        base_url = args.target
+        if not base_url:
+            database = args.database
+            if not database:
+                database = os.path.join(tempfile.mkdtemp(prefix='load-test-'), 'load.db')
+                subprocess.run([sys.executable, '-m', 'benchmarks.generate_data', '--database', database,
+                                '--faculty', '200', '--publications', '20000'], check=True)
+            process, base_url = start_app(database, upstream.url, args.workers)
+        print(f"Target {base_url}, stub upstream {upstream.url}, mix {weights}")
+
+        results = {
+            'commit': _commit(),
+            'created_at': datetime.utcnow().isoformat(),
+            'target': args.target or 'local',
+            'search_workers': None if args.target else args.workers,
+            'mix': weights,
+            'upstream': {'latency_ms': args.upstream_latency_ms, 'error_rate': args.upstream_error_rate},
+            'levels': []
+        }
+        for concurrency in args.concurrency:
+            level = run_level(base_url, concurrency, args.duration, weights, names, args.drain)
+            results['levels'].append(level)
+            _print_level(level)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        upstream.stop()
+
+    output = args.output or os.path.join('benchmarks', 'results', f"load-{results['commit']}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+if __name__ == '__main__':
+    main()
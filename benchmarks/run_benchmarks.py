@@ -0,0 +1,189 @@
+"""
+Endpoint benchmark suite.
+
+Each route is measured in its own subprocess against a database built by
+benchmarks.generate_data, through the Flask test client: latency
+percentiles over repeated requests (the first, cold request reported
+separately), SQL statements per request, and peak RSS. Results are written
+to a JSON file tagged with the current commit; --compare prints the change
+against an earlier result file.
+
+    python -m benchmarks.run_benchmarks --database /tmp/bench.db
+    python -m benchmarks.run_benchmarks --database /tmp/bench.db --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.generate_data import use_database
+
+ROUTES = ['/dashboard', '/faculty/<id>', '/api/dashboard']
+PERCENTILES = (50, 90, 95, 99)
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def _faculty_ids(count: int, seed: int):
+    """The most prolific faculty member first, then a random sample"""
+    from sqlalchemy import func
+    from app import db, Faculty, Publication
+
+    heaviest = db.session.query(Publication.faculty_id).group_by(Publication.faculty_id) \
+        .order_by(func.count(Publication.id).desc()).limit(1).scalar()
+    ids = [row.id for row in db.session.query(Faculty.id)]
+    rng = np.random.default_rng(seed)
+    sample = [int(i) for i in rng.choice(ids, size=count, replace=len(ids) < count)] if ids else []
+    return ([heaviest] if heaviest else []) + sample
+
+def measure_route(route: str, requests: int, warmup: int, seed: int = 0) -> dict:
+    """Run one route in this process; call once per process so peak RSS belongs to it"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from app import app
+
+    statements = [0]
+
+    def count_statement(*args):
+        statements[0] += 1
+
+    event.listen(Engine, 'before_cursor_execute', count_statement)
+    client = app.test_client()
+
+    if route == '/faculty/<id>':
+        with app.app_context():
+            ids = _faculty_ids(warmup + requests, seed)
+        urls = [f'/faculty/{faculty_id}' for faculty_id in ids]
+    else:
+        urls = [route] * (1 + warmup + requests)
+    baseline_rss = _peak_rss_mb()
+
+    latencies, queries, statuses = [], [], {}
+    for i, url in enumerate(urls[:1 + warmup + requests]):
+        statements[0] = 0
+        start = time.perf_counter()
+        response = client.get(url)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if i == 0:
+            cold = {'latency_ms': elapsed * 1000, 'queries': statements[0]}
+        if i > warmup:
+            latencies.append(elapsed * 1000)
+            queries.append(statements[0])
+
+    latencies = np.array(latencies or [cold['latency_ms']])
+    return {
+        'requests': len(latencies),
+        'cold': cold,
+        'latency_ms': dict(
+            {f'p{p}': float(np.percentile(latencies, p)) for p in PERCENTILES},
+            mean=float(latencies.mean()), max=float(latencies.max())
+        ),
+        'queries_per_request': {
+            'mean': float(np.mean(queries)) if queries else cold['queries'],
+            'max': int(max(queries)) if queries else cold['queries']
+        },
+        'baseline_rss_mb': baseline_rss,
+        'peak_rss_mb': _peak_rss_mb(),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())}
+    }
+
+def _dataset() -> dict:
+    from app import app, db, Faculty, Publication, Work
+
+    with app.app_context():
+        return {
+            'faculty': db.session.query(Faculty).count(),
+            'publications': db.session.query(Publication).count(),
+            'works': db.session.query(Work).count()
+        }
+
+def _commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def compare(current: dict, previous: dict):
+    """Print latency and query deltas against an earlier result file"""
+    print(f"\nCompared with {previous.get('commit')} ({previous.get('created_at')}):")
+    for route, result in current['routes'].items():
+        before = previous.get('routes', {}).get(route)
+        if not before:
+            print(f"  {route}: no previous result")
+            continue
+        parts = []
+        for key in ('p50', 'p95'):
+            old, new = before['latency_ms'][key], result['latency_ms'][key]
+            parts.append(f"{key} {old:.1f} -> {new:.1f} ms ({(new - old) / old * 100 if old else 0:+.0f}%)")
+        parts.append(f"queries {before['queries_per_request']['mean']:.1f} -> {result['queries_per_request']['mean']:.1f}")
+        parts.append(f"peak RSS {before['peak_rss_mb']:.0f} -> {result['peak_rss_mb']:.0f} MB")
+        print(f"  {route}: " + ', '.join(parts))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard and faculty routes')
+    parser.add_argument('--database', required=True, help='database built by benchmarks.generate_data')
+    parser.add_argument('--routes', nargs='+', default=ROUTES)
+    parser.add_argument('--requests', type=int, default=50, help='measured requests per route')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='result file (default benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    use_database(args.database)
+    os.environ.setdefault('SEARCH_WORKERS', '0')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    if args.child:
+        print(json.dumps(measure_route(args.child, args.requests, args.warmup, args.seed)))
+        return
+
+    results = {
+        'commit': _commit(),
+        'created_at': datetime.utcnow().isoformat(),
+        'python': sys.version.split()[0],
+        'database': os.path.abspath(args.database),
+        'dataset': _dataset(),
+        'routes': {}
+    }
+    for route in args.routes:
+        child = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.run_benchmarks', '--database', args.database, '--child', route,
+             '--requests', str(args.requests), '--warmup', str(args.warmup), '--seed', str(args.seed)],
+            capture_output=True, text=True
+        )
+        if child.returncode != 0:
+            print(f"{route}: benchmark failed\n{child.stderr}", file=sys.stderr)
+            continue
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        results['routes'][route] = result
+        latency = result['latency_ms']
+        print(f"{route}: p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, p99 {latency['p99']:.1f} ms, "
+              f"cold {result['cold']['latency_ms']:.1f} ms, {result['queries_per_request']['mean']:.1f} queries/request, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB")
+
+    output = args.output or os.path.join('benchmarks', 'results', f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+if __name__ == '__main__':
+    main()
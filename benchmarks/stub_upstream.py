@@ -0,0 +1,121 @@
+"""
+Local stand-in for Google Scholar and the CrossRef API.
+
+Serves deterministic result pages for any author, with configurable latency
+and error rate, so load tests exercise the real scraping, parsing and
+storage code without touching the internet. Point the app at it with
+SCHOLAR_URL=http://host:port/scholar and CROSSREF_API_URL=http://host:port/works.
+Scholar queries are "name department college"; their first two words are
+taken as the author name.
+
+    python -m benchmarks.stub_upstream --port 8099 --latency-ms 200 --error-rate 0.02
+"""
+
+import argparse
+import html
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+class StubUpstream:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0, error_rate: float = 0,
+                 scholar_results: int = 10, crossref_results: int = 20):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.scholar_results = scholar_results
+        self.crossref_results = crossref_results
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'StubUpstream':
+        self._thread = threading.Thread(target=self.server.serve_forever, name='stub-upstream', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def scholar_page(self, name: str, start: int) -> bytes:
+        seed = zlib.crc32(name.encode('utf-8'))
+        blocks = []
+        for n in range(start, start + self.scholar_results):
+            title = html.escape(f'{name} on stub topic {seed % 97}-{n}')
+            blocks.append(
+                f'<div class="gs_ri"><h3 class="gs_rt"><a href="#">{title}</a></h3>'
+                f'<div class="gs_a">{html.escape(name)}, A Coauthor - Journal of Stubs, {2000 + (seed + n) % 25} - stub.org</div>'
+                f'<div class="gs_fl"><a href="#">Cited by {(seed + n * 7) % 300}</a></div></div>'
+            )
+        return f'<html><body>{"".join(blocks)}</body></html>'.encode('utf-8')
+
+    def crossref_page(self, name: str) -> bytes:
+        seed = zlib.crc32(name.encode('utf-8'))
+        given, _, family = name.partition(' ')
+        items = [{
+            'title': [f'{name} crossref work {seed % 89}-{n}'],
+            'author': [{'given': given, 'family': family or given}, {'given': 'A', 'family': 'Coauthor'}],
+            'container-title': ['Stub Letters'],
+            'published-print': {'date-parts': [[2000 + (seed + n) % 25]]},
+            'DOI': f'10.5555/stub.{seed}.{n}',
+            'is-referenced-by-count': (seed + n * 13) % 500
+        } for n in range(self.crossref_results)]
+        return json.dumps({'status': 'ok', 'message': {'items': items, 'next-cursor': None}}).encode('utf-8')
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency * random.uniform(0.5, 1.5))
+                if stub.error_rate and random.random() < stub.error_rate:
+                    self._send(503, b'stub upstream error', 'text/plain')
+                    return
+
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path.endswith('/scholar'):
+                    name = ' '.join(query.get('q', [''])[0].split()[:2])
+                    start = int(query.get('start', ['0'])[0])
+                    self._send(200, stub.scholar_page(name, start), 'text/html')
+                elif url.path.endswith('/works'):
+                    self._send(200, stub.crossref_page(query.get('query.author', [''])[0]), 'application/json')
+                else:
+                    self._send(404, b'not found', 'text/plain')
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stub Scholar and CrossRef responses')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency-ms', type=float, default=0, help='mean response delay')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests answered with 503')
+    args = parser.parse_args()
+
+    stub = StubUpstream(args.host, args.port, args.latency_ms, args.error_rate)
+    print(f"Stub upstream at {stub.url} (SCHOLAR_URL={stub.url}/scholar CROSSREF_API_URL={stub.url}/works)")
+    stub.server.serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+pytest configuration: tests run against a throwaway database and name index,
+never the ones in instance/, and without background search workers. Shared
+fixtures: `app_context` and the `add_member` factory.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix='faculty-research-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmp, 'test.db')
+os.environ['AUTHOR_INDEX_PATH'] = os.path.join(_tmp, 'author_names.db')
+os.environ['CROSSREF_INDEX_PATH'] = os.path.join(_tmp, 'crossref.db')
+os.environ['SEARCH_WORKERS'] = '0'
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+@pytest.fixture
+def app_context():
+    """The app's context with the schema in place; uncommitted changes are rolled back afterwards"""
+    from app import app, db, init_schema
+
+    with app.app_context():
+        init_schema()
+        yield app
+        db.session.rollback()
+
+@pytest.fixture
+def add_member(app_context):
+    """
+    Factory storing a faculty member and their publications (dicts as a
+    scraper returns them, written by database.update_publications);
+    returns the Faculty row.
+    """
+    from app import db, Faculty
+    from database import update_publications
+
+    def add(name, publications=(), college='Test College', department='Testing'):
+        member = Faculty(name=name, college=college, department=department)
+        db.session.add(member)
+        db.session.commit()
+        if publications:
+            update_publications(member.id, list(publications))
+        return member
+    return add
@@ -0,0 +1,205 @@
+"""
+Batch onboarding from a roster of faculty members.
+
+A roster (CSV with name/department/college columns, or a JSON list of
+objects with those keys) is turned into faculty records with one bulk
+insert and into queued SearchJobs with another, grouped under a
+SearchBatch. The search worker pool then scrapes them with bounded
+concurrency (SEARCH_WORKERS threads per process), each job storing its
+publications through the chunked upserts of core/search.py.
+
+    python -m core.batch roster.csv [--workers 8]
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+import uuid
+from typing import Dict, List
+from sqlalchemy import func, tuple_
+from sqlalchemy.exc import IntegrityError
+from app import create_app, db, init_schema, Faculty, SearchJob, SearchBatch, SearchBatchItem
+from core.jobs import QUEUED, RUNNING, DONE, FAILED, SearchWorkerPool, enqueue_search, reusable_job_criteria, wake_workers
+from core.search import search_key
+from scrapers.name_index import block_key
+
+ROSTER_FIELDS = ('name', 'department', 'college')
+# Rows per IN (...) lookup and per bulk insert
+BATCH_CHUNK_SIZE = 500
+# Largest roster accepted in one request
+MAX_ROSTER_ROWS = 20000
+
+def parse_roster(text: str, fmt: str = None) -> List[Dict]:
+    """
+    Parse a CSV or JSON roster into rows with name, department and college.
+
+    `fmt` is 'csv' or 'json'; when omitted it is guessed from the content.
+    Raises ValueError for malformed rosters or rows missing a field.
+    """
+    text = text.strip()
+    fmt = fmt or ('json' if text[:1] in '[{' else 'csv')
+
+    if fmt == 'json':
+        try:
+            records = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f'Invalid JSON roster: {e}')
+        if isinstance(records, dict):
+            records = records.get('rows', records.get('faculty'))
+        if not isinstance(records, list):
+            raise ValueError('JSON roster must be a list of {name, department, college} objects')
+    else:
+        records = list(csv.DictReader(io.StringIO(text)))
+
+    rows = []
+    seen = set()
+    for line, record in enumerate(records, start=1):
+        if not isinstance(record, dict):
+            raise ValueError(f'Row {line} is not an object')
+        row = {field: ' '.join(str(record.get(field) or '').split()) for field in ROSTER_FIELDS}
+        missing = [field for field in ROSTER_FIELDS if not row[field]]
+        if missing:
+            raise ValueError(f"Row {line} is missing {', '.join(missing)}")
+        key = search_key(row['name'], row['department'], row['college'])
+        if key not in seen:
+            seen.add(key)
+            rows.append(row)
+
+    if len(rows) > MAX_ROSTER_ROWS:
+        raise ValueError(f'Roster has {len(rows)} rows; the limit is {MAX_ROSTER_ROWS}')
+    return rows
+
+def _chunks(values: List, size: int = BATCH_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def create_faculty(rows: List[Dict]) -> int:
+    """Insert faculty records missing for roster rows; returns the number created"""
+    existing = set()
+    for chunk in _chunks(rows):
+        existing.update(db.session.query(Faculty.name, Faculty.department, Faculty.college).filter(
+            tuple_(Faculty.name, Faculty.department, Faculty.college).in_(
+                [(row['name'], row['department'], row['college']) for row in chunk]
+            )
+        ))
+    missing = [row for row in rows if (row['name'], row['department'], row['college']) not in existing]
+    # Bulk inserts bypass the flush hook that keys faculty names for co-author matching
+    db.session.bulk_insert_mappings(Faculty, [dict(row, block_key=block_key(row['name'])) for row in missing])
+    db.session.commit()
+    return len(missing)
+
+def enqueue_batch(rows: List[Dict]) -> SearchBatch:
+    """
+    Create faculty records and queue one search per roster row.
+
+    Rows whose search is already queued, running or freshly finished join
+    that job instead of scraping again, as single searches do.
+    """
+    batch = SearchBatch(id=uuid.uuid4().hex, total=len(rows))
+    db.session.add(batch)
+    # Commits the batch row together with the new faculty records
+    create_faculty(rows)
+
+    keyed = {search_key(row['name'], row['department'], row['college']): row for row in rows}
+    job_ids = {}
+    for chunk in _chunks(list(keyed)):
+        # Oldest first, so the most recent reusable job per key wins
+        job_ids.update(db.session.query(SearchJob.search_key, SearchJob.id).filter(
+            SearchJob.search_key.in_(chunk),
+            reusable_job_criteria()
+        ).order_by(SearchJob.created_at))
+
+    new_jobs = [{
+        'id': uuid.uuid4().hex,
+        'search_key': key,
+        'name': row['name'],
+        'department': row['department'],
+        'college': row['college'],
+        'status': QUEUED,
+        'stage': 'Queued',
+        'progress': 0
+    } for key, row in keyed.items() if key not in job_ids]
+
+    try:
+        db.session.bulk_insert_mappings(SearchJob, new_jobs)
+        db.session.commit()
+        job_ids.update((job['search_key'], job['id']) for job in new_jobs)
+    except IntegrityError:
+        # Raced with concurrent searches for some rows; queue those one by one
+        db.session.rollback()
+        for job in new_jobs:
+            job_ids[job['search_key']] = enqueue_search(job['name'], job['department'], job['college']).id
+
+    db.session.bulk_insert_mappings(SearchBatchItem, [
+        {'batch_id': batch.id, 'job_id': job_id} for job_id in set(job_ids.values())
+    ])
+    db.session.commit()
+
+    wake_workers()
+    return db.session.get(SearchBatch, batch.id)
+
+def batch_status(batch: SearchBatch) -> Dict:
+    """Progress report for a batch: job counts by status and failures"""
+    counts = dict(db.session.query(SearchJob.status, func.count(SearchJob.id))
+                  .join(SearchBatchItem, SearchBatchItem.job_id == SearchJob.id)
+                  .filter(SearchBatchItem.batch_id == batch.id)
+                  .group_by(SearchJob.status))
+    failed = db.session.query(SearchJob.id, SearchJob.name, SearchJob.error) \
+        .join(SearchBatchItem, SearchBatchItem.job_id == SearchJob.id) \
+        .filter(SearchBatchItem.batch_id == batch.id, SearchJob.status == FAILED) \
+        .limit(100).all()
+
+    jobs_total = sum(counts.values())
+    finished = counts.get(DONE, 0) + counts.get(FAILED, 0)
+    return {
+        'batch_id': batch.id,
+        'rows': batch.total,
+        'jobs': jobs_total,
+        'queued': counts.get(QUEUED, 0),
+        'running': counts.get(RUNNING, 0),
+        'done': counts.get(DONE, 0),
+        'failed': counts.get(FAILED, 0),
+        'progress': round(100 * finished / jobs_total) if jobs_total else 100,
+        'finished': finished == jobs_total,
+        'failures': [{'job_id': job_id, 'name': name, 'error': error} for job_id, name, error in failed],
+        'created_at': batch.created_at.isoformat() if batch.created_at else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Onboard a roster of faculty members')
+    parser.add_argument('roster', help="CSV or JSON roster file ('-' for stdin)")
+    parser.add_argument('--format', choices=('csv', 'json'), help='roster format (guessed by default)')
+    parser.add_argument('--workers', type=int, default=8, help='concurrent searches run by this process')
+    parser.add_argument('--interval', type=float, default=5, help='seconds between progress reports')
+    args = parser.parse_args()
+
+    text = sys.stdin.read() if args.roster == '-' else open(args.roster, encoding='utf-8').read()
+    rows = parse_roster(text, args.format)
+
+    app = create_app()
+    with app.app_context():
+        init_schema()
+        batch = enqueue_batch(rows)
+        batch_id = batch.id
+        print(f"Batch {batch_id}: {len(rows)} roster rows queued")
+
+    if args.workers > 0:
+        SearchWorkerPool(args.workers, app).start()
+
+    while True:
+        time.sleep(args.interval)
+        with app.app_context():
+            status = batch_status(db.session.get(SearchBatch, batch_id))
+        print(f"Batch {batch_id}: {status['done']} done, {status['failed']} failed, "
+              f"{status['running']} running, {status['queued']} queued ({status['progress']}%)")
+        if status['finished']:
+            break
+
+    for failure in status['failures']:
+        print(f"  FAILED {failure['name']}: {failure['error']}")
+
+if __name__ == '__main__':
+    main()
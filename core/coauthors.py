@@ -0,0 +1,209 @@
+"""
+Co-authorship graph.
+
+Author lists of stored publications are parsed once, at ingestion, into a
+sparse adjacency table (CoauthorEdge): one row per (faculty member,
+collaborator) with the number of papers they share. Collaborators who are
+themselves stored faculty members are linked by id, which makes the
+faculty-to-faculty subgraph available for department collaboration counts
+and connected components without touching author strings at request time.
+
+    python -m core.coauthors    # rebuild the whole graph
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import case, update
+from app import create_app, db, init_schema, Faculty, Publication, CoauthorEdge
+from core.pipeline import chunked
+from scrapers.name_index import block_key
+
+# Keys or ids per IN (...) lookup, below SQLite's bound-parameter limit
+KEY_CHUNK = 500
+
+def _backfill_block_keys():
+    """Key faculty rows written without the ORM (bulk imports, databases from before the column)"""
+    missing = db.session.query(Faculty.id, Faculty.name).filter(Faculty.block_key.is_(None)).all()
+    if missing:
+        db.session.execute(update(Faculty), [
+            {'id': faculty_id, 'block_key': block_key(name)} for faculty_id, name in missing
+        ])
+
+def _faculty_by_key(keys: Iterable[str]) -> Dict[str, List[int]]:
+    """Stored faculty ids for the given block keys only"""
+    faculty = defaultdict(list)
+    for chunk in chunked(sorted(set(keys) - {''}), KEY_CHUNK):
+        for faculty_id, key in db.session.query(Faculty.id, Faculty.block_key) \
+                .filter(Faculty.block_key.in_(chunk)).order_by(Faculty.id):
+            faculty[key].append(faculty_id)
+    return faculty
+
+def _linked(faculty_keys: Dict[str, List[int]], key: str) -> Optional[int]:
+    # Only link unambiguous names; namesakes stay external collaborators
+    matches = faculty_keys.get(key, [])
+    return matches[0] if len(matches) == 1 else None
+
+def refresh_coauthors(faculty_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Rebuild the adjacency rows of the given faculty (all when None) and
+    re-link collaborators that match them by name. Returns rows written.
+    """
+    _backfill_block_keys()
+    faculty = db.session.query(Faculty.id, Faculty.block_key)
+    publications = db.session.query(Publication.faculty_id, Publication.authors)
+    if faculty_ids is not None:
+        faculty_ids = sorted(set(faculty_ids))
+        if not faculty_ids:
+            return 0
+        faculty = faculty.filter(Faculty.id.in_(faculty_ids))
+        publications = publications.filter(Publication.faculty_id.in_(faculty_ids))
+
+    own_keys = dict(faculty)
+
+    weights = Counter()
+    names = {}
+    for faculty_id, authors in publications:
+        mentions = {}
+        for mention in (authors or '').split(','):
+            key = block_key(mention)
+            if key and key != own_keys.get(faculty_id):
+                mentions.setdefault(key, mention.strip())
+        for key, mention in mentions.items():
+            weights[faculty_id, key] += 1
+            names.setdefault((faculty_id, key), mention)
+
+    relinked = set(own_keys.values()) if faculty_ids is not None else set()
+    faculty_keys = _faculty_by_key(relinked | {key for _, key in weights})
+
+    rows = [{
+        'faculty_id': faculty_id,
+        'collaborator_key': key,
+        'collaborator_name': names[faculty_id, key][:200],
+        'collaborator_faculty_id': _linked(faculty_keys, key),
+        'weight': weight
+    } for (faculty_id, key), weight in weights.items()]
+
+    delete = CoauthorEdge.query
+    if faculty_ids is not None:
+        delete = delete.filter(CoauthorEdge.faculty_id.in_(faculty_ids))
+    delete.delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(CoauthorEdge, rows)
+
+    # Other faculty members' edges that name one of the refreshed faculty;
+    # a full rebuild has just linked every row
+    for chunk in chunked(sorted(relinked - {''}), KEY_CHUNK):
+        db.session.execute(
+            update(CoauthorEdge).where(CoauthorEdge.collaborator_key.in_(chunk)).values(
+                collaborator_faculty_id=case(
+                    {key: _linked(faculty_keys, key) for key in chunk},
+                    value=CoauthorEdge.collaborator_key, else_=None
+                )
+            ).execution_options(synchronize_session=False)
+        )
+
+    db.session.commit()
+    return len(rows)
+
+def top_collaborators(faculty_id: int, limit: int = 10) -> List[Dict]:
+    edges = CoauthorEdge.query.filter_by(faculty_id=faculty_id) \
+        .order_by(CoauthorEdge.weight.desc(), CoauthorEdge.collaborator_key).limit(limit).all()
+    return [{
+        'name': edge.collaborator_name,
+        'papers': edge.weight,
+        'faculty_id': edge.collaborator_faculty_id
+    } for edge in edges]
+
+def _faculty_pairs(college: str = None) -> Dict[tuple, int]:
+    """Undirected faculty-to-faculty edges {(low id, high id): papers}"""
+    query = db.session.query(
+        CoauthorEdge.faculty_id, CoauthorEdge.collaborator_faculty_id, CoauthorEdge.weight
+    ).filter(
+        CoauthorEdge.collaborator_faculty_id.isnot(None),
+        CoauthorEdge.collaborator_faculty_id != CoauthorEdge.faculty_id
+    )
+    if college:
+        query = query.join(Faculty, Faculty.id == CoauthorEdge.faculty_id).filter(Faculty.college == college)
+
+    pairs = {}
+    for a, b, weight in query:
+        key = (min(a, b), max(a, b))
+        # Both directions are stored when both members are ingested
+        pairs[key] = max(pairs.get(key, 0), weight)
+    return pairs
+
+def department_collaboration(college: str = None) -> Dict:
+    """Faculty-to-faculty collaboration counts within and across departments"""
+    pairs = _faculty_pairs(college)
+    ids = sorted({faculty_id for pair in pairs for faculty_id in pair})
+    departments = {}
+    for chunk in chunked(ids, KEY_CHUNK):
+        for faculty_id, faculty_college, department in db.session.query(
+            Faculty.id, Faculty.college, Faculty.department
+        ).filter(Faculty.id.in_(chunk)):
+            departments[faculty_id] = (faculty_college, department)
+
+    totals = {'intra': {'pairs': 0, 'papers': 0}, 'inter': {'pairs': 0, 'papers': 0}}
+    by_departments = defaultdict(lambda: {'pairs': 0, 'papers': 0})
+    for (a, b), papers in pairs.items():
+        first, second = sorted((departments[a], departments[b]))
+        kind = 'intra' if first == second else 'inter'
+        totals[kind]['pairs'] += 1
+        totals[kind]['papers'] += papers
+        by_departments[first, second]['pairs'] += 1
+        by_departments[first, second]['papers'] += papers
+
+    return {
+        'college': college,
+        'intra_department': totals['intra'],
+        'inter_department': totals['inter'],
+        'departments': sorted([{
+            'college_a': first[0], 'department_a': first[1],
+            'college_b': second[0], 'department_b': second[1],
+            **counts
+        } for (first, second), counts in by_departments.items()], key=lambda row: -row['papers'])
+    }
+
+def connected_components(min_size: int = 2) -> List[Dict]:
+    """Groups of faculty members connected through co-authorship, largest first"""
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for a, b in _faculty_pairs():
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    members = defaultdict(list)
+    for node in parent:
+        members[find(node)].append(node)
+    groups = [sorted(group) for group in members.values() if len(group) >= min_size]
+    if not groups:
+        return []
+
+    faculty = {}
+    for chunk in chunked(sorted(faculty_id for group in groups for faculty_id in group), KEY_CHUNK):
+        faculty.update((row.id, row) for row in db.session.query(
+            Faculty.id, Faculty.name, Faculty.college, Faculty.department
+        ).filter(Faculty.id.in_(chunk)))
+    groups.sort(key=lambda group: (-len(group), group[0]))
+    return [{
+        'size': len(group),
+        'members': [{
+            'faculty_id': faculty_id,
+            'name': faculty[faculty_id].name,
+            'college': faculty[faculty_id].college,
+            'department': faculty[faculty_id].department
+        } for faculty_id in group]
+    } for group in groups]
+
+if __name__ == '__main__':
+    with create_app().app_context():
+        init_schema()
+        written = refresh_coauthors()
+        print(f"Rebuilt co-authorship graph with {written} edges")
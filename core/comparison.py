@@ -1,11 +1,13 @@
 from datetime import datetime
 from typing import List, Dict, Optional
-from app import Faculty, Publication
-from database import get_faculty_publications
-from scrapers.publication_scraper import PublicationScraper
+from app import db, Faculty, Publication
+from core.metrics import citation_metrics
+from core.titles import title_fingerprint
 
 class PublicationComparator:
     def __init__(self):
+        from scrapers.publication_scraper import PublicationScraper
+
         self.scraper = PublicationScraper()
 
     def compare_publications(self, old_pubs: List[Publication], new_pubs: List[Dict]) -> Dict:
@@ -22,19 +24,18 @@ class PublicationComparator:
             'removed': []
         }
 
-        # Convert old publications to dict for easier comparison
-        old_pub_dict = {pub.title.lower(): pub for pub in old_pubs}
+        # Match by title fingerprint; stored rows carry theirs precomputed
+        old_pub_dict = {pub.fingerprint or title_fingerprint(pub.title): pub for pub in old_pubs}
 
         # Track new publications
-        new_pub_titles = set([pub['title'].lower() for pub in new_pubs])
+        new_fingerprints = [title_fingerprint(pub['title']) for pub in new_pubs]
 
         # Check for added and updated publications
-        for new_pub in new_pubs:
-            title = new_pub['title'].lower()
-            if title not in old_pub_dict:
+        for new_pub, fingerprint in zip(new_pubs, new_fingerprints):
+            if fingerprint not in old_pub_dict:
                 changes['added'].append(new_pub)
             else:
-                old_pub = old_pub_dict[title]
+                old_pub = old_pub_dict[fingerprint]
                 if (old_pub.citations != new_pub.get('citations', 0) or
                     old_pub.journal != new_pub.get('journal', '') or
                     old_pub.year != new_pub.get('year', 0)):
@@ -48,21 +49,28 @@ class PublicationComparator:
                     })
 
         # Check for removed publications
-        for old_title in old_pub_dict.keys():
-            if old_title not in new_pub_titles:
-                changes['removed'].append(old_title)
+        new_fingerprints = set(new_fingerprints)
+        for fingerprint, old_pub in old_pub_dict.items():
+            if fingerprint not in new_fingerprints:
+                changes['removed'].append(old_pub.title)
 
         return changes
 
-    def update_faculty_publications(self, faculty_id: int) -> Dict:
+    def stored_publications(self, faculty_id: int) -> List:
+        """A faculty member's stored publications: only the compared columns, no ORM objects"""
+        return db.session.query(
+            Publication.fingerprint, Publication.title, Publication.citations,
+            Publication.journal, Publication.year
+        ).filter(Publication.faculty_id == faculty_id).all()
+
+    def update_faculty_publications(self, faculty_id: int, old_publications: Optional[List] = None) -> Dict:
         """Update publications for a specific faculty member"""
-        # Get existing publications
-        faculty_data = get_faculty_publications(faculty_id)
-        if not faculty_data:
+        faculty = db.session.get(Faculty, faculty_id)
+        if not faculty:
             return {'error': 'Faculty not found'}
 
-        faculty = faculty_data['faculty']
-        old_publications = faculty_data['publications']
+        if old_publications is None:
+            old_publications = self.stored_publications(faculty_id)
 
         # Scrape new publications
         new_publications = self.scraper.scrape_publications(
@@ -70,6 +78,13 @@ class PublicationComparator:
             faculty.department
         )
 
+        # Keep only publications whose author list resolves to this faculty member
+        new_publications = [
+            pub for pub in new_publications
+            if not pub.get('authors') or
+            self.scraper.name_index.matches(faculty.name, pub['authors'].split(','))
+        ]
+
         # Compare publications
         changes = self.compare_publications(old_publications, new_publications)
 
@@ -79,14 +94,19 @@ class PublicationComparator:
             'last_updated': datetime.utcnow().isoformat()
         }
 
-    def get_publication_metrics(self, publications: List[Publication]) -> Dict:
-        """Calculate metrics for a list of publications"""
+    def get_publication_metrics(self, publications: List) -> Dict:
+        """Calculate metrics for publications (rows with citations and year), including h/i10/g-index"""
         if not publications:
             return {
                 'total_publications': 0,
                 'total_citations': 0,
                 'average_citations': 0,
-                'recent_publications': 0
+                'recent_publications': 0,
+                'h_index': 0,
+                'i10_index': 0,
+                'g_index': 0,
+                'citations_per_year': 0,
+                'm_quotient': 0
             }
 
         total_publications = len(publications)
@@ -96,27 +116,39 @@ class PublicationComparator:
         current_year = datetime.now().year
         recent_publications = sum(1 for pub in publications if pub.year >= current_year - 2)
 
+        bibliometrics = citation_metrics(
+            [pub.citations or 0 for pub in publications],
+            [pub.year or 0 for pub in publications]
+        )
+
         return {
             'total_publications': total_publications,
             'total_citations': total_citations,
             'average_citations': average_citations,
-            'recent_publications': recent_publications
+            'recent_publications': recent_publications,
+            'h_index': bibliometrics['h_index'],
+            'i10_index': bibliometrics['i10_index'],
+            'g_index': bibliometrics['g_index'],
+            'citations_per_year': bibliometrics['citations_per_year'],
+            'm_quotient': bibliometrics['m_quotient']
         }
 
     def generate_comparison_report(self, faculty_id: int) -> Dict:
         """Generate a comprehensive comparison report for a faculty member"""
-        update_result = self.update_faculty_publications(faculty_id)
+        # Read once: compared with the scrape and used for the metrics
+        old_publications = self.stored_publications(faculty_id)
+        update_result = self.update_faculty_publications(faculty_id, old_publications)
         
         if 'error' in update_result:
             return update_result
 
-        faculty_data = get_faculty_publications(faculty_id)
-        metrics = self.get_publication_metrics(faculty_data['publications'])
+        faculty = db.session.get(Faculty, faculty_id)
+        metrics = self.get_publication_metrics(old_publications)
 
         return {
             'faculty_id': faculty_id,
-            'name': faculty_data['faculty'].name,
-            'department': faculty_data['faculty'].department,
+            'name': faculty.name,
+            'department': faculty.department,
             'metrics': metrics,
             'changes': update_result['changes'],
             'last_updated': update_result['last_updated']
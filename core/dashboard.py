@@ -0,0 +1,201 @@
+"""
+Dashboard aggregates and the change feed behind /api/dashboard/stream.
+
+The payload is computed from the columnar publication snapshot (unfiltered)
+or the rollup cube (filtered) and cached per publication data version, so any number of open dashboards share one computation. A single
+watcher thread per process polls the version counter; idle streams cost
+nothing beyond that one indexed lookup.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from flask import Flask, current_app, json
+from sqlalchemy import func
+from app import db, Faculty, Publication, DataVersion, DepartmentYearRollup, PUBLICATIONS_VERSION
+from core.snapshot import publication_snapshot
+from core.telemetry import record_cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_POLL_INTERVAL = 2
+KEEPALIVE_INTERVAL = 15
+# Each open stream holds a request worker; close it after this many seconds
+# and let EventSource reconnect with Last-Event-ID
+STREAM_MAX_DURATION = int(os.environ.get('SSE_MAX_DURATION', 300))
+
+def current_version() -> int:
+    row = db.session.get(DataVersion, PUBLICATIONS_VERSION)
+    return row.version if row else 0
+
+def build_dashboard_payload(college: str = None, department: str = None) -> Dict:
+    """
+    Totals, yearly trends and top publications, in the /api/dashboard format.
+
+    With a college and/or department filter, totals and trends come from
+    the rollup cube instead of scanning publications.
+    """
+    top_publications = db.session.query(
+        Publication.id, Publication.title, Publication.journal, Publication.year, Publication.citations
+    )
+    last_updated = db.session.query(func.max(Faculty.last_updated))
+    if college or department:
+        totals, trends = _cube_totals_and_trends(college, department)
+        top_publications = _filter_faculty(top_publications.join(Faculty), college, department)
+        top_publications = top_publications.order_by(Publication.citations.desc()).limit(5).all()
+        last_updated = _filter_faculty(last_updated, college, department)
+    else:
+        # Whole-table aggregates are vectorized scans over the columnar snapshot
+        snapshot = publication_snapshot()
+        totals, trends = snapshot.totals(), snapshot.yearly_trends()
+        top_ids = snapshot.top_ids(5)
+        by_id = {pub.id: pub for pub in top_publications.filter(Publication.id.in_(top_ids))} if top_ids else {}
+        top_publications = [by_id[i] for i in top_ids if i in by_id]
+    total_publications, total_citations = totals
+    last_updated = last_updated.scalar() or datetime.utcnow()
+
+    return {
+        'totalPublications': total_publications,
+        'totalCitations': total_citations,
+        'publicationTrends': [
+            {'year': y, 'count': count, 'citations': citations}
+            for y, count, citations in trends
+        ],
+        'topPublications': [{
+            'title': pub.title,
+            'journal': pub.journal,
+            'year': pub.year,
+            'citations': pub.citations
+        } for pub in top_publications],
+        'lastUpdated': last_updated.isoformat(),
+        'nextUpdate': (last_updated.replace(hour=2, minute=0, second=0) +
+                       timedelta(days=1)).isoformat()
+    }
+
+def _filter_faculty(query, college, department):
+    if college:
+        query = query.filter(Faculty.college == college)
+    if department:
+        query = query.filter(Faculty.department == department)
+    return query
+
+def _cube_totals_and_trends(college, department):
+    query = db.session.query(
+        DepartmentYearRollup.year,
+        func.sum(DepartmentYearRollup.publications),
+        func.sum(DepartmentYearRollup.citations)
+    )
+    if college:
+        query = query.filter(DepartmentYearRollup.college == college)
+    if department:
+        query = query.filter(DepartmentYearRollup.department == department)
+
+    # Fold unknown years into 2023 to match the unfiltered trends
+    trends = {}
+    for y, count, citations in query.group_by(DepartmentYearRollup.year):
+        entry = trends.setdefault(y or 2023, [0, 0])
+        entry[0] += count
+        entry[1] += citations
+
+    totals = (sum(count for count, _ in trends.values()),
+              sum(citations for _, citations in trends.values()))
+    return totals, [(y, count, citations) for y, (count, citations) in sorted(trends.items())]
+
+_cache_lock = threading.Lock()
+_cached = {}
+MAX_CACHED_FILTERS = 256
+
+def dashboard_snapshot(college: str = None, department: str = None) -> Tuple[int, Dict]:
+    """Return (version, payload), recomputing only when the data version moved"""
+    key = (college or None, department or None)
+    version = current_version()
+    with _cache_lock:
+        cached = _cached.get(key)
+        hit = bool(cached) and cached[0] == version
+    record_cache('dashboard', hit)
+    if hit:
+        return cached
+    payload = build_dashboard_payload(*key)
+    with _cache_lock:
+        if len(_cached) >= MAX_CACHED_FILTERS:
+            _cached.clear()
+        _cached[key] = (version, payload)
+    return version, payload
+
+def diff_payload(old: Dict, new: Dict) -> Dict:
+    """Top-level keys of `new` whose values differ from `old`"""
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+class VersionWatcher:
+    """One thread per process that polls the data version and wakes waiting streams"""
+
+    def __init__(self, interval: float = VERSION_POLL_INTERVAL):
+        self.interval = interval
+        self.version = None
+        self._changed = threading.Condition()
+        self._thread = None
+
+    def start(self, app: Flask = None):
+        """Start polling in `app`'s database (default: the current app) unless already running"""
+        with self._changed:
+            if self._thread is None:
+                app = app or current_app._get_current_object()
+                self._thread = threading.Thread(target=self._poll, args=(app,),
+                                                name='dashboard-version-watcher', daemon=True)
+                self._thread.start()
+
+    def wait_for_change(self, seen: Optional[int], timeout: float) -> Optional[int]:
+        """Block until the version differs from `seen` or the timeout passes"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version is not None and self.version != seen, timeout)
+            return self.version
+
+    def _poll(self, app: Flask):
+        while True:
+            try:
+                with app.app_context():
+                    version = current_version()
+                with self._changed:
+                    if version != self.version:
+                        self.version = version
+                        self._changed.notify_all()
+            except Exception as e:
+                logger.error(f"Dashboard version watcher error: {e}")
+            time.sleep(self.interval)
+
+watcher = VersionWatcher()
+
+def stream_dashboard(college: str = None, department: str = None, last_version: int = None):
+    """
+    Yield Server-Sent Events for a dashboard: one full snapshot, then only
+    deltas of the keys that changed whenever the data version moves.
+
+    The stream ends after STREAM_MAX_DURATION seconds. A client reconnecting
+    with the last version it saw (Last-Event-ID) skips the snapshot if the
+    data has not changed since.
+    """
+    watcher.start()
+    deadline = time.monotonic() + STREAM_MAX_DURATION
+    version, payload = dashboard_snapshot(college, department)
+    db.session.remove()
+    if version != last_version:
+        yield f"id: {version}\nevent: snapshot\ndata: {json.dumps(payload)}\n\n"
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        latest = watcher.wait_for_change(version, min(KEEPALIVE_INTERVAL, remaining))
+        if latest is None or latest == version:
+            yield ": keep-alive\n\n"
+            continue
+
+        version, new_payload = dashboard_snapshot(college, department)
+        db.session.remove()
+        delta = diff_payload(payload, new_payload)
+        payload = new_payload
+        if delta:
+            yield f"id: {version}\nevent: delta\ndata: {json.dumps(delta)}\n\n"
@@ -0,0 +1,376 @@
+"""
+Offline author disambiguation.
+
+Every stored publication is one mention of its faculty member's name. The
+batch job blocks mentions by a coarse name key ('first initial + family
+name'), builds a profile per faculty member from co-authors, venues and
+years, and scores every publication against every profile in its block in
+a few vectorized NumPy passes (leave-one-out for the current owner, so a
+paper never vouches for itself). Then, in bulk:
+
+- a publication another faculty member in the block explains clearly better,
+  and whose author list names them (one of their name variants from
+  scrapers/name_index.py), is re-attributed to them; if they already have
+  a copy of it (same title fingerprint or work) the duplicate is removed
+  instead;
+- one that fits its owner, or has no competing namesake, is marked
+  `is_disambiguated`;
+- the rest are left unconfirmed.
+
+    python -m core.disambiguation [--dry-run]
+"""
+
+import argparse
+from typing import Dict, List, Tuple
+import numpy as np
+from sqlalchemy import exists
+from app import create_app, db, init_schema, Faculty, Publication
+from core.pipeline import chunked
+from core.streaming import iter_publication_batches
+from core.titles import title_fingerprint
+from scrapers.name_index import block_key, mention_keys, name_variants
+
+# Weights of the evidence kinds in a candidate's score
+COAUTHOR_WEIGHT = 0.6
+VENUE_WEIGHT = 0.25
+YEAR_WEIGHT = 0.15
+# Years over which the year evidence decays by a factor of e
+YEAR_SCALE = 10.0
+# Minimum score to confirm an owner, and lead required to re-attribute
+MIN_SCORE = 0.3
+REATTRIBUTE_MARGIN = 0.2
+
+# Re-scoring rounds while excluding publications about to move
+MAX_ROUNDS = 5
+
+UPDATE_CHUNK_SIZE = 500
+
+def _read_publications(faculty: List, variant_ids: Dict[str, int]) -> Dict[str, np.ndarray]:
+    """
+    Stream every publication into flat arrays: ids, owner faculty indices,
+    venue ids, years, stored `is_disambiguated` flags (-1 when unset), the
+    (publication, co-author block) incidence and the (publication, name
+    variant) incidence of its author mentions. Rows are read in batches;
+    only the arrays grow with the table. Publications whose faculty member
+    no longer exists are skipped.
+    """
+    faculty_index = {row.id: i for i, row in enumerate(faculty)}
+    own_blocks = [block_key(row.name) for row in faculty]
+    venues, coauthors = {}, {}
+    parts = {name: [] for name in ('ids', 'owner', 'venue', 'year', 'flag', 'incidence_pub',
+                                   'incidence_coauthor', 'variant_pub', 'variant_id')}
+    offset = 0
+    columns = (Publication.id, Publication.faculty_id, Publication.authors, Publication.journal,
+               Publication.year, Publication.is_disambiguated)
+    # SQLite does not enforce the foreign key: deleted faculty leave orphaned rows
+    owned = exists().where(Faculty.id == Publication.faculty_id)
+    for batch in iter_publication_batches(*columns, filters=[owned], order_by=[Publication.id]):
+        ids, owner, venue, year, flag = [], [], [], [], []
+        incidence_pub, incidence_coauthor, variant_pub, variant_id = [], [], [], []
+        for n, (pub_id, faculty_id, authors, journal, pub_year, disambiguated) in enumerate(batch):
+            i = offset + n
+            owner_index = faculty_index[faculty_id]
+            ids.append(pub_id)
+            owner.append(owner_index)
+            journal = ' '.join((journal or '').lower().split())
+            venue.append(venues.setdefault(journal, len(venues)) if journal else -1)
+            year.append(pub_year or 0)
+            flag.append(-1 if disambiguated is None else int(disambiguated))
+
+            mentions = (authors or '').split(',')
+            for author in {block_key(mention) for mention in mentions}:
+                if author and author != own_blocks[owner_index]:
+                    incidence_pub.append(i)
+                    incidence_coauthor.append(coauthors.setdefault(author, len(coauthors)))
+            for variant in {variant_ids.get(key) for mention in mentions for key in mention_keys(mention)}:
+                if variant is not None:
+                    variant_pub.append(i)
+                    variant_id.append(variant)
+
+        for name, values in (('ids', ids), ('owner', owner), ('venue', venue), ('year', year), ('flag', flag),
+                             ('incidence_pub', incidence_pub), ('incidence_coauthor', incidence_coauthor),
+                             ('variant_pub', variant_pub), ('variant_id', variant_id)):
+            parts[name].append(np.array(values, dtype=np.int64))
+        offset += len(batch)
+
+    return {name: np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+            for name, arrays in parts.items()}
+
+def _faculty_variants(faculty: List) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+    """Name variant ids, and each faculty member's variants as offsets into a flat id array"""
+    variant_ids = {}
+    offsets, flat = [0], []
+    for row in faculty:
+        flat.extend(variant_ids.setdefault(variant, len(variant_ids)) for variant in sorted(name_variants(row.name)))
+        offsets.append(len(flat))
+    return variant_ids, np.array(offsets, dtype=np.int64), np.array(flat, dtype=np.int64)
+
+def score_candidates(pub_owner: np.ndarray, pub_block: np.ndarray, pub_venue: np.ndarray,
+                     pub_year: np.ndarray, incidence_pub: np.ndarray, incidence_coauthor: np.ndarray,
+                     faculty_block: np.ndarray, in_profile: np.ndarray = None) -> Dict[str, np.ndarray]:
+    """
+    Score each publication against each faculty member of its block.
+
+    Publications are indexed 0..P-1 with owner faculty indices, block ids,
+    venue ids (-1 unknown) and years (0 unknown); co-authors are given as
+    parallel (publication, co-author id) incidence arrays. Only publications
+    selected by `in_profile` (default all) build the faculty profiles.
+    Returns parallel arrays 'pub', 'candidate' and 'score', one entry per
+    candidate pair.
+    """
+    n_faculty = faculty_block.size
+    n_pubs = pub_owner.size
+    if in_profile is None:
+        in_profile = np.ones(n_pubs, dtype=bool)
+
+    # Candidate pairs: every faculty member sharing the publication's block
+    faculty_order = np.argsort(faculty_block, kind='stable')
+    sorted_blocks = faculty_block[faculty_order]
+    starts = np.searchsorted(sorted_blocks, pub_block, side='left')
+    ends = np.searchsorted(sorted_blocks, pub_block, side='right')
+    sizes = ends - starts
+    pair_pub = np.repeat(np.arange(n_pubs), sizes)
+    offsets = np.arange(pair_pub.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    pair_candidate = faculty_order[np.repeat(starts, sizes) + offsets]
+    is_owner = pair_candidate == pub_owner[pair_pub]
+    # Pairs whose own publication is part of the candidate's profile
+    self_support = is_owner & in_profile[pair_pub]
+
+    # Co-author evidence: share of the paper's co-authors seen on the candidate's other papers
+    n_coauthors = int(incidence_coauthor.max()) + 1 if incidence_coauthor.size else 1
+    profiled = in_profile[incidence_pub]
+    profile_keys, profile_counts = np.unique(
+        pub_owner[incidence_pub[profiled]].astype(np.int64) * n_coauthors + incidence_coauthor[profiled],
+        return_counts=True
+    )
+    coauthors_per_pub = np.bincount(incidence_pub, minlength=n_pubs)
+
+    # Expand pairs by the paper's co-authors (incidence sorted by publication)
+    incidence_order = np.argsort(incidence_pub, kind='stable')
+    incidence_start = np.concatenate(([0], np.cumsum(coauthors_per_pub)[:-1]))
+    per_pair = coauthors_per_pub[pair_pub]
+    row_pair = np.repeat(np.arange(pair_pub.size), per_pair)
+    row_offset = np.arange(row_pair.size) - np.repeat(np.cumsum(per_pair) - per_pair, per_pair)
+    row_coauthor = incidence_coauthor[incidence_order[incidence_start[pair_pub[row_pair]] + row_offset]]
+    row_key = pair_candidate[row_pair].astype(np.int64) * n_coauthors + row_coauthor
+    row_count = _lookup_counts(profile_keys, profile_counts, row_key) - self_support[row_pair]
+    shared = np.bincount(row_pair, weights=row_count > 0, minlength=pair_pub.size)
+    coauthor_score = shared / np.maximum(per_pair, 1)
+
+    # Venue evidence: the candidate published elsewhere in the same venue
+    known_venue = pub_venue >= 0
+    n_venues = int(pub_venue.max()) + 1 if known_venue.any() else 1
+    profiled = known_venue & in_profile
+    venue_keys, venue_counts = np.unique(
+        pub_owner[profiled].astype(np.int64) * n_venues + pub_venue[profiled], return_counts=True
+    )
+    pair_venue = pub_venue[pair_pub]
+    venue_count = _lookup_counts(venue_keys, venue_counts,
+                                 pair_candidate.astype(np.int64) * n_venues + np.maximum(pair_venue, 0))
+    venue_score = ((pair_venue >= 0) & (venue_count - self_support > 0)).astype(np.float64)
+
+    # Year evidence: distance from the candidate's mean publication year
+    known_year = (pub_year > 0) & in_profile
+    year_sum = np.bincount(pub_owner[known_year], weights=pub_year[known_year], minlength=n_faculty)
+    year_n = np.bincount(pub_owner[known_year], minlength=n_faculty).astype(np.float64)
+    pair_year = pub_year[pair_pub]
+    own_year = self_support & (pair_year > 0)
+    other_sum = year_sum[pair_candidate] - np.where(own_year, pair_year, 0)
+    other_n = year_n[pair_candidate] - own_year
+    has_year = (pair_year > 0) & (other_n > 0)
+    mean_year = np.divide(other_sum, other_n, out=np.zeros_like(other_sum), where=other_n > 0)
+    year_score = np.where(has_year, np.exp(-np.abs(pair_year - mean_year) / YEAR_SCALE), 0.0)
+
+    return {
+        'pub': pair_pub,
+        'candidate': pair_candidate,
+        'score': COAUTHOR_WEIGHT * coauthor_score + VENUE_WEIGHT * venue_score + YEAR_WEIGHT * year_score
+    }
+
+def _lookup_counts(keys: np.ndarray, counts: np.ndarray, query: np.ndarray) -> np.ndarray:
+    if keys.size == 0:
+        return np.zeros(query.size, dtype=np.int64)
+    position = np.minimum(np.searchsorted(keys, query), keys.size - 1)
+    return np.where(keys[position] == query, counts[position], 0)
+
+def name_matches(pair_pub: np.ndarray, pair_candidate: np.ndarray, pub_variants: np.ndarray,
+                 variant_offsets: np.ndarray, variants: np.ndarray, n_variants: int) -> np.ndarray:
+    """
+    Whether each candidate's name appears in the publication's author list.
+
+    `pub_variants` holds publication * n_variants + variant id for every
+    name variant an author mention resolves to; candidate i's variant ids
+    are variants[variant_offsets[i]:variant_offsets[i + 1]].
+    """
+    per_pair = (variant_offsets[1:] - variant_offsets[:-1])[pair_candidate]
+    row_pair = np.repeat(np.arange(pair_pub.size), per_pair)
+    row_offset = np.arange(row_pair.size) - np.repeat(np.cumsum(per_pair) - per_pair, per_pair)
+    row_key = pair_pub[row_pair].astype(np.int64) * n_variants + variants[variant_offsets[pair_candidate[row_pair]] + row_offset]
+    found = _lookup_counts(pub_variants, np.ones(pub_variants.size, dtype=np.int64), row_key) > 0
+    return np.bincount(row_pair, weights=found, minlength=pair_pub.size) > 0
+
+def decide(pub_owner: np.ndarray, pairs: Dict[str, np.ndarray],
+           name_match: np.ndarray = None) -> Dict[str, np.ndarray]:
+    """
+    Turn candidate scores into per-publication decisions.
+
+    Only namesakes whose name appears in the author list (`name_match`,
+    aligned with the pairs; default all) compete with the current owner.
+    Returns 'owner' (the faculty index each publication should belong to)
+    and 'confirmed' (whether its attribution counts as disambiguated).
+    """
+    n_pubs = pub_owner.size
+    pub, candidate, score = pairs['pub'], pairs['candidate'], pairs['score']
+    is_owner = candidate == pub_owner[pub]
+
+    own_score = np.zeros(n_pubs)
+    own_score[pub[is_owner]] = score[is_owner]
+
+    # Best competing namesake per publication
+    rivals = ~is_owner if name_match is None else ~is_owner & name_match
+    order = np.lexsort((-score[rivals], pub[rivals]))
+    rival_pub, rival_candidate, rival_score = pub[rivals][order], candidate[rivals][order], score[rivals][order]
+    first = np.ones(rival_pub.size, dtype=bool)
+    first[1:] = rival_pub[1:] != rival_pub[:-1]
+    best_score = np.full(n_pubs, -1.0)
+    best_candidate = np.full(n_pubs, -1)
+    best_score[rival_pub[first]] = rival_score[first]
+    best_candidate[rival_pub[first]] = rival_candidate[first]
+
+    has_rival = best_candidate >= 0
+    reattribute = has_rival & (best_score >= MIN_SCORE) & (best_score > own_score + REATTRIBUTE_MARGIN)
+    owner = np.where(reattribute, best_candidate, pub_owner)
+    confirmed = reattribute | (~has_rival) | ((own_score >= MIN_SCORE) & (own_score >= best_score))
+    return {'owner': owner, 'confirmed': confirmed}
+
+def run_disambiguation(dry_run: bool = False) -> Dict[str, int]:
+    """Score every stored publication and apply the decisions in bulk"""
+    empty = {'publications': 0, 'confirmed': 0, 'reattributed': 0, 'merged': 0, 'unconfirmed': 0}
+    faculty = db.session.query(Faculty.id, Faculty.name).order_by(Faculty.id).all()
+    if not faculty:
+        return empty
+
+    faculty_ids = np.array([row.id for row in faculty], dtype=np.int64)
+    blocks = {}
+    faculty_block = np.array([blocks.setdefault(block_key(row.name), len(blocks)) for row in faculty])
+    variant_ids, variant_offsets, variants = _faculty_variants(faculty)
+
+    data = _read_publications(faculty, variant_ids)
+    pub_ids, pub_owner = data['ids'], data['owner']
+    if not pub_ids.size:
+        return empty
+    pub_variants = np.unique(data['variant_pub'] * len(variant_ids) + data['variant_id'])
+
+    # Publications about to move must not vouch for their current owner (or
+    # two misattributed papers would swap places), so drop them from the
+    # profiles and re-score until the set of moves settles.
+    in_profile = np.ones(pub_ids.size, dtype=bool)
+    name_match = None
+    for _ in range(MAX_ROUNDS):
+        pairs = score_candidates(pub_owner, faculty_block[pub_owner], data['venue'], data['year'],
+                                 data['incidence_pub'], data['incidence_coauthor'], faculty_block, in_profile)
+        if name_match is None:
+            # The candidate pairs are the same every round; owners need no name check
+            rivals = np.flatnonzero(pairs['candidate'] != pub_owner[pairs['pub']])
+            name_match = np.ones(pairs['pub'].size, dtype=bool)
+            name_match[rivals] = name_matches(pairs['pub'][rivals], pairs['candidate'][rivals], pub_variants,
+                                              variant_offsets, variants, len(variant_ids))
+        decision = decide(pub_owner, pairs, name_match)
+        moved = decision['owner'] != pub_owner
+        if np.array_equal(in_profile, ~moved):
+            break
+        in_profile = ~moved
+
+    # Moves onto a faculty member who already has the paper become merges
+    moves, merged = {}, []
+    for new_owner in np.unique(decision['owner'][moved]):
+        selected = pub_ids[moved & (decision['owner'] == new_owner)]
+        keep, duplicates = _split_duplicates(int(faculty_ids[new_owner]), selected.tolist())
+        moves[int(faculty_ids[new_owner])] = keep
+        merged.extend(duplicates)
+
+    stats = {
+        'publications': int(pub_ids.size),
+        'confirmed': int(decision['confirmed'].sum()),
+        'reattributed': int(moved.sum()) - len(merged),
+        'merged': len(merged),
+        'unconfirmed': int((~decision['confirmed']).sum())
+    }
+    if dry_run:
+        return stats
+
+    # Write only flags that change: every bulk update bumps the data version and
+    # stamps row_version, which makes snapshot and dashboard readers refresh
+    changed = (data['flag'] != decision['confirmed']) & ~np.isin(pub_ids, merged)
+    for confirmed in (True, False):
+        _bulk_update(pub_ids[changed & (decision['confirmed'] == confirmed)].tolist(),
+                     {'is_disambiguated': confirmed})
+    for new_owner_id, ids in moves.items():
+        _bulk_update(ids, {'faculty_id': new_owner_id})
+    for chunk in chunked(merged, UPDATE_CHUNK_SIZE):
+        Publication.query.filter(Publication.id.in_(chunk)).delete(synchronize_session=False)
+    affected_ids = faculty_ids[np.unique(np.concatenate((pub_owner[moved], decision['owner'][moved])))].tolist()
+    db.session.commit()
+
+    if affected_ids:
+        from core.metrics import refresh_metrics
+        from core.coauthors import refresh_coauthors
+        from core.rollups import refresh_rollups_for_faculty
+
+        refresh_metrics(affected_ids)
+        refresh_rollups_for_faculty(affected_ids)
+        refresh_coauthors(affected_ids)
+
+    return stats
+
+def _split_duplicates(faculty_id: int, ids: List[int]) -> Tuple[List[int], List[int]]:
+    """
+    Split publications about to move to `faculty_id` into those to move and
+    duplicates of a paper they already have (or that an earlier publication
+    of the same move brings): same title fingerprint or same work.
+    """
+    moving = {}
+    for chunk in chunked(ids, UPDATE_CHUNK_SIZE):
+        for pub_id, fingerprint, title, work_id in db.session.query(
+            Publication.id, Publication.fingerprint, Publication.title, Publication.work_id
+        ).filter(Publication.id.in_(chunk)):
+            moving[pub_id] = (fingerprint or title_fingerprint(title), work_id)
+
+    held_fingerprints, held_works = set(), set()
+    owned = db.session.query(Publication.fingerprint, Publication.work_id).filter(Publication.faculty_id == faculty_id)
+    for chunk in chunked(sorted({fingerprint for fingerprint, _ in moving.values()}), UPDATE_CHUNK_SIZE):
+        held_fingerprints.update(fingerprint for fingerprint, _ in owned.filter(Publication.fingerprint.in_(chunk)))
+    for chunk in chunked(sorted({work_id for _, work_id in moving.values() if work_id}), UPDATE_CHUNK_SIZE):
+        held_works.update(work_id for _, work_id in owned.filter(Publication.work_id.in_(chunk)))
+
+    keep, duplicates = [], []
+    for pub_id in sorted(moving):
+        fingerprint, work_id = moving[pub_id]
+        if fingerprint in held_fingerprints or (work_id and work_id in held_works):
+            duplicates.append(pub_id)
+            continue
+        keep.append(pub_id)
+        held_fingerprints.add(fingerprint)
+        if work_id:
+            held_works.add(work_id)
+    return keep, duplicates
+
+def _bulk_update(ids: List[int], values: Dict):
+    for chunk in chunked(ids, UPDATE_CHUNK_SIZE):
+        Publication.query.filter(Publication.id.in_(chunk)).update(values, synchronize_session=False)
+
+def main():
+    parser = argparse.ArgumentParser(description='Disambiguate authorship of all stored publications')
+    parser.add_argument('--dry-run', action='store_true', help='report decisions without writing them')
+    args = parser.parse_args()
+
+    with create_app().app_context():
+        init_schema()
+        stats = run_disambiguation(dry_run=args.dry_run)
+    print(f"{stats['publications']} publications: {stats['confirmed']} confirmed, "
+          f"{stats['reattributed']} re-attributed, {stats['merged']} merged into an existing copy, "
+          f"{stats['unconfirmed']} left unconfirmed"
+          + (' (dry run)' if args.dry_run else ''))
+
+if __name__ == '__main__':
+    main()
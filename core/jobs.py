@@ -0,0 +1,325 @@
+"""
+Database-backed queue for faculty searches.
+
+Web requests only enqueue a SearchJob row; a pool of worker threads claims
+queued jobs, runs the scrape and stores the result on the job. The pool is
+started lazily inside each web process (SEARCH_WORKERS threads, 0 disables
+it) or as a dedicated process with `python -m core.jobs`.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from flask import Flask, current_app
+from sqlalchemy import case, or_
+from sqlalchemy.exc import IntegrityError
+from app import create_app, db, init_schema, SearchJob, SearchJobEvent
+from core.logs import configure_logging, log_context
+from core.profiling import profile_job
+from core.search import SEARCH_RESULT_TTL, run_faculty_search, search_key
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+POLL_INTERVAL = 2
+# How often the SSE stream checks for new events, and sends a keep-alive
+EVENT_POLL_INTERVAL = 0.5
+EVENT_KEEPALIVE = 15
+# Each open stream holds a request worker; close it after this many seconds
+# and let EventSource reconnect with Last-Event-ID
+EVENT_STREAM_MAX_DURATION = int(os.environ.get('SSE_MAX_DURATION', 300))
+# A running job not heartbeating for this long belongs to a dead worker
+STALE_AFTER = timedelta(minutes=10)
+
+def reusable_job_criteria():
+    """Jobs a new identical search can attach to: in flight, or finished successfully moments ago"""
+    fresh_after = datetime.utcnow() - timedelta(seconds=SEARCH_RESULT_TTL)
+    return or_(
+        SearchJob.status.in_((QUEUED, RUNNING)),
+        (SearchJob.status == DONE) & (SearchJob.finished_at >= fresh_after)
+    )
+
+def find_reusable_job(key: str) -> Optional[SearchJob]:
+    """An in-flight job for the same search, or one that finished successfully moments ago"""
+    return SearchJob.query.filter(
+        SearchJob.search_key == key,
+        reusable_job_criteria()
+    ).order_by(SearchJob.created_at.desc()).first()
+
+def enqueue_search(faculty_name: str, department: str, college: str) -> SearchJob:
+    """
+    Queue a faculty search and wake the local workers.
+
+    Duplicate searches are coalesced: if the same normalized search is
+    already queued or running, or finished within SEARCH_RESULT_TTL, that
+    job is returned instead of queueing another scrape.
+    """
+    key = search_key(faculty_name, department, college)
+
+    existing = find_reusable_job(key)
+    if existing:
+        return existing
+
+    job = SearchJob(
+        id=uuid.uuid4().hex,
+        search_key=key,
+        name=faculty_name,
+        department=department,
+        college=college,
+        status=QUEUED,
+        stage='Queued',
+        progress=0
+    )
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Lost the race against a concurrent identical search; attach to it
+        db.session.rollback()
+        existing = find_reusable_job(key)
+        if not existing:
+            raise
+        return existing
+
+    wake_workers()
+    return job
+
+def claim_next_job(worker: str) -> Optional[SearchJob]:
+    """Claim the oldest queued job (or one abandoned by a dead worker)"""
+    while True:
+        now = datetime.utcnow()
+        job = SearchJob.query.filter(or_(
+            SearchJob.status == QUEUED,
+            (SearchJob.status == RUNNING) & (SearchJob.updated_at < now - STALE_AFTER)
+        )).order_by(SearchJob.created_at).first()
+
+        if not job:
+            return None
+
+        # Compare-and-set so that only one worker wins the job
+        claimed = SearchJob.query.filter_by(id=job.id, status=job.status, updated_at=job.updated_at).update({
+            'status': RUNNING,
+            'worker': worker,
+            'started_at': now,
+            'updated_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+
+        if claimed:
+            db.session.refresh(job)
+            return job
+
+def update_progress(job_id: str, stage: str, progress: int):
+    # Sources and storage interleave while streaming; never move the bar back
+    SearchJob.query.filter_by(id=job_id).update({
+        'stage': stage,
+        'progress': case((SearchJob.progress > progress, SearchJob.progress), else_=progress),
+        'updated_at': datetime.utcnow()
+    }, synchronize_session=False)
+    db.session.commit()
+
+def record_event(job_id: str, event: str, data: Dict):
+    """Append a progress event for SSE subscribers and mirror it onto the job row"""
+    if event == 'stage':
+        stage, progress = data['stage'], data['progress']
+    elif event == 'scholar_page':
+        stage, progress = f"Google Scholar page {data['page']} fetched", 30
+    elif event == 'crossref_page':
+        stage, progress = f"CrossRef cursor page {data['page']} fetched", 50
+    elif event == 'deduplicated':
+        stage, progress = f"{data['after']} unique publications after deduplication", 60
+    elif event == 'stored':
+        stage, progress = f"{data['added']} new publications saved so far", 65
+    elif event == 'committed':
+        stage, progress = f"{data['added']} new publications saved", 85
+    else:
+        stage, progress = None, None
+
+    db.session.add(SearchJobEvent(job_id=job_id, event=event, data=json.dumps(data)))
+    if stage:
+        update_progress(job_id, stage, progress)
+    else:
+        db.session.commit()
+
+def finish_job(job_id: str, result: Dict = None, error: str = None):
+    now = datetime.utcnow()
+    SearchJob.query.filter_by(id=job_id).update({
+        'status': FAILED if error else DONE,
+        'stage': 'Failed' if error else 'Done',
+        'progress': 100,
+        'result': json.dumps(result) if result is not None else None,
+        'error': error,
+        'finished_at': now,
+        'updated_at': now
+    }, synchronize_session=False)
+    db.session.add(SearchJobEvent(
+        job_id=job_id,
+        event='failed' if error else 'done',
+        data=json.dumps({'error': error} if error else result)
+    ))
+    db.session.commit()
+
+def stream_job_events(job_id: str, last_event_id: int = 0):
+    """
+    Yield a job's events in Server-Sent Events format until it finishes, or
+    until EVENT_STREAM_MAX_DURATION passes.
+
+    Earlier events are replayed first, so clients attaching late (or
+    reconnecting with Last-Event-ID after the stream was closed) see the
+    full progress history.
+    """
+    idle = 0
+    deadline = time.monotonic() + EVENT_STREAM_MAX_DURATION
+    while time.monotonic() < deadline:
+        events = SearchJobEvent.query.filter(
+            SearchJobEvent.job_id == job_id,
+            SearchJobEvent.id > last_event_id
+        ).order_by(SearchJobEvent.id).all()
+        # End the read transaction so the next poll sees new rows
+        db.session.rollback()
+
+        for event in events:
+            last_event_id = event.id
+            yield f"id: {event.id}\nevent: {event.event}\ndata: {event.data}\n\n"
+            if event.event in ('done', 'failed'):
+                return
+
+        if events:
+            idle = 0
+        else:
+            job = db.session.get(SearchJob, job_id)
+            if job is None:
+                # Unknown id, or pruned while the stream was open
+                yield f"event: failed\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+            if job.status in (DONE, FAILED):
+                # Finished before any terminal event was recorded for it
+                data = job.result if job.status == DONE else json.dumps({'error': job.error})
+                yield f"event: {job.status}\ndata: {data}\n\n"
+                return
+            db.session.rollback()
+            idle += EVENT_POLL_INTERVAL
+            if idle >= EVENT_KEEPALIVE:
+                idle = 0
+                yield ": keep-alive\n\n"
+        time.sleep(EVENT_POLL_INTERVAL)
+
+def job_status(job: SearchJob) -> Dict:
+    """JSON payload reported by the /jobs/<id> endpoint"""
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'stage': job.stage,
+        'progress': job.progress,
+        'name': job.name,
+        'department': job.department,
+        'college': job.college,
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.error,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+
+def run_job(job: SearchJob):
+    """Execute a claimed job, recording its result or error on the row"""
+    job_id = job.id
+    with log_context(job_id=job_id), profile_job(f"search {job_id}"):
+        try:
+            result = run_faculty_search(
+                job.name, job.department, job.college,
+                progress=lambda event, data: record_event(job_id, event, data)
+            )
+            finish_job(job_id, result=result)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Search job {job_id} failed: {str(e)}")
+            finish_job(job_id, error=f'Search failed: {str(e)}')
+
+class SearchWorkerPool:
+    """
+    Fixed set of threads that drain the search queue.
+
+    Workers run in the application given here, or the one current when
+    `start()` is called, so they use that app's database and config.
+    """
+
+    def __init__(self, size: int, app: Flask = None):
+        self.size = size
+        self.app = app
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self.app is None:
+            self.app = current_app._get_current_object()
+        for i in range(self.size):
+            thread = threading.Thread(target=self._work, args=(f"{self.name}:{i}",),
+                                      name=f"search-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _work(self, worker: str):
+        while True:
+            try:
+                with self.app.app_context():
+                    job = claim_next_job(worker)
+                    if job:
+                        run_job(job)
+                        continue
+            except Exception as e:
+                logger.error(f"Search worker {worker} error: {str(e)}")
+
+            self._wakeup.wait(POLL_INTERVAL)
+            self._wakeup.clear()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def wake_workers():
+    """Let this process's idle workers pick up newly queued jobs right away"""
+    if _pool:
+        _pool.wake()
+
+def ensure_worker_pool() -> Optional[SearchWorkerPool]:
+    """Start this process's worker pool on first use, bound to the current app"""
+    global _pool
+
+    size = int(os.environ.get('SEARCH_WORKERS', 2))
+    if size <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = SearchWorkerPool(size)
+            _pool.start()
+    return _pool
+
+def main():
+    app = create_app()
+    with app.app_context():
+        init_schema()
+
+    pool = SearchWorkerPool(int(os.environ.get('SEARCH_WORKERS', 4)), app)
+    pool.start()
+    logger.info(f"Search worker pool started with {pool.size} threads")
+    while True:
+        time.sleep(60)
+
+if __name__ == '__main__':
+    configure_logging()
+    main()
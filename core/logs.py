@@ -0,0 +1,168 @@
+"""
+Structured, non-blocking logging.
+
+configure_logging() routes the root logger through a QueueHandler: callers
+only enqueue records, and a QueueListener thread formats and writes them, so
+log I/O never runs on request or worker threads. Each record carries the
+fields bound with log_context()/bind() (request id, job id, faculty id) and
+any `extra` fields, rendered as key=value pairs or as JSON lines
+(LOG_FORMAT=json). DEBUG records are sampled per call site: the first and
+then every LOG_DEBUG_SAMPLE-th one is kept, so per-item events can stay in
+hot loops.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict
+from flask import g, request
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()
+LOG_DEBUG_SAMPLE = max(int(os.environ.get('LOG_DEBUG_SAMPLE', 100)), 1)
+
+_context: contextvars.ContextVar[Dict] = contextvars.ContextVar('log_context', default={})
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'context'}
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields to every record logged inside the block (and threads it copies its context to)"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+def bind(**fields):
+    """Add fields to the current context until the enclosing log_context() exits"""
+    _context.set({**_context.get(), **fields})
+
+def current_context() -> Dict:
+    return _context.get()
+
+class ContextFilter(logging.Filter):
+    """Copy the caller's context onto the record before it crosses the queue"""
+
+    def filter(self, record):
+        record.context = _context.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep the first and then every `rate`-th DEBUG record of each call site"""
+
+    def __init__(self, rate: int = LOG_DEBUG_SAMPLE):
+        super().__init__()
+        self.rate = rate
+        self._seen = {}
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate <= 1:
+            return True
+        site = (record.pathname, record.lineno)
+        # Unlocked: a lost increment only shifts which record is sampled
+        seen = self._seen.get(site, 0)
+        self._seen[site] = seen + 1
+        if seen % self.rate:
+            return False
+        if seen:
+            record.sampled = f'1/{self.rate}'
+        return True
+
+def _fields(record) -> Dict:
+    fields = dict(getattr(record, 'context', {}))
+    fields.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+    return fields
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = _fields(record)
+        if fields:
+            line += ' | ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            **_fields(record)
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+_lock = threading.Lock()
+_listener = None
+_files = set()
+
+def _output(handler: logging.Handler) -> logging.Handler:
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == 'json' else TextFormatter())
+    return handler
+
+def configure_logging(level: str = None, filename: str = None):
+    """
+    Install the queue handler on the root logger (once per process) and
+    optionally add a log file. Safe to call from every entry point.
+    """
+    global _listener
+    root = logging.getLogger()
+    with _lock:
+        if _listener is None:
+            records = queue.SimpleQueue()
+            handler = QueueHandler(records)
+            handler.addFilter(ContextFilter())
+            handler.addFilter(SamplingFilter())
+            root.addHandler(handler)
+            root.setLevel(LOG_LEVEL)
+            _listener = QueueListener(records, _output(logging.StreamHandler()), respect_handler_level=True)
+            _listener.start()
+            atexit.register(_listener.stop)
+        if level:
+            root.setLevel(level)
+        if filename and filename not in _files:
+            _files.add(filename)
+            _listener.handlers = (*_listener.handlers, _output(logging.FileHandler(filename)))
+
+def init_app(app):
+    """Give each request an id (X-Request-ID when supplied) and bind it, and the faculty id, to its log records"""
+
+    @app.before_request
+    def _bind_request_context():
+        request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex[:16]
+        fields = {'request_id': request_id}
+        if request.view_args and 'faculty_id' in request.view_args:
+            fields['faculty_id'] = request.view_args['faculty_id']
+        g.log_token = _context.set({**_context.get(), **fields})
+
+    @app.after_request
+    def _echo_request_id(response):
+        request_id = _context.get().get('request_id')
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        return response
+
+    @app.teardown_request
+    def _unbind_request_context(exc):
+        token = g.pop('log_token', None)
+        if token is not None:
+            try:
+                _context.reset(token)
+            except ValueError:
+                # Streamed responses finish in a different context
+                _context.set({})
@@ -0,0 +1,162 @@
+"""
+Bibliometrics engine.
+
+Computes h-index, i10-index, g-index, citations per year and m-quotient for
+many faculty members in one vectorized NumPy pass over flat citation arrays,
+and stores the results in FacultyMetrics so pages and APIs read them instead
+of recomputing per request. Run `python -m core.metrics` for a full rebuild;
+ingestion paths call refresh_metrics() for the faculty they touched.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+import numpy as np
+from app import create_app, db, init_schema, Faculty, Publication, FacultyMetrics
+from core.streaming import iter_publication_batches
+
+METRIC_FIELDS = (
+    'total_publications', 'total_citations', 'h_index', 'i10_index',
+    'g_index', 'citations_per_year', 'm_quotient', 'first_year'
+)
+
+def compute_metrics(faculty_ids: np.ndarray, citations: np.ndarray, years: np.ndarray,
+                    current_year: int = None) -> Dict[str, np.ndarray]:
+    """
+    Compute per-faculty metrics from parallel per-publication arrays.
+
+    Returns a dict of equally long arrays, one entry per distinct faculty
+    id (ascending, under 'faculty_id'). Years of 0 or less count as unknown.
+    """
+    current_year = current_year or datetime.utcnow().year
+    faculty_ids = np.asarray(faculty_ids, dtype=np.int64)
+    citations = np.nan_to_num(np.asarray(citations, dtype=np.float64)).astype(np.int64)
+    years = np.nan_to_num(np.asarray(years, dtype=np.float64)).astype(np.int64)
+
+    if faculty_ids.size == 0:
+        return {'faculty_id': faculty_ids, **{field: np.zeros(0) for field in METRIC_FIELDS}}
+
+    # Sort by faculty, then by citations descending within each faculty
+    order = np.lexsort((-citations, faculty_ids))
+    faculty_ids, citations, years = faculty_ids[order], citations[order], years[order]
+
+    groups, starts, counts = np.unique(faculty_ids, return_index=True, return_counts=True)
+    group_index = np.repeat(np.arange(groups.size), counts)
+    rank = np.arange(faculty_ids.size) - starts[group_index] + 1
+
+    total_citations = np.add.reduceat(citations, starts)
+
+    # h-index: papers whose citation count is at least their rank
+    h_index = np.bincount(group_index, weights=citations >= rank, minlength=groups.size)
+
+    i10_index = np.bincount(group_index, weights=citations >= 10, minlength=groups.size)
+
+    # g-index: largest rank g whose top-g papers hold at least g^2 citations
+    cumulative = np.cumsum(citations)
+    cumulative -= np.repeat(cumulative[starts] - citations[starts], counts)
+    g_index = np.maximum.reduceat(np.where(cumulative >= rank ** 2, rank, 0), starts)
+
+    known_years = np.where(years > 0, years, current_year + 1)
+    first_year = np.minimum.reduceat(known_years, starts)
+    has_year = first_year <= current_year
+    career_years = np.where(has_year, current_year - first_year + 1, 1)
+
+    return {
+        'faculty_id': groups,
+        'total_publications': counts,
+        'total_citations': total_citations,
+        'h_index': h_index.astype(np.int64),
+        'i10_index': i10_index.astype(np.int64),
+        'g_index': g_index,
+        'citations_per_year': total_citations / career_years,
+        'm_quotient': np.where(has_year, h_index / career_years, 0.0),
+        'first_year': np.where(has_year, first_year, 0)
+    }
+
+def citation_metrics(citations: Iterable[int], years: Iterable[int]) -> Dict:
+    """Metrics for a single publication list"""
+    citations = list(citations)
+    result = compute_metrics(np.zeros(len(citations)), citations, list(years))
+    if not citations:
+        return {field: 0 for field in METRIC_FIELDS}
+    return {field: result[field][0].item() for field in METRIC_FIELDS}
+
+def refresh_metrics(faculty_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute and store metrics for the given faculty (all when None).
+
+    Only the three needed columns are read, streamed in faculty order and
+    computed faculty by faculty as batches complete, so memory is bounded by
+    the batch size (or the largest single publication list), not the table.
+    Faculty without publications get a zeroed row. Returns the number of
+    rows written.
+    """
+    full_rebuild = faculty_ids is None
+    filters = []
+    if full_rebuild:
+        faculty_ids = [row.id for row in db.session.query(Faculty.id)]
+    else:
+        faculty_ids = sorted(set(faculty_ids))
+        if not faculty_ids:
+            return 0
+        filters.append(Publication.faculty_id.in_(faculty_ids))
+
+    delete = FacultyMetrics.query
+    if not full_rebuild:
+        delete = delete.filter(FacultyMetrics.faculty_id.in_(faculty_ids))
+    delete.delete(synchronize_session=False)
+
+    now = datetime.utcnow()
+    written = set()
+
+    def store(rows: np.ndarray):
+        result = compute_metrics(rows[:, 0], rows[:, 1], rows[:, 2])
+        db.session.bulk_insert_mappings(FacultyMetrics, [dict(
+            {field: result[field][i].item() for field in METRIC_FIELDS},
+            faculty_id=int(faculty_id),
+            computed_at=now
+        ) for i, faculty_id in enumerate(result['faculty_id'])])
+        written.update(int(faculty_id) for faculty_id in result['faculty_id'])
+
+    # Rows of the batch's last faculty may continue in the next batch
+    pending = np.empty((0, 3))
+    for batch in iter_publication_batches(Publication.faculty_id, Publication.citations, Publication.year,
+                                          filters=filters, order_by=[Publication.faculty_id]):
+        # Plain tuples: NumPy probes Row objects for array attributes one by one
+        rows = np.array([tuple(row) for row in batch], dtype=np.float64).reshape(-1, 3)
+        pending = np.concatenate([pending, rows])
+        complete = pending[:, 0] < pending[-1, 0]
+        if complete.any():
+            store(pending[complete])
+            pending = pending[~complete]
+    if len(pending):
+        store(pending)
+
+    empty = [faculty_id for faculty_id in faculty_ids if faculty_id not in written]
+    if empty:
+        db.session.bulk_insert_mappings(FacultyMetrics, [
+            dict({field: 0 for field in METRIC_FIELDS}, faculty_id=faculty_id, computed_at=now)
+            for faculty_id in empty
+        ])
+    db.session.commit()
+    return len(written) + len(empty)
+
+def get_faculty_metrics(faculty_id: int) -> Dict:
+    """Stored metrics for one faculty member, computed once if missing"""
+    metrics = db.session.get(FacultyMetrics, faculty_id)
+    if metrics is None:
+        refresh_metrics([faculty_id])
+        metrics = db.session.get(FacultyMetrics, faculty_id)
+    return metrics_dict(metrics)
+
+def metrics_dict(metrics: FacultyMetrics) -> Dict:
+    return dict(
+        {field: getattr(metrics, field) for field in METRIC_FIELDS},
+        faculty_id=metrics.faculty_id,
+        computed_at=metrics.computed_at.isoformat() if metrics.computed_at else None
+    )
+
+if __name__ == '__main__':
+    with create_app().app_context():
+        init_schema()
+        written = refresh_metrics()
+        print(f"Computed metrics for {written} faculty members")
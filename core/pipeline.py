@@ -0,0 +1,77 @@
+"""
+Small building blocks for streaming ingestion.
+
+`prefetch` runs a producer iterator in a background thread behind a bounded
+queue, so fetching the next page overlaps with processing the current one
+while never running more than `maxsize` items ahead. `chunked` groups a
+stream into fixed-size lists for batched writes.
+"""
+
+import contextvars
+import queue
+import threading
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+_DONE = object()
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+def prefetch(iterable: Iterable[T], maxsize: int = 2) -> Iterator[T]:
+    """
+    Iterate `iterable` in a worker thread, at most `maxsize` items ahead.
+
+    The producer blocks while the queue is full (backpressure) and stops
+    once the consumer closes the generator. Exceptions raised by the
+    producer are re-raised in the consumer. The producer runs in a copy of
+    the consumer's context (log fields, request profile). Producers must not
+    touch the database session; it belongs to the consuming thread.
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(produce,),
+                              name='pipeline-prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield lists of up to `size` consecutive items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,230 @@
+"""
+Opt-in request and job profiling.
+
+With PROFILE_REQUESTS=1 every request records its wall time, SQL statement
+count and time, and time spent in upstream scraper requests. The numbers are
+returned in a Server-Timing header, and requests slower than
+PROFILE_THRESHOLD_MS leave a cProfile dump (.prof, for pstats or snakeviz)
+plus a text report with the hottest functions and the most repeated SQL
+statements in PROFILE_DIR, which keeps the newest PROFILE_KEEP reports.
+
+Scraping runs in background jobs rather than requests, so PROFILE_JOBS=1
+(on by default with PROFILE_REQUESTS) does the same for each search job and
+each faculty refresh wrapped in `profile_job`: the numbers are logged, and
+jobs slower than PROFILE_JOB_THRESHOLD_MS leave a report.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS', '').lower() in ('1', 'true', 'yes')
+PROFILE_THRESHOLD_MS = float(os.environ.get('PROFILE_THRESHOLD_MS', 500))
+PROFILE_JOBS = os.environ.get('PROFILE_JOBS', str(PROFILE_REQUESTS)).lower() in ('1', 'true', 'yes')
+PROFILE_JOB_THRESHOLD_MS = float(os.environ.get('PROFILE_JOB_THRESHOLD_MS', 30000))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join('instance', 'profiles'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 50))
+# Functions listed in a slow-request report
+REPORT_FUNCTIONS = 40
+
+class RequestProfile:
+    """Counters accumulated while one request or background job is handled"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.statements = Counter()
+        self.scrape_count = 0
+        self.scrape_time = 0.0
+        self.profiler = None
+        self.profiling = False
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar('request_profile', default=None)
+# cProfile instruments one request at a time; concurrent requests get counters only
+_profiler_lock = threading.Lock()
+
+# Whether the SQL listeners are installed, i.e. whether jobs are profiled
+_jobs_enabled = False
+
+def record_scrape(seconds: float):
+    """Attribute an upstream request to the request or job being profiled, if any"""
+    profile = _current.get()
+    if profile is not None:
+        profile.scrape_count += 1
+        profile.scrape_time += seconds
+
+def _stop_profiler(profile: RequestProfile):
+    # Released as soon as the response is built: streamed bodies can run for hours
+    if profile.profiling:
+        profile.profiler.disable()
+        profile.profiling = False
+        _profiler_lock.release()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('profile_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    starts = conn.info.get('profile_query_start')
+    if profile is None or not starts:
+        return
+    profile.sql_time += time.perf_counter() - starts.pop()
+    profile.sql_count += 1
+    profile.statements[' '.join(statement.split())[:300]] += 1
+
+def _server_timing(profile: RequestProfile, wall: float) -> str:
+    return (f'app;dur={wall * 1000:.1f}, '
+            f'db;dur={profile.sql_time * 1000:.1f};desc="{profile.sql_count} queries", '
+            f'scrape;dur={profile.scrape_time * 1000:.1f};desc="{profile.scrape_count} requests"')
+
+def _rotate(directory: str, keep: int):
+    reports = sorted(name for name in os.listdir(directory) if name.endswith('.txt'))
+    for name in reports[:max(len(reports) - keep, 0)]:
+        for path in (name, name[:-4] + '.prof'):
+            try:
+                os.remove(os.path.join(directory, path))
+            except FileNotFoundError:
+                pass
+
+def write_report(profile: RequestProfile, wall: float, status: int, directory: str = None) -> str:
+    """Write the .prof dump and text report of a slow request; returns the report path"""
+    route = request.url_rule.rule if request.url_rule else request.path
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+    return _write_report(profile, wall, f"{request.method} {request.full_path.rstrip('?')} -> {status}",
+                         f"{request.method}-{slug}", directory)
+
+def _write_report(profile: RequestProfile, wall: float, title: str, name: str, directory: str = None) -> str:
+    directory = directory or PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r'[^A-Za-z0-9-]+', '_', name).strip('_')
+    base = os.path.join(directory, f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{slug}-{wall * 1000:.0f}ms")
+
+    out = io.StringIO()
+    out.write(f"{title}\n")
+    out.write(f"wall {wall * 1000:.1f} ms | sql {profile.sql_count} statements, {profile.sql_time * 1000:.1f} ms | "
+              f"scrape {profile.scrape_count} requests, {profile.scrape_time * 1000:.1f} ms\n\n")
+    out.write('Most repeated SQL statements:\n')
+    for statement, count in profile.statements.most_common(10):
+        out.write(f'{count:6d}  {statement}\n')
+    if profile.profiler is not None:
+        profile.profiler.dump_stats(base + '.prof')
+        out.write('\n')
+        pstats.Stats(profile.profiler, stream=out).sort_stats('cumulative').print_stats(REPORT_FUNCTIONS)
+
+    with open(base + '.txt', 'w', encoding='utf-8') as f:
+        f.write(out.getvalue())
+    _rotate(directory, PROFILE_KEEP)
+    return base + '.txt'
+
+@contextmanager
+def profile_job(name: str):
+    """
+    Profile a background job run inside the block: SQL and scrape counters,
+    plus cProfile when no other request or job holds it. Logs the totals and
+    writes a report when the job is slower than PROFILE_JOB_THRESHOLD_MS.
+    Does nothing unless job profiling was enabled by `init_app`.
+    """
+    if not _jobs_enabled:
+        yield None
+        return
+
+    profile = RequestProfile()
+    if _profiler_lock.acquire(blocking=False):
+        profile.profiler = cProfile.Profile()
+        profile.profiling = True
+        profile.profiler.enable()
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        wall = profile.elapsed()
+        _stop_profiler(profile)
+        _current.reset(token)
+        logger.info("Job %s: %.0f ms, %d SQL statements (%.0f ms), %d scrape requests (%.0f ms)",
+                    name, wall * 1000, profile.sql_count, profile.sql_time * 1000,
+                    profile.scrape_count, profile.scrape_time * 1000)
+        if wall * 1000 >= PROFILE_JOB_THRESHOLD_MS:
+            try:
+                path = _write_report(profile, wall, f"job {name}", f"job-{name}")
+                logger.warning("Slow job %s: %.0f ms; profile written to %s", name, wall * 1000, path)
+            except OSError as e:
+                logger.error("Error writing job profile: %s", e)
+
+def _listen():
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+def init_app(app, enabled: bool = None, jobs: bool = None):
+    """
+    Install the profiling hooks when PROFILE_REQUESTS (or `enabled`) is set,
+    and enable `profile_job` when PROFILE_JOBS (or `jobs`) is set.
+    """
+    global _jobs_enabled
+    if PROFILE_JOBS if jobs is None else jobs:
+        _listen()
+        _jobs_enabled = True
+    if not (PROFILE_REQUESTS if enabled is None else enabled):
+        return
+
+    _listen()
+
+    @app.before_request
+    def _start_profile():
+        profile = RequestProfile()
+        if _profiler_lock.acquire(blocking=False):
+            profile.profiler = cProfile.Profile()
+            profile.profiling = True
+            profile.profiler.enable()
+        g.profile_token = _current.set(profile)
+
+    @app.after_request
+    def _finish_profile(response):
+        profile = _current.get()
+        if profile is None:
+            return response
+        wall = profile.elapsed()
+        _stop_profiler(profile)
+        response.headers['Server-Timing'] = _server_timing(profile, wall)
+        if wall * 1000 >= PROFILE_THRESHOLD_MS:
+            try:
+                path = write_report(profile, wall, response.status_code)
+                logger.warning("Slow request %s %s: %.0f ms, %d SQL statements; profile written to %s",
+                               request.method, request.path, wall * 1000, profile.sql_count, path)
+            except OSError as e:
+                logger.error("Error writing request profile: %s", e)
+        return response
+
+    @app.teardown_request
+    def _release_profile(exc):
+        token = g.pop('profile_token', None)
+        if token is None:
+            return
+        profile = _current.get()
+        if profile is not None:
+            _stop_profiler(profile)
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Streamed responses finish in a different context
+            _current.set(None)
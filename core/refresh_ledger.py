@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import or_
+from app import db, Faculty, RefreshRun, RefreshRunItem
+
+# Item states
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+# Run states
+RUNNING = 'running'
+COMPLETED = 'completed'
+
+class RefreshLedger:
+    """Tracks per-faculty progress of refresh runs so an interrupted run can resume"""
+
+    def __init__(self, max_attempts: int = 4, backoff_base: int = 30, backoff_cap: int = 900):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+    def open_run(self) -> RefreshRun:
+        """
+        Resume the unfinished run if there is one, otherwise start a new run
+        with a pending item for every faculty member.
+        """
+        run = RefreshRun.query.filter_by(status=RUNNING).order_by(RefreshRun.id.desc()).first()
+
+        if run:
+            # Items left in flight belong to a process that died mid-scrape.
+            # The interrupted attempt still counts, so an item that keeps
+            # killing the process eventually stops being retried.
+            interrupted = RefreshRunItem.query.filter_by(run_id=run.id, status=IN_FLIGHT)
+            interrupted.filter(RefreshRunItem.attempts >= self.max_attempts).update({
+                'status': FAILED,
+                'last_error': 'Interrupted on every attempt',
+                'updated_at': datetime.utcnow()
+            }, synchronize_session=False)
+            interrupted.update({
+                'status': PENDING,
+                'updated_at': datetime.utcnow()
+            }, synchronize_session=False)
+            db.session.commit()
+            return run
+
+        run = RefreshRun(status=RUNNING)
+        db.session.add(run)
+        db.session.flush()
+
+        faculty_ids = [row.id for row in db.session.query(Faculty.id).order_by(Faculty.id)]
+        db.session.bulk_insert_mappings(RefreshRunItem, [
+            {'run_id': run.id, 'faculty_id': faculty_id, 'status': PENDING, 'attempts': 0}
+            for faculty_id in faculty_ids
+        ])
+        db.session.commit()
+        return run
+
+    def claim_next(self, run: RefreshRun) -> Optional[RefreshRunItem]:
+        """Claim the next pending item, or a failed item whose backoff has expired"""
+        while True:
+            now = datetime.utcnow()
+            item = RefreshRunItem.query.filter(
+                RefreshRunItem.run_id == run.id,
+                or_(
+                    RefreshRunItem.status == PENDING,
+                    (RefreshRunItem.status == FAILED) &
+                    (RefreshRunItem.attempts < self.max_attempts) &
+                    (RefreshRunItem.next_attempt_at <= now)
+                )
+            ).order_by(RefreshRunItem.id).first()
+
+            if not item:
+                return None
+
+            # Compare-and-set on the status so two processes never claim the same item
+            claimed = RefreshRunItem.query.filter_by(id=item.id, status=item.status).update({
+                'status': IN_FLIGHT,
+                'attempts': RefreshRunItem.attempts + 1,
+                'updated_at': now
+            }, synchronize_session=False)
+            db.session.commit()
+
+            if claimed:
+                db.session.refresh(item)
+                return item
+
+    def mark_done(self, item: RefreshRunItem):
+        item.status = DONE
+        item.last_error = None
+        item.next_attempt_at = None
+        db.session.commit()
+
+    def mark_failed(self, item: RefreshRunItem, error: str):
+        """Record a failure and schedule the retry with exponential backoff"""
+        delay = min(self.backoff_base * 2 ** (item.attempts - 1), self.backoff_cap)
+        item.status = FAILED
+        item.last_error = error
+        item.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        db.session.commit()
+
+    def seconds_until_retry(self, run: RefreshRun) -> Optional[float]:
+        """Seconds until the earliest retryable failure is due, or None if nothing is left to retry"""
+        next_attempt_at = db.session.query(db.func.min(RefreshRunItem.next_attempt_at)).filter(
+            RefreshRunItem.run_id == run.id,
+            RefreshRunItem.status == FAILED,
+            RefreshRunItem.attempts < self.max_attempts
+        ).scalar()
+
+        if next_attempt_at is None:
+            return None
+        return max((next_attempt_at - datetime.utcnow()).total_seconds(), 0)
+
+    def finish_run(self, run: RefreshRun) -> dict:
+        """Close the run and return a per-status summary"""
+        counts = dict(
+            db.session.query(RefreshRunItem.status, db.func.count(RefreshRunItem.id))
+            .filter_by(run_id=run.id)
+            .group_by(RefreshRunItem.status)
+        )
+        run.status = COMPLETED
+        run.finished_at = datetime.utcnow()
+        db.session.commit()
+        return counts
@@ -0,0 +1,203 @@
+"""
+Department and college rollup cube.
+
+Publication counts and citations are pre-aggregated per (college, department,
+year), and the h-index distribution per (college, department), so
+leaderboards and filtered dashboards read a few hundred cube rows instead of
+scanning publications. Ingestion refreshes the departments it touched;
+`python -m core.rollups` rebuilds the whole cube.
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func, tuple_
+from app import (create_app, db, init_schema, bump_data_version, Faculty, Publication, FacultyMetrics,
+                 DepartmentYearRollup, DepartmentRollup)
+
+# Upper bounds (exclusive) of the h-index histogram buckets
+H_INDEX_BUCKETS = [(0, 1), (1, 5), (5, 10), (10, 20), (20, 40), (40, None)]
+
+LEADERBOARD_METRICS = {
+    # Windowed over publication years
+    'citations': 'citations',
+    'publications': 'publications',
+    # Per department, independent of the window
+    'faculty': DepartmentRollup.faculty_count,
+    'h_index_mean': DepartmentRollup.h_index_mean,
+    'h_index_median': DepartmentRollup.h_index_median,
+    'h_index_max': DepartmentRollup.h_index_max
+}
+
+def _bucket_label(low, high):
+    if high is None:
+        return f'{low}+'
+    if high - low == 1:
+        return str(low)
+    return f'{low}-{high - 1}'
+
+def h_index_histogram(h_values: np.ndarray) -> Dict[str, int]:
+    edges = [low for low, _ in H_INDEX_BUCKETS] + [np.inf]
+    counts, _ = np.histogram(h_values, bins=edges)
+    return {_bucket_label(low, high): int(count) for (low, high), count in zip(H_INDEX_BUCKETS, counts)}
+
+def refresh_rollups(departments: Optional[Iterable[Tuple[str, str]]] = None) -> int:
+    """
+    Recompute cube rows for the given (college, department) pairs, or the
+    whole cube when None. Returns the number of departments written.
+    """
+    if departments is not None:
+        departments = sorted(set(departments))
+        if not departments:
+            return 0
+
+    def scoped(query):
+        if departments is None:
+            return query
+        return query.filter(tuple_(Faculty.college, Faculty.department).in_(departments))
+
+    year = func.coalesce(Publication.year, 0)
+    yearly = scoped(db.session.query(
+        Faculty.college, Faculty.department, year,
+        func.count(Publication.id), func.coalesce(func.sum(Publication.citations), 0)
+    ).join(Publication, Publication.faculty_id == Faculty.id)).group_by(
+        Faculty.college, Faculty.department, year
+    ).all()
+
+    faculty_rows = scoped(db.session.query(
+        Faculty.college, Faculty.department, func.coalesce(FacultyMetrics.h_index, 0)
+    ).outerjoin(FacultyMetrics, FacultyMetrics.faculty_id == Faculty.id)).all()
+
+    now = datetime.utcnow()
+    totals = {}
+    for college, department, y, count, citations in yearly:
+        entry = totals.setdefault((college, department), [0, 0])
+        entry[0] += count
+        entry[1] += citations
+
+    h_by_department = {}
+    for college, department, h_index in faculty_rows:
+        h_by_department.setdefault((college, department), []).append(h_index)
+
+    department_rows = []
+    for key, h_values in h_by_department.items():
+        h_values = np.array(h_values)
+        publications, citations = totals.get(key, (0, 0))
+        department_rows.append({
+            'college': key[0],
+            'department': key[1],
+            'faculty_count': int(h_values.size),
+            'publications': publications,
+            'citations': citations,
+            'h_index_mean': float(h_values.mean()),
+            'h_index_median': float(np.median(h_values)),
+            'h_index_max': int(h_values.max()),
+            'h_index_histogram': json.dumps(h_index_histogram(h_values)),
+            'computed_at': now
+        })
+
+    for model in (DepartmentYearRollup, DepartmentRollup):
+        delete = model.query
+        if departments is not None:
+            delete = delete.filter(tuple_(model.college, model.department).in_(departments))
+        delete.delete(synchronize_session=False)
+
+    db.session.bulk_insert_mappings(DepartmentYearRollup, [{
+        'college': college,
+        'department': department,
+        'year': y,
+        'publications': count,
+        'citations': citations
+    } for college, department, y, count, citations in yearly])
+    db.session.bulk_insert_mappings(DepartmentRollup, department_rows)
+
+    # Cached dashboard payloads read the cube, so they must be recomputed
+    bump_data_version(db.session)
+    db.session.commit()
+    return len(department_rows)
+
+def refresh_rollups_for_faculty(faculty_ids: Iterable[int]) -> int:
+    """Refresh the cube for the departments of the given faculty members"""
+    faculty_ids = list(faculty_ids)
+    if not faculty_ids:
+        return 0
+    departments = db.session.query(Faculty.college, Faculty.department).filter(
+        Faculty.id.in_(faculty_ids)
+    ).distinct().all()
+    return refresh_rollups([tuple(row) for row in departments])
+
+def leaderboard(metric: str = 'citations', years: Optional[int] = None, college: str = None,
+                page: int = 1, limit: int = 20) -> Dict:
+    """
+    Rank departments by a cube metric.
+
+    `years` restricts the windowed metrics (citations, publications) to
+    publications from the last N years. Raises ValueError for unknown metrics.
+    """
+    if metric not in LEADERBOARD_METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {', '.join(LEADERBOARD_METRICS)}")
+
+    windowed = db.session.query(
+        DepartmentYearRollup.college,
+        DepartmentYearRollup.department,
+        func.sum(DepartmentYearRollup.publications).label('publications'),
+        func.sum(DepartmentYearRollup.citations).label('citations')
+    )
+    if years:
+        windowed = windowed.filter(DepartmentYearRollup.year > datetime.utcnow().year - years)
+    windowed = windowed.group_by(DepartmentYearRollup.college, DepartmentYearRollup.department).subquery()
+
+    query = db.session.query(
+        DepartmentRollup,
+        func.coalesce(windowed.c.publications, 0).label('publications'),
+        func.coalesce(windowed.c.citations, 0).label('citations')
+    ).outerjoin(windowed, (windowed.c.college == DepartmentRollup.college) &
+                          (windowed.c.department == DepartmentRollup.department))
+    if college:
+        query = query.filter(DepartmentRollup.college == college)
+
+    order = LEADERBOARD_METRICS[metric]
+    if isinstance(order, str):
+        order = func.coalesce(getattr(windowed.c, order), 0)
+
+    total = query.count()
+    rows = query.order_by(order.desc(), DepartmentRollup.college, DepartmentRollup.department) \
+        .offset((page - 1) * limit).limit(limit).all()
+
+    results = []
+    for rank, (rollup, publications, citations) in enumerate(rows, start=(page - 1) * limit + 1):
+        results.append({
+            'rank': rank,
+            'college': rollup.college,
+            'department': rollup.department,
+            'publications': publications,
+            'citations': citations,
+            'faculty_count': rollup.faculty_count,
+            'h_index_mean': rollup.h_index_mean,
+            'h_index_median': rollup.h_index_median,
+            'h_index_max': rollup.h_index_max,
+            'h_index_histogram': json.loads(rollup.h_index_histogram or '{}')
+        })
+
+    return {
+        'metric': metric,
+        'years': years,
+        'college': college,
+        'page': page,
+        'limit': limit,
+        'total': total,
+        'results': results
+    }
+
+def list_departments() -> List[Dict]:
+    """Colleges and departments present in the cube, for dashboard filters"""
+    rows = db.session.query(DepartmentRollup.college, DepartmentRollup.department) \
+        .order_by(DepartmentRollup.college, DepartmentRollup.department).all()
+    return [{'college': college, 'department': department} for college, department in rows]
+
+if __name__ == '__main__':
+    with create_app().app_context():
+        init_schema()
+        written = refresh_rollups()
+        print(f"Rebuilt rollups for {written} departments")
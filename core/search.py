@@ -0,0 +1,256 @@
+import logging
+import os
+import time
+from datetime import datetime
+from sqlalchemy import or_, update
+from typing import Callable, Dict, Optional
+from app import db, bump_data_version, Faculty, Publication
+from core.coalesce import SingleFlight, TTLCache
+from core.coauthors import refresh_coauthors
+from core.logs import bind, log_context
+from core.metrics import refresh_metrics
+from core.pipeline import chunked
+from core.rollups import refresh_rollups_for_faculty
+from core.telemetry import PUBLICATIONS_INSERTED
+from core.titles import title_columns, title_fingerprint
+from core.works import sync_publication_citations, upsert_works
+
+logger = logging.getLogger(__name__)
+
+# Seconds a finished search result is reused for repeated searches
+SEARCH_RESULT_TTL = int(os.environ.get('SEARCH_RESULT_TTL', 300))
+
+# Publications written per commit while a search streams in
+STORE_CHUNK_SIZE = int(os.environ.get('STORE_CHUNK_SIZE', 50))
+
+_search_flight = SingleFlight()
+_search_results = TTLCache(ttl=SEARCH_RESULT_TTL, name='search_results')
+
+def search_key(faculty_name: str, department: str, college: str) -> str:
+    """Normalized (name, department, college) key used to coalesce duplicate searches"""
+    return '|'.join(' '.join((part or '').lower().split()) for part in (faculty_name, department, college))
+
+def run_faculty_search(faculty_name: str, department: str, college: str,
+                       progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+    """
+    Scrape publications for a faculty member and store the new ones.
+
+    Concurrent searches for the same normalized triple share a single scrape,
+    and a successful result is reused for SEARCH_RESULT_TTL seconds.
+    `progress` is called as progress(event, data) as the search advances
+    (only for the caller that actually runs the scrape): 'stage' events carry
+    a description and a percentage, the scraper reports every source page
+    and the deduplication, 'stored' follows each chunk commit and
+    'committed' the last one. Publications are stored in chunks of
+    STORE_CHUNK_SIZE while the scrape is still running.
+    Returns the result payload reported to the client; errors propagate to
+    the caller after the session is rolled back.
+    """
+    key = search_key(faculty_name, department, college)
+
+    cached = _search_results.get(key)
+    if cached is not None:
+        return cached
+
+    def search():
+        with log_context():
+            result = _search_and_store(faculty_name, department, college, progress)
+        if result['status'] == 'success':
+            _search_results.set(key, result)
+        return result
+
+    return _search_flight.do(key, search)
+
+def _search_and_store(faculty_name, department, college, progress):
+    def report(stage, percent):
+        if progress:
+            progress('stage', {'stage': stage, 'progress': percent})
+
+    started = time.perf_counter()
+    try:
+        report('Looking up faculty record', 5)
+
+        # Check if faculty already exists
+        faculty = Faculty.query.filter_by(name=faculty_name, college=college, department=department).first()
+
+        if not faculty:
+            # Create new faculty record
+            faculty = Faculty(name=faculty_name, college=college, department=department)
+            db.session.add(faculty)
+            db.session.commit()
+            logger.info("Created faculty record %s for %s, %s, %s", faculty.id, faculty_name, department, college)
+        bind(faculty_id=faculty.id)
+
+        # Stream publications from the scraper, committing them chunk by chunk
+        report('Scraping publications', 10)
+        publications_found = 0
+        publications_added = 0
+        chunks_stored = 0
+        scrape_failure = None
+        chunks = None
+        try:
+            from scrapers.publication_scraper import PublicationScraper
+
+            scraper = PublicationScraper()
+            chunks = chunked(scraper.stream_publications(faculty_name, department, college, progress=progress),
+                             STORE_CHUNK_SIZE)
+        except Exception as scrape_error:
+            scrape_failure = scrape_error
+
+        # Scraper errors end the stream; storage errors propagate
+        while chunks is not None:
+            try:
+                chunk = next(chunks, None)
+            except Exception as scrape_error:
+                scrape_failure = scrape_error
+                break
+            if chunk is None:
+                break
+
+            publications_found += len(chunk)
+            publications_added += _store_chunk(faculty, chunk)
+            chunks_stored += 1
+            if progress:
+                progress('stored', {'added': publications_added, 'found': publications_found})
+
+        summary = {'found': publications_found, 'added': publications_added, 'chunks': chunks_stored}
+        if scrape_failure is not None:
+            logger.warning("Search for %s stopped by a scraping error after %.1fs: %s",
+                           faculty_name, time.perf_counter() - started, scrape_failure, extra=summary)
+            if publications_added:
+                # Keep what was committed before the failure visible in metrics
+                _refresh_aggregates(faculty)
+            # Fallback: return a message about scraping failure but don't crash
+            return {
+                'status': 'partial_success',
+                'message': f'Faculty record created for {faculty_name}, but publication scraping failed: {str(scrape_failure)}',
+                'faculty_id': faculty.id,
+                'publications_found': publications_found
+            }
+
+        if progress:
+            progress('committed', {'added': publications_added, 'found': publications_found})
+
+        report('Updating metrics', 90)
+        _refresh_aggregates(faculty)
+
+        report('Done', 100)
+        logger.info("Search for %s stored %d new of %d publications in %.1fs",
+                    faculty_name, publications_added, publications_found, time.perf_counter() - started,
+                    extra=summary)
+        return {
+            'status': 'success',
+            'message': f'Found {publications_found} publications for {faculty_name} ({publications_added} new)',
+            'faculty_id': faculty.id,
+            'faculty_name': faculty_name,
+            'publications_found': publications_found,
+            'publications_added': publications_added,
+            'redirect_url': f'/faculty/{faculty.id}'
+        }
+
+    except Exception:
+        logger.exception("Search for %s, %s, %s failed", faculty_name, department, college)
+        db.session.rollback()
+        raise
+
+def _store_chunk(faculty, chunk) -> int:
+    """
+    Insert the publications of one chunk that the faculty member does not
+    have yet, and commit. Returns the number added; commit errors propagate.
+    """
+    # Canonical works first, so co-authored papers share one row and one citation count
+    work_ids = upsert_works(chunk)
+
+    # Skip papers the faculty member already has, by work or by normalized title
+    titles = [title_columns(pub.get('title', '')) for pub in chunk]
+    existing = set(db.session.query(Publication.fingerprint, Publication.work_id).filter(
+        Publication.faculty_id == faculty.id,
+        or_(Publication.fingerprint.in_({columns['fingerprint'] for columns in titles}),
+            Publication.work_id.in_(set(work_ids)))
+    ))
+    existing_fingerprints = {fingerprint for fingerprint, _ in existing}
+    existing_works = {work_id for _, work_id in existing}
+
+    rows = []
+    for pub, work_id, columns in zip(chunk, work_ids, titles):
+        if columns['fingerprint'] in existing_fingerprints or work_id in existing_works:
+            continue
+        existing_fingerprints.add(columns['fingerprint'])
+        existing_works.add(work_id)
+        rows.append({
+            'title': pub.get('title', ''),
+            'normalized_title': columns['normalized_title'],
+            'fingerprint': columns['fingerprint'],
+            'authors': pub.get('authors', ''),
+            'journal': pub.get('journal', ''),
+            'year': pub.get('year', 0),
+            'citations': pub.get('citations', 0),
+            'doi': pub.get('doi', ''),
+            'faculty_id': faculty.id,
+            'work_id': work_id
+        })
+    added = len(rows)
+    if rows:
+        # Bulk inserts bypass the flush hook: bump the data version and stamp the rows with it
+        version = bump_data_version(db.session)
+        for row in rows:
+            row['row_version'] = version
+    # One executemany
+    db.session.bulk_insert_mappings(Publication, rows)
+    sync_publication_citations(work_ids)
+
+    try:
+        db.session.commit()
+        PUBLICATIONS_INSERTED.inc(added)
+        logger.debug("Committed %d of %d publications", added, len(chunk))
+    except Exception:
+        logger.exception("Error committing %d publications", added)
+        db.session.rollback()
+        raise
+    return added
+
+def store_changes(faculty, changes: Dict) -> Dict[str, int]:
+    """
+    Persist a refresh comparison (core.comparison) in STORE_CHUNK_SIZE chunks,
+    committing each: insert the added publications, update the changed ones
+    in place and delete the removed ones, leaving the rest untouched.
+    Returns the number of rows added, updated and removed.
+    """
+    counts = {'added': 0, 'updated': 0, 'removed': 0}
+    for chunk in chunked(changes.get('added', []), STORE_CHUNK_SIZE):
+        counts['added'] += _store_chunk(faculty, chunk)
+
+    for chunk in chunked([change['new'] for change in changes.get('updated', [])], STORE_CHUNK_SIZE):
+        # Citations live on the canonical work; journal and year on the row
+        work_ids = upsert_works(chunk)
+        fields = {title_fingerprint(pub.get('title', '')): pub for pub in chunk}
+        rows = [{'id': pub_id, 'journal': fields[fingerprint].get('journal', ''),
+                 'year': fields[fingerprint].get('year', 0)}
+                for pub_id, fingerprint in db.session.query(Publication.id, Publication.fingerprint).filter(
+                    Publication.faculty_id == faculty.id, Publication.fingerprint.in_(fields))]
+        if rows:
+            db.session.execute(update(Publication), rows)
+        sync_publication_citations(work_ids)
+        db.session.commit()
+        counts['updated'] += len(rows)
+
+    for chunk in chunked(changes.get('removed', []), STORE_CHUNK_SIZE):
+        fingerprints = {title_fingerprint(title) for title in chunk}
+        counts['removed'] += Publication.query.filter(
+            Publication.faculty_id == faculty.id, Publication.fingerprint.in_(fingerprints)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+    faculty.last_updated = datetime.utcnow()
+    db.session.commit()
+    return counts
+
+def _refresh_aggregates(faculty):
+    try:
+        refresh_metrics([faculty.id])
+        refresh_rollups_for_faculty([faculty.id])
+        refresh_coauthors([faculty.id])
+    except Exception as metrics_error:
+        # Stored publications are fine; metrics catch up on the next refresh
+        logger.error("Error refreshing metrics for faculty %s: %s", faculty.id, metrics_error)
+        db.session.rollback()
@@ -0,0 +1,185 @@
+"""
+Read-only columnar snapshot of the publication table.
+
+Holds id, faculty_id, year, citations and an interned journal id per
+publication as NumPy arrays (about 22 bytes a row), so analytics become
+vectorized scans instead of SQL table scans or ORM objects. The snapshot is
+tied to the publications data version: a reader whose version moved fetches
+only rows written since, by their row_version, and patches a copy of the
+arrays. Every write stamps row_version with the data version it bumps,
+inserts included, so a row committed after rows with higher ids is still
+found. Deletes bump a separate version and force a full rebuild. Snapshots are never mutated, so
+callers may keep using one while another thread refreshes.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from app import create_app, db, init_schema, DataVersion, Publication, PUBLICATIONS_VERSION, PUBLICATION_DELETES_VERSION
+from core.streaming import DEFAULT_TREND_YEAR, iter_publication_batches
+from core.telemetry import record_cache
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (Publication.id, Publication.faculty_id, Publication.year, Publication.citations, Publication.journal)
+
+class PublicationSnapshot:
+    def __init__(self, version: int, deletes_version: int, ids: np.ndarray, faculty_ids: np.ndarray,
+                 years: np.ndarray, citations: np.ndarray, journal_ids: np.ndarray, journals: List[str]):
+        self.version = version
+        self.deletes_version = deletes_version
+        self.ids = ids  # ascending
+        self.faculty_ids = faculty_ids
+        self.years = years  # 0 when unknown
+        self.citations = citations
+        self.journal_ids = journal_ids  # index into journals, -1 when missing
+        self.journals = journals
+        for array in (ids, faculty_ids, years, citations, journal_ids):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.ids, self.faculty_ids, self.years,
+                                              self.citations, self.journal_ids))
+
+    @property
+    def max_id(self) -> int:
+        return int(self.ids[-1]) if len(self.ids) else 0
+
+    def totals(self) -> Tuple[int, int]:
+        """(publications, citations)"""
+        return len(self.ids), int(self.citations.sum(dtype=np.int64))
+
+    def yearly_trends(self, default_year: int = DEFAULT_TREND_YEAR) -> List[Tuple[int, int, int]]:
+        """(year, publications, citations) ascending by year; unknown years count as default_year"""
+        years = np.where(self.years == 0, default_year, self.years)
+        unique, inverse = np.unique(years, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(unique))
+        citations = np.bincount(inverse, weights=self.citations, minlength=len(unique))
+        return [(int(y), int(count), int(total)) for y, count, total in zip(unique, counts, citations)]
+
+    def top_ids(self, n: int = 5) -> List[int]:
+        """Ids of the n most cited publications, lower id first on ties"""
+        if n <= 0 or not len(self.ids):
+            return []
+        if n < len(self.ids):
+            threshold = np.partition(self.citations, len(self.citations) - n)[len(self.citations) - n]
+            candidates = np.flatnonzero(self.citations >= threshold)
+        else:
+            candidates = np.arange(len(self.ids))
+        order = np.lexsort((self.ids[candidates], -self.citations[candidates]))[:n]
+        return [int(i) for i in self.ids[candidates[order]]]
+
+    def journal_name(self, journal_id: int) -> Optional[str]:
+        return self.journals[journal_id] if journal_id >= 0 else None
+
+def _read_rows(filters=(), journals: List[str] = None, journal_index: Dict[str, int] = None):
+    """Column arrays of matching publications (ordered by id), interning journals into the given list"""
+    journals = journals if journals is not None else []
+    journal_index = journal_index if journal_index is not None else {}
+    parts = []
+    for batch in iter_publication_batches(*COLUMNS, filters=filters, order_by=[Publication.id]):
+        values = np.array([(i, f, y or 0, c or 0) for i, f, y, c, _ in batch], dtype=np.int64).reshape(-1, 4)
+        journal_ids = np.empty(len(batch), dtype=np.int32)
+        for n, row in enumerate(batch):
+            journal = row[4]
+            if not journal:
+                journal_ids[n] = -1
+                continue
+            journal_id = journal_index.get(journal)
+            if journal_id is None:
+                journal_id = journal_index[journal] = len(journals)
+                journals.append(journal)
+            journal_ids[n] = journal_id
+        parts.append((values, journal_ids))
+
+    values = np.concatenate([p[0] for p in parts]) if parts else np.empty((0, 4), dtype=np.int64)
+    journal_ids = np.concatenate([p[1] for p in parts]) if parts else np.empty(0, dtype=np.int32)
+    return (values[:, 0].copy(), values[:, 1].astype(np.int32), values[:, 2].astype(np.int16),
+            values[:, 3].astype(np.int32), journal_ids, journals, journal_index)
+
+def build_snapshot(version: int, deletes_version: int) -> PublicationSnapshot:
+    ids, faculty_ids, years, citations, journal_ids, journals, _ = _read_rows()
+    return PublicationSnapshot(version, deletes_version, ids, faculty_ids, years, citations, journal_ids, journals)
+
+def apply_changes(snapshot: PublicationSnapshot, version: int) -> PublicationSnapshot:
+    """A new snapshot with publications updated or inserted since `snapshot` was taken"""
+    journals = list(snapshot.journals)
+    journal_index = {journal: n for n, journal in enumerate(journals)}
+    ids, faculty_ids, years, citations, journal_ids, journals, _ = _read_rows(
+        [Publication.row_version > snapshot.version], journals, journal_index
+    )
+
+    positions = np.searchsorted(snapshot.ids, ids)
+    known = positions < len(snapshot.ids)
+    known[known] = snapshot.ids[positions[known]] == ids[known]
+
+    columns = [snapshot.ids, snapshot.faculty_ids, snapshot.years, snapshot.citations, snapshot.journal_ids]
+    updates = [ids, faculty_ids, years, citations, journal_ids]
+    patched = []
+    for column, update in zip(columns, updates):
+        column = column.copy()
+        column[positions[known]] = update[known]
+        patched.append(np.concatenate([column, update[~known]]))
+    if (~known).any() and len(snapshot.ids) and ids[~known].min() < snapshot.max_id:
+        # Inserts committed after rows with higher ids; keep ids ascending
+        order = np.argsort(patched[0], kind='stable')
+        patched = [column[order] for column in patched]
+
+    logger.debug("Snapshot refresh: %d updated, %d inserted", int(known.sum()), int((~known).sum()))
+    return PublicationSnapshot(version, snapshot.deletes_version, *patched, journals)
+
+def _versions() -> Tuple[int, int]:
+    rows = dict(db.session.query(DataVersion.name, DataVersion.version).filter(
+        DataVersion.name.in_([PUBLICATIONS_VERSION, PUBLICATION_DELETES_VERSION])
+    ))
+    return rows.get(PUBLICATIONS_VERSION, 0), rows.get(PUBLICATION_DELETES_VERSION, 0)
+
+_lock = threading.Lock()
+_current: Optional[PublicationSnapshot] = None
+
+def _is_current(snapshot: Optional[PublicationSnapshot], version: int, deletes_version: int) -> bool:
+    # Another thread may already have refreshed past the versions this one read
+    return (snapshot is not None and snapshot.version >= version and
+            snapshot.deletes_version >= deletes_version)
+
+def publication_snapshot() -> PublicationSnapshot:
+    """The snapshot for the current data version, refreshed on demand"""
+    global _current
+    # Versions are read before the rows, so changes committed in between are
+    # at worst applied again on the next refresh
+    version, deletes_version = _versions()
+    snapshot = _current
+    hit = _is_current(snapshot, version, deletes_version)
+    record_cache('publication_snapshot', hit)
+    if hit:
+        return snapshot
+
+    with _lock:
+        snapshot = _current
+        if _is_current(snapshot, version, deletes_version):
+            return snapshot
+        if snapshot is None or snapshot.deletes_version != deletes_version:
+            snapshot = build_snapshot(version, deletes_version)
+        else:
+            snapshot = apply_changes(snapshot, version)
+        _current = snapshot
+        return snapshot
+
+def reset_snapshot():
+    """Drop the cached snapshot; the next reader rebuilds it"""
+    global _current
+    with _lock:
+        _current = None
+
+if __name__ == '__main__':
+    with create_app().app_context():
+        init_schema()
+        snapshot = publication_snapshot()
+        print(f"{len(snapshot)} publications, {len(snapshot.journals)} journals, "
+              f"{snapshot.nbytes / 1e6:.1f} MB at data version {snapshot.version}")
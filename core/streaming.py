@@ -0,0 +1,86 @@
+"""
+Bounded-memory scans over the publication table.
+
+`iter_publication_rows` selects only the requested columns and fetches them
+`yield_per` rows at a time, so a scan holds one batch of plain tuples instead
+of every ORM object. `PublicationAggregator` folds such a stream into totals,
+per-year trends and a top-N by citations; only the top-N ids are kept, and
+`top_publications()` loads those few rows afterwards.
+"""
+
+import heapq
+import os
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import select
+
+from app import db, Publication
+
+STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 2000))
+
+# Publications without a year are counted under this one in trends
+DEFAULT_TREND_YEAR = 2023
+
+def iter_publication_rows(*columns, filters: Sequence = (), order_by: Sequence = (),
+                          batch_size: int = None) -> Iterator:
+    """Yield rows of the given columns (default id, year, citations) for matching publications"""
+    for partition in iter_publication_batches(*columns, filters=filters, order_by=order_by, batch_size=batch_size):
+        yield from partition
+
+def iter_publication_batches(*columns, filters: Sequence = (), order_by: Sequence = (),
+                             batch_size: int = None) -> Iterator[List]:
+    """Like iter_publication_rows, but yields lists of up to batch_size rows"""
+    columns = columns or (Publication.id, Publication.year, Publication.citations)
+    statement = select(*columns).where(*filters).order_by(*order_by)
+    # Plain columns need no ORM loading; run as Core on the session's connection
+    statement = statement.execution_options(yield_per=batch_size or STREAM_BATCH_SIZE)
+    yield from db.session.connection().execute(statement).partitions()
+
+class PublicationAggregator:
+    """Incremental totals, yearly trends and top-N over (id, year, citations) rows"""
+
+    def __init__(self, top_n: int = 5, default_year: int = DEFAULT_TREND_YEAR):
+        self.top_n = top_n
+        self.default_year = default_year
+        self.total_publications = 0
+        self.total_citations = 0
+        self.trends = {}
+        # Min-heap of (citations, -id): the root is the weakest of the current
+        # top N, and ties keep the lower id like a stable sort by citations
+        self._top = []
+
+    def add(self, publication_id: int, year: int, citations: int):
+        citations = citations or 0
+        self.total_publications += 1
+        self.total_citations += citations
+
+        entry = self.trends.setdefault(year or self.default_year, [0, 0])
+        entry[0] += 1
+        entry[1] += citations
+
+        if self.top_n:
+            item = (citations, -publication_id)
+            if len(self._top) < self.top_n:
+                heapq.heappush(self._top, item)
+            elif item > self._top[0]:
+                heapq.heapreplace(self._top, item)
+
+    def consume(self, rows: Iterable) -> 'PublicationAggregator':
+        for publication_id, year, citations in rows:
+            self.add(publication_id, year, citations)
+        return self
+
+    def publication_trends(self) -> List[Dict]:
+        return [{'year': year, 'count': count, 'citations': citations}
+                for year, (count, citations) in sorted(self.trends.items())]
+
+    def top_ids(self) -> List[int]:
+        return [-negated_id for _, negated_id in sorted(self._top, reverse=True)]
+
+    def top_publications(self) -> List[Publication]:
+        """The top-N Publication objects, most cited first"""
+        ids = self.top_ids()
+        if not ids:
+            return []
+        by_id = {pub.id: pub for pub in Publication.query.filter(Publication.id.in_(ids))}
+        return [by_id[i] for i in ids if i in by_id]
@@ -0,0 +1,27 @@
+"""
+Title normalization shared by works, publications and the scrapers.
+
+Kept free of app and database imports so the scrapers can use it too.
+Publication rows store both values (normalized_title, fingerprint) on insert,
+so lookups compare indexed columns instead of renormalizing titles.
+"""
+
+import hashlib
+import re
+from typing import Dict
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    normalized = re.sub(r'[^\w\s]', '', (title or '').lower())
+    return ' '.join(normalized.split())
+
+def fingerprint_normalized(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+def title_fingerprint(title: str) -> str:
+    return fingerprint_normalized(normalize_title(title))
+
+def title_columns(title: str) -> Dict[str, str]:
+    """The stored Publication columns derived from a title"""
+    normalized = normalize_title(title)
+    return {'normalized_title': normalized, 'fingerprint': fingerprint_normalized(normalized)}
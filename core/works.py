@@ -0,0 +1,123 @@
+"""
+Canonical works.
+
+A paper co-authored by several faculty members is stored once as a Work,
+keyed by DOI when known and otherwise by a fingerprint of its normalized
+title. Each author's Publication row is the authorship link: it points at
+the Work through work_id. Citation counts and metadata are updated on the
+Work and copied onto the Publication rows with one set-based UPDATE, so
+refresh writes scale with unique works.
+
+Storage does not: Publication rows keep their denormalized title, journal,
+year and citations, because the per-faculty scans (metrics, dashboards,
+snapshot, disambiguation) read them from that one table.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import insert, or_, select
+from app import db, Publication, Work
+from core.titles import normalize_title, title_fingerprint
+
+# Ids per IN (...) list
+LOOKUP_CHUNK_SIZE = 500
+# Rows per multi-row INSERT, well under SQLite's bound-parameter limit
+INSERT_CHUNK_SIZE = 100
+
+def normalize_doi(doi: str) -> Optional[str]:
+    doi = (doi or '').strip().lower()
+    for prefix in ('https://doi.org/', 'http://doi.org/', 'http://dx.doi.org/', 'doi:'):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi or None
+
+def _chunks(values: List, size: int = LOOKUP_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def upsert_works(publications: List[Dict]) -> List[int]:
+    """
+    Resolve scraped publication dicts to canonical works, creating missing
+    ones and updating changed metadata. Returns work ids aligned with the
+    input. Flushes but does not commit.
+
+    New works are written with multi-row INSERT ... RETURNING statements
+    rather than through the unit of work, which on SQLite inserts (and
+    fetches the id of) one row per statement.
+    """
+    fingerprints = [title_fingerprint(pub.get('title', '')) for pub in publications]
+    dois = [normalize_doi(pub.get('doi')) for pub in publications]
+
+    by_doi, by_fingerprint = {}, {}
+    for chunk in _chunks(sorted({doi for doi in dois if doi})):
+        for work in Work.query.filter(Work.doi.in_(chunk)):
+            by_doi[work.doi] = work
+    for chunk in _chunks(sorted(set(fingerprints))):
+        for work in Work.query.filter(Work.fingerprint.in_(chunk)).order_by(Work.id):
+            by_fingerprint.setdefault(work.fingerprint, work)
+
+    works, new_works = [], []
+    for pub, doi, fingerprint in zip(publications, dois, fingerprints):
+        work = by_doi.get(doi) if doi else None
+        if work is None:
+            candidate = by_fingerprint.get(fingerprint)
+            # A title match only counts if the DOIs do not contradict each other
+            if candidate is not None and not (doi and candidate.doi and candidate.doi != doi):
+                work = candidate
+
+        if work is None:
+            work = Work(
+                doi=doi,
+                fingerprint=fingerprint,
+                title=pub.get('title', ''),
+                authors=pub.get('authors', ''),
+                journal=pub.get('journal', ''),
+                year=pub.get('year', 0),
+                citations=pub.get('citations', 0) or 0
+            )
+            new_works.append(work)
+        else:
+            if doi and not work.doi and doi not in by_doi:
+                work.doi = doi
+            # Sources report different counts; keep the highest seen
+            citations = pub.get('citations', 0) or 0
+            if citations > (work.citations or 0):
+                work.citations = citations
+            for field in ('authors', 'journal', 'year'):
+                if pub.get(field) and not getattr(work, field):
+                    setattr(work, field, pub[field])
+
+        if work.doi:
+            by_doi[work.doi] = work
+        by_fingerprint.setdefault(fingerprint, work)
+        works.append(work)
+
+    db.session.flush()
+    _insert_works(new_works)
+    return [work.id for work in works]
+
+def _insert_works(new_works: List[Work]) -> None:
+    """Insert transient Work objects and set their ids"""
+    # Within one upsert a new work is unique by (fingerprint, doi): DOIs are
+    # unique, and a title without a DOI always reuses a work with that title
+    columns = ('doi', 'fingerprint', 'title', 'authors', 'journal', 'year', 'citations')
+    now = datetime.utcnow()
+    ids = {}
+    for chunk in _chunks(new_works, INSERT_CHUNK_SIZE):
+        rows = db.session.execute(
+            insert(Work).values([
+                dict({column: getattr(work, column) for column in columns}, last_updated=now) for work in chunk
+            ]).returning(Work.id, Work.fingerprint, Work.doi)
+        )
+        ids.update(((fingerprint, doi), work_id) for work_id, fingerprint, doi in rows)
+    for work in new_works:
+        work.id = ids[work.fingerprint, work.doi]
+
+def sync_publication_citations(work_ids: Iterable[int]) -> None:
+    """Copy canonical citation counts onto every Publication row of the works"""
+    citations = select(Work.citations).where(Work.id == Publication.work_id).scalar_subquery()
+    for chunk in _chunks(sorted(set(work_ids))):
+        Publication.query.filter(
+            Publication.work_id.in_(chunk),
+            or_(Publication.citations.is_(None), Publication.citations != citations)
+        ).update({'citations': citations}, synchronize_session=False)
@@ -1,12 +1,16 @@
 from app import db, Faculty, Publication
+from core.works import sync_publication_citations, upsert_works
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 def init_db():
     """Initialize the database and create tables"""
     try:
         # Create tables
         db.create_all()
-        print("Database tables created successfully")
+        logger.info("Database tables created successfully")
         
         # Add sample data (optional)
         sample_faculty = Faculty(
@@ -16,25 +20,28 @@ def init_db():
         )
         db.session.add(sample_faculty)
         db.session.commit()
-        print("Sample data added successfully")
+        logger.info("Sample data added successfully")
         
     except Exception as e:
-        print(f"Error initializing database: {e}")
+        logger.error("Error initializing database: %s", e)
         db.session.rollback()
 
 def update_publications(faculty_id, publications):
     """Update publications for a specific faculty member"""
     try:
-        faculty = Faculty.query.get(faculty_id)
+        faculty = db.session.get(Faculty, faculty_id)
         if not faculty:
-            print(f"Faculty member with id {faculty_id} not found")
+            logger.warning("Faculty member with id %s not found", faculty_id)
             return
             
         # Remove existing publications to avoid duplicates
         Publication.query.filter_by(faculty_id=faculty_id).delete()
         
+        # Resolve canonical works; co-authors share them and their citation counts
+        work_ids = upsert_works(publications)
+        
         # Add new publications
-        for pub in publications:
+        for pub, work_id in zip(publications, work_ids):
             new_pub = Publication(
                 title=pub.get('title', ''),
                 authors=pub.get('authors', ''),
@@ -42,22 +49,26 @@ def update_publications(faculty_id, publications):
                 year=pub.get('year', 0),
                 citations=pub.get('citations', 0),
                 doi=pub.get('doi', ''),
-                faculty_id=faculty_id
+                faculty_id=faculty_id,
+                work_id=work_id
             )
             db.session.add(new_pub)
+        db.session.flush()
+        sync_publication_citations(work_ids)
             
         faculty.last_updated = datetime.utcnow()
         db.session.commit()
-        print(f"Successfully updated {len(publications)} publications for {faculty.name}")
+        logger.info("Updated %d publications for %s", len(publications), faculty.name)
         
     except Exception as e:
-        print(f"Error updating publications: {e}")
+        logger.error("Error updating publications for faculty %s: %s", faculty_id, e)
         db.session.rollback()
+        raise
 
 def get_faculty_publications(faculty_id):
     """Get all publications for a specific faculty member"""
     try:
-        faculty = Faculty.query.get(faculty_id)
+        faculty = db.session.get(Faculty, faculty_id)
         if not faculty:
             return None
             
@@ -67,5 +78,5 @@ def get_faculty_publications(faculty_id):
             'publications': publications
         }
     except Exception as e:
-        print(f"Error getting publications: {e}")
+        logger.error("Error getting publications for faculty %s: %s", faculty_id, e)
         return None
@@ -60,21 +60,15 @@ def test_name_matching():
                 print(f"   - Looking for: '{faculty_name}'")
                 print(f"   - In authors: '{authors}'")
                 
-                # Test the improved matching logic
-                faculty_parts = faculty_name.lower().split()
-                authors_list = [a.strip() for a in authors.split(',')]
-                
+                # Resolve each author through the shared name-variant index
                 name_match = False
                 matched_author = None
                 
-                for author in authors_list:
-                    author_lower = author.lower()
-                    if all(part in author_lower for part in faculty_parts):
-                        author_parts = author_lower.split()
-                        if any(faculty_part in author_parts for faculty_part in faculty_parts):
-                            name_match = True
-                            matched_author = author
-                            break
+                for author in (a.strip() for a in authors.split(',')):
+                    if scraper.name_index.matches(faculty_name, [author]):
+                        name_match = True
+                        matched_author = author
+                        break
                 
                 if name_match:
                     print(f"   ✅ MATCH: Found in author '{matched_author}'")
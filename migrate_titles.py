@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script
+Adds Publication.normalized_title and Publication.fingerprint with their index,
+and backfills them in batches of primary-key ranges, one commit per batch.
+Safe to re-run and to interrupt: only publications without a fingerprint are
+processed.
+"""
+
+from sqlalchemy import update
+from app import app, db, init_schema, Publication
+from core.titles import title_columns
+
+BATCH_SIZE = 5000
+
+def migrate_titles():
+    """Create the new columns and backfill them for existing publications"""
+    print("Starting title fingerprint migration...")
+
+    with app.app_context():
+        init_schema()
+
+        migrated = 0
+        last_id = 0
+        while True:
+            batch = db.session.query(Publication.id, Publication.title).filter(
+                Publication.fingerprint.is_(None),
+                Publication.id > last_id
+            ).order_by(Publication.id).limit(BATCH_SIZE).all()
+            if not batch:
+                break
+
+            # Bulk UPDATE by primary key: one executemany per batch
+            db.session.execute(update(Publication), [
+                dict(title_columns(title), id=publication_id) for publication_id, title in batch
+            ])
+            db.session.commit()
+
+            migrated += len(batch)
+            last_id = batch[-1].id
+            print(f"Fingerprinted {migrated} publications...")
+
+        print(f"Title fingerprint migration completed: {migrated} publications updated")
+
+if __name__ == "__main__":
+    migrate_titles()
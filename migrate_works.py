@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script
+Adds canonical works (Work, Publication.work_id) and links the existing
+publications to them in batches. Safe to re-run: only publications without a
+work are processed. Drops the faculty_work link table of earlier versions,
+which duplicated the (faculty_id, work_id) pairs of Publication rows.
+"""
+
+from sqlalchemy import text
+from app import app, db, init_schema, Publication, Work
+from core.works import sync_publication_citations, upsert_works
+
+BATCH_SIZE = 1000
+
+def migrate_works():
+    """Create the new schema and backfill works for existing publications"""
+    print("Starting works migration...")
+
+    with app.app_context():
+        init_schema()
+        with db.engine.begin() as conn:
+            conn.execute(text('DROP TABLE IF EXISTS faculty_work'))
+
+        migrated = 0
+        last_id = 0
+        while True:
+            batch = Publication.query.filter(
+                Publication.work_id.is_(None),
+                Publication.id > last_id
+            ).order_by(Publication.id).limit(BATCH_SIZE).all()
+            if not batch:
+                break
+
+            work_ids = upsert_works([{
+                'title': pub.title,
+                'authors': pub.authors,
+                'journal': pub.journal,
+                'year': pub.year,
+                'citations': pub.citations,
+                'doi': pub.doi
+            } for pub in batch])
+
+            for pub, work_id in zip(batch, work_ids):
+                pub.work_id = work_id
+            db.session.flush()
+            sync_publication_citations(work_ids)
+            db.session.commit()
+
+            migrated += len(batch)
+            last_id = batch[-1].id
+            print(f"Linked {migrated} publications to works...")
+
+        print(f"Works migration completed: {Publication.query.count()} publications, "
+              f"{Work.query.count()} unique works")
+
+if __name__ == "__main__":
+    migrate_works()
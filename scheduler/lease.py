@@ -0,0 +1,108 @@
+import os
+import socket
+import threading
+import uuid
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from flask import Flask, current_app
+from sqlalchemy import case, or_
+from sqlalchemy.exc import IntegrityError
+from app import db, SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+class Lease:
+    """
+    Database-backed lease that elects a single holder across processes and hosts.
+
+    The holder must renew the lease (heartbeat) before `ttl` seconds pass,
+    otherwise any other contender may take it over. All methods expect to
+    run inside an application context; `keep_alive` heartbeats from a thread
+    in that same application.
+    """
+
+    def __init__(self, name: str, ttl: int = 90, holder: str = None):
+        self.name = name
+        self.ttl = ttl
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.held = False
+
+    def acquire(self) -> bool:
+        """Take the lease if it is free or expired, or renew it if already held"""
+        now = datetime.utcnow()
+        values = {
+            'holder': self.holder,
+            'heartbeat_at': now,
+            'expires_at': now + timedelta(seconds=self.ttl)
+        }
+
+        updated = SchedulerLease.query.filter(
+            SchedulerLease.name == self.name,
+            or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now)
+        ).update(dict(values, acquired_at=case(
+            (SchedulerLease.holder == self.holder, SchedulerLease.acquired_at),
+            else_=now
+        )), synchronize_session=False)
+
+        if not updated:
+            if db.session.get(SchedulerLease, self.name) is not None:
+                db.session.rollback()
+                self.held = False
+                return False
+            try:
+                db.session.add(SchedulerLease(name=self.name, acquired_at=now, **values))
+                db.session.commit()
+            except IntegrityError:
+                # Another contender created the row first
+                db.session.rollback()
+                self.held = False
+                return False
+        else:
+            db.session.commit()
+
+        self.held = True
+        return True
+
+    def heartbeat(self) -> bool:
+        """Extend a lease we already hold; False means leadership was lost"""
+        now = datetime.utcnow()
+        updated = SchedulerLease.query.filter_by(name=self.name, holder=self.holder).update({
+            'heartbeat_at': now,
+            'expires_at': now + timedelta(seconds=self.ttl)
+        }, synchronize_session=False)
+        db.session.commit()
+        self.held = bool(updated)
+        return self.held
+
+    def release(self):
+        """Expire the lease immediately so another process can take over"""
+        SchedulerLease.query.filter_by(name=self.name, holder=self.holder).update({
+            'expires_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        self.held = False
+
+    @contextmanager
+    def keep_alive(self, interval: float = None, app: Flask = None):
+        """Heartbeat from a background thread in `app` (default: the current app) while the block runs"""
+        interval = interval or self.ttl / 3
+        app = app or current_app._get_current_object()
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(interval):
+                try:
+                    with app.app_context():
+                        if not self.heartbeat():
+                            logger.warning(f"Lease '{self.name}' lost by {self.holder}")
+                except Exception as e:
+                    logger.error(f"Lease heartbeat failed: {str(e)}")
+
+        thread = threading.Thread(target=beat, name=f"lease-{self.name}", daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            stop.set()
+            thread.join()
@@ -1,53 +1,83 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from datetime import datetime, timedelta
+"""
+Dedicated scheduler entrypoint.
+
+Run exactly this process (python -m scheduler.scheduler) next to the web
+workers; it is no longer started as a side effect of importing the module.
+Several copies may run across hosts for redundancy: a database lease elects
+one leader and only the leader's jobs do any work.
+"""
+
 import logging
-from app import app, db
-from scraper.publication_scraper import PublicationScraper
+import os
+import signal
+import threading
+from flask import Flask
+from app import create_app, init_schema
+from core.logs import configure_logging
+from scheduler.lease import Lease
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-scheduler = BackgroundScheduler()
-scraper = PublicationScraper()
+LEASE_NAME = 'faculty-refresh-scheduler'
+LEASE_TTL = int(os.environ.get('SCHEDULER_LEASE_TTL', 90))
+HEARTBEAT_INTERVAL = LEASE_TTL / 3
 
-def update_faculty_publications():
+# Created by initialize_scheduler; APScheduler is only imported by the process that runs it
+scheduler = None
+lease = Lease(LEASE_NAME, ttl=LEASE_TTL)
+is_leader = False
+# Set on shutdown; running jobs stop at the next faculty member or retry wait
+shutdown_requested = threading.Event()
+
+def update_faculty_publications(app: Flask):
     """Update publications for all faculty members"""
+    if not is_leader:
+        logger.info("Skipping faculty update: this process is not the scheduler leader")
+        return
+
     try:
+        from automation.update_publications import update_all_faculty
+
         with app.app_context():
-            # Get all faculty members
-            faculty_members = Faculty.query.all()
-            
-            for faculty in faculty_members:
-                logger.info(f"Updating publications for {faculty.name} ({faculty.department})")
-                
-                # Scrape publications
-                publications = scraper.search_publications(faculty.name)
-                
-                # Disambiguate and store publications
-                disambiguated_pubs = scraper.disambiguate_publications(publications, faculty)
-                
-                # Update faculty last_updated timestamp
-                faculty.last_updated = datetime.utcnow()
-                db.session.commit()
-                
-                logger.info(f"Updated {len(disambiguated_pubs)} publications for {faculty.name}")
-                
+            update_all_faculty(should_continue=lambda: is_leader, stop=shutdown_requested)
     except Exception as e:
         logger.error(f"Error updating faculty publications: {str(e)}")
-        db.session.rollback()
 
-def initialize_scheduler():
-    """Initialize the scheduler with jobs"""
+def disambiguate_publications(app: Flask):
+    """Re-run the offline authorship disambiguation over all publications"""
+    if not is_leader:
+        logger.info("Skipping disambiguation: this process is not the scheduler leader")
+        return
+
+    try:
+        from core.disambiguation import run_disambiguation
+
+        with app.app_context():
+            stats = run_disambiguation()
+        logger.info(f"Disambiguation finished: {stats}")
+    except Exception as e:
+        logger.error(f"Error disambiguating publications: {str(e)}")
+
+def initialize_scheduler(app: Flask):
+    """Initialize the scheduler with jobs that run in `app`"""
+    global scheduler
+
     try:
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        scheduler = BackgroundScheduler()
+
         # Add job to run every day at midnight
         scheduler.add_job(
             update_faculty_publications,
             'cron',
             hour=0,
             minute=0,
-            id='update_faculty_data'
+            id='update_faculty_data',
+            args=[app]
         )
-        
+
         # Add job to run every 6 hours during working hours
         for hour in range(9, 18, 6):  # 9 AM, 3 PM
             scheduler.add_job(
@@ -55,14 +85,71 @@ def initialize_scheduler():
                 'cron',
                 hour=hour,
                 minute=0,
-                id=f'update_faculty_data_{hour}'
+                id=f'update_faculty_data_{hour}',
+                args=[app]
             )
-        
+
+        # Disambiguate authorship once a week, Sunday night
+        scheduler.add_job(
+            disambiguate_publications,
+            'cron',
+            day_of_week='sun',
+            hour=3,
+            minute=0,
+            id='disambiguate_publications',
+            args=[app]
+        )
+
         scheduler.start()
         logger.info("Scheduler initialized successfully")
-        
+
     except Exception as e:
         logger.error(f"Error initializing scheduler: {str(e)}")
 
-# Initialize scheduler when module is imported
-initialize_scheduler()
+def heartbeat(app: Flask):
+    """Acquire or renew the lease and track whether this process is the leader"""
+    global is_leader
+
+    try:
+        with app.app_context():
+            held = lease.acquire()
+    except Exception as e:
+        logger.error(f"Error renewing scheduler lease: {str(e)}")
+        held = False
+
+    if held and not is_leader:
+        logger.info(f"Elected scheduler leader ({lease.holder})")
+    elif is_leader and not held:
+        logger.warning(f"Lost scheduler leadership ({lease.holder})")
+    is_leader = held
+
+def main():
+    app = create_app()
+    with app.app_context():
+        init_schema()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown_requested.set())
+    initialize_scheduler(app)
+    try:
+        heartbeat(app)
+        while not shutdown_requested.wait(HEARTBEAT_INTERVAL):
+            heartbeat(app)
+        logger.info("Shutting down scheduler")
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Shutting down scheduler")
+    finally:
+        shutdown_requested.set()
+        if scheduler is not None and scheduler.running:
+            # Running jobs stop after their current faculty member; keep the
+            # lease alive until they have checkpointed and returned
+            if is_leader:
+                with app.app_context(), lease.keep_alive(app=app):
+                    scheduler.shutdown(wait=True)
+            else:
+                scheduler.shutdown(wait=True)
+        if is_leader:
+            with app.app_context():
+                lease.release()
+
+if __name__ == '__main__':
+    main()
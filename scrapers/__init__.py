@@ -3,6 +3,11 @@
 Publication scraping utilities for Faculty Research Analytics System
 """
 
-from .publication_scraper import PublicationScraper
-
 __all__ = ['PublicationScraper']
+
+def __getattr__(name):
+    # Importing scrapers.name_index should not pull in the HTTP scraper
+    if name == 'PublicationScraper':
+        from .publication_scraper import PublicationScraper
+        return PublicationScraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,210 @@
+"""
+Local index of CrossRef bulk metadata snapshots.
+
+CrossRef publishes its metadata as gzipped JSON Lines dumps. The importer
+streams them in a single pass into a compact SQLite file: works keyed by
+DOI (only the fields the scraper parses) and a sorted (author key, DOI)
+table, so a faculty member's works are one indexed range scan. The scraper
+answers from this index first and only asks the live API for works indexed
+after the snapshot.
+
+    python -m scrapers.crossref_snapshot dumps/*.jsonl.gz [--index PATH]
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sqlite3
+import unicodedata
+from contextlib import closing
+from typing import Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_INDEX_PATH = os.environ.get('CROSSREF_INDEX_PATH', os.path.join('instance', 'crossref_index.db'))
+
+# Work fields kept from the snapshot; everything else is dropped
+KEPT_FIELDS = ('DOI', 'title', 'container-title', 'published-print', 'published-online',
+               'is-referenced-by-count')
+
+# Records written per transaction while importing
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS works (
+    doi TEXT PRIMARY KEY,
+    indexed TEXT,
+    item TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS work_authors (
+    author_key TEXT NOT NULL,
+    doi TEXT NOT NULL,
+    PRIMARY KEY (author_key, doi)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def strip_accents(text: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+def author_key(given: str, family: str) -> Optional[str]:
+    """'family initial' key, e.g. ('José', 'García') -> 'garcia j'"""
+    family = ' '.join(strip_accents(family or '').lower().replace('.', ' ').split())
+    given = strip_accents(given or '').lower().strip()
+    if not family:
+        return None
+    return f"{family} {given[0]}" if given else family
+
+def name_key(full_name: str) -> Optional[str]:
+    """Key for a free-form 'Given Family' name"""
+    parts = full_name.replace(',', ' ').split()
+    if not parts:
+        return None
+    return author_key(parts[0] if len(parts) > 1 else '', parts[-1])
+
+def iter_snapshot_items(paths: Iterable[str]) -> Iterator[Dict]:
+    """
+    Yield work items from snapshot files, one line at a time.
+
+    Lines may hold a single work or a page of works ({"items": [...]});
+    files ending in .gz are decompressed on the fly.
+    """
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if 'DOI' not in record and isinstance(record.get('items'), list):
+                    yield from record['items']
+                else:
+                    yield record
+
+def compact_item(item: Dict) -> Dict:
+    """The subset of a CrossRef work that the scraper reads"""
+    compact = {field: item[field] for field in KEPT_FIELDS if field in item}
+    compact['author'] = [
+        {key: author[key] for key in ('given', 'family') if author.get(key)}
+        for author in item.get('author', [])
+    ]
+    return compact
+
+class CrossRefIndex:
+    """Read/write access to an on-disk snapshot index"""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+
+    @classmethod
+    def open_default(cls) -> Optional['CrossRefIndex']:
+        """The index at CROSSREF_INDEX_PATH, or None if nothing was imported"""
+        return cls() if os.path.exists(DEFAULT_INDEX_PATH) else None
+
+    def _connect(self, readonly: bool = True) -> sqlite3.Connection:
+        if readonly:
+            return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return sqlite3.connect(self.path)
+
+    def import_snapshot(self, paths: Iterable[str]) -> Dict[str, int]:
+        """
+        Stream snapshot files into the index in one pass.
+
+        Works already present are replaced, so importing a newer snapshot
+        over an older one updates citation counts. Returns import counts.
+        """
+        works = authors = skipped = 0
+        latest = None
+
+        with closing(self._connect(readonly=False)) as conn:
+            conn.executescript(SCHEMA)
+            conn.execute('PRAGMA synchronous = OFF')
+            work_rows, author_rows = [], []
+
+            def flush():
+                conn.executemany('INSERT OR REPLACE INTO works (doi, indexed, item) VALUES (?, ?, ?)', work_rows)
+                conn.executemany('INSERT OR IGNORE INTO work_authors (author_key, doi) VALUES (?, ?)', author_rows)
+                conn.commit()
+                work_rows.clear()
+                author_rows.clear()
+
+            for item in iter_snapshot_items(paths):
+                doi = (item.get('DOI') or '').lower()
+                if not doi or not item.get('author'):
+                    skipped += 1
+                    continue
+
+                indexed = (item.get('indexed') or {}).get('date-time', '')[:10] or None
+                if indexed and (latest is None or indexed > latest):
+                    latest = indexed
+
+                work_rows.append((doi, indexed, json.dumps(compact_item(item), separators=(',', ':'))))
+                for key in {author_key(a.get('given'), a.get('family')) for a in item['author']}:
+                    if key:
+                        author_rows.append((key, doi))
+                        authors += 1
+                works += 1
+
+                if len(work_rows) >= BATCH_SIZE:
+                    flush()
+            flush()
+
+            if latest:
+                current = self._get_meta(conn, 'snapshot_date')
+                if current is None or latest > current:
+                    conn.execute('INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)', ('snapshot_date', latest))
+                    conn.commit()
+
+        return {'works': works, 'author_links': authors, 'skipped': skipped}
+
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, name: str) -> Optional[str]:
+        row = conn.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def snapshot_date(self) -> Optional[str]:
+        """Most recent CrossRef index date (YYYY-MM-DD) covered by the snapshot"""
+        with closing(self._connect()) as conn:
+            return self._get_meta(conn, 'snapshot_date')
+
+    def iter_works_for_author(self, faculty_name: str, page_size: int = 20) -> Iterator[List[Dict]]:
+        """Yield pages of CrossRef-shaped work items attributed to the name's author key"""
+        key = name_key(faculty_name)
+        if not key:
+            return
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'SELECT w.item FROM work_authors a JOIN works w ON w.doi = a.doi '
+                'WHERE a.author_key = ? ORDER BY a.doi', (key,)
+            )
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    return
+                yield [json.loads(item) for item, in rows]
+
+    def get_work(self, doi: str) -> Optional[Dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT item FROM works WHERE doi = ?', ((doi or '').lower(),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+def main():
+    parser = argparse.ArgumentParser(description='Import CrossRef JSONL(.gz) snapshot files into the local index')
+    parser.add_argument('paths', nargs='+', help='snapshot files or glob patterns')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='index file to create or update')
+    args = parser.parse_args()
+
+    paths = sorted(path for pattern in args.paths for path in (glob.glob(pattern) or [pattern]))
+    counts = CrossRefIndex(args.index).import_snapshot(paths)
+    print(f"Imported {counts['works']} works ({counts['author_links']} author links, "
+          f"{counts['skipped']} skipped) from {len(paths)} files into {args.index}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Persistent author-name variant index.
+
+Every registered faculty name is expanded once into the spellings it may
+appear under in author lists (initials, family-first order, diacritics and
+punctuation stripped) and stored in a sorted SQLite table shared by all
+processes. Attribution checks then normalize an author mention and resolve
+it with one or two indexed lookups instead of re-tokenizing both names for
+every record.
+
+    python -m scrapers.name_index    # register every stored faculty name
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set
+
+DEFAULT_INDEX_PATH = os.environ.get('AUTHOR_INDEX_PATH', os.path.join('instance', 'author_names.db'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS name_variants (
+    variant TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    PRIMARY KEY (variant, name_key)
+) WITHOUT ROWID;
+"""
+
+@lru_cache(maxsize=65536)
+def name_tokens(name: str) -> tuple:
+    """
+    Lowercase ASCII tokens of a name in given-first order.
+
+    'García, José M.' -> ('jose', 'm', 'garcia'); an ellipsis marks a
+    truncated author list and is dropped.
+    """
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower().replace('…', ' ')
+    if name.count(',') == 1:
+        family, given = name.split(',')
+        name = f"{given} {family}"
+    return tuple(re.sub(r'[^\w\s]', ' ', name).split())
+
+def name_key(name: str) -> Optional[str]:
+    """Canonical key of a full name"""
+    tokens = name_tokens(name)
+    return ' '.join(tokens) if tokens else None
+
+def mention_keys(mention: str) -> List[str]:
+    """Lookup keys for an author mention: as written, and without middle names"""
+    tokens = name_tokens(mention)
+    if not tokens:
+        return []
+    keys = [' '.join(tokens)]
+    if len(tokens) > 2:
+        keys.append(f"{tokens[0]} {tokens[-1]}")
+    return keys
+
+def block_key(name: str) -> str:
+    """Coarse key shared by namesakes: 'anand kumar khandare' -> 'a khandare'"""
+    tokens = name_tokens(name)
+    if not tokens:
+        return ''
+    return f"{tokens[0][0]} {tokens[-1]}" if len(tokens) > 1 else tokens[0]
+
+def name_variants(name: str) -> Set[str]:
+    """Spellings of a full name expected in author lists"""
+    tokens = name_tokens(name)
+    if not tokens:
+        return set()
+    if len(tokens) == 1:
+        return {tokens[0]}
+
+    given, family = tokens[:-1], tokens[-1]
+    initials = [token[0] for token in given]
+    forms = {
+        ' '.join(given),            # prachi s
+        given[0],                   # prachi
+        ' '.join(initials),         # p s
+        ''.join(initials),          # ps
+        initials[0],                # p
+    }
+    variants = set()
+    for form in forms:
+        variants.add(f"{form} {family}")
+        variants.add(f"{family} {form}")
+    return variants
+
+class AuthorNameIndex:
+    """Name variants stored in SQLite, one connection per thread"""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._registered = set()
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def register(self, names: Iterable[str]) -> int:
+        """Store the variants of the given full names; returns rows written"""
+        rows = []
+        for name in names:
+            key = name_key(name)
+            if key and key not in self._registered:
+                rows.extend((variant, key) for variant in name_variants(name))
+        if not rows:
+            return 0
+
+        conn = self._connection()
+        with conn:
+            written = conn.executemany(
+                'INSERT OR IGNORE INTO name_variants (variant, name_key) VALUES (?, ?)', rows
+            ).rowcount
+        with self._lock:
+            self._registered.update(key for _, key in rows)
+        return written
+
+    def resolve(self, mention: str) -> Set[str]:
+        """Keys of registered names the mention may refer to"""
+        keys = mention_keys(mention)
+        if not keys:
+            return set()
+        placeholders = ', '.join('?' * len(keys))
+        rows = self._connection().execute(
+            f'SELECT name_key FROM name_variants WHERE variant IN ({placeholders})', keys
+        ).fetchall()
+        return {key for key, in rows}
+
+    def matches(self, faculty_name: str, mentions: Iterable[str]) -> bool:
+        """Whether any author mention resolves to `faculty_name`"""
+        key = name_key(faculty_name)
+        if not key:
+            return False
+        if key not in self._registered:
+            self.register([faculty_name])
+        return any(key in self.resolve(mention) for mention in mentions)
+
+_default_index = None
+_default_lock = threading.Lock()
+
+def default_index() -> AuthorNameIndex:
+    """Process-wide index at AUTHOR_INDEX_PATH"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = AuthorNameIndex()
+    return _default_index
+
+if __name__ == '__main__':
+    from app import create_app, Faculty
+
+    with create_app().app_context():
+        names = [name for name, in Faculty.query.with_entities(Faculty.name)]
+    written = default_index().register(names)
+    print(f"Registered {len(names)} faculty names ({written} new variants) in {DEFAULT_INDEX_PATH}")
@@ -1,40 +1,162 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
+import os
 import re
 import time
 from typing import List, Dict
 import urllib.parse
 import json
+from collections import Counter
+from itertools import chain
+from core.pipeline import prefetch
+from core.profiling import record_scrape
+from core.telemetry import SCRAPE_LATENCY, SCRAPE_REQUESTS, SCRAPE_RESULTS
+from core.titles import normalize_title
+from scrapers.name_index import default_index
+
+logger = logging.getLogger(__name__)
+
+# Source pages fetched ahead of the consumer while streaming
+PREFETCH_PAGES = 2
+
+# Upstream endpoints; point them at a local stub for load tests
+SCHOLAR_URL = os.environ.get('SCHOLAR_URL', 'https://scholar.google.com/scholar')
+CROSSREF_API_URL = os.environ.get('CROSSREF_API_URL', 'https://api.crossref.org/works')
+
+class TitleDeduplicator:
+    """
+    Incremental near-duplicate filter for publication titles.
+
+    A title is a duplicate when the word-set Jaccard similarity with an
+    already accepted title exceeds `threshold`. Exact repeats of a
+    normalized title (the same normalization as Publication.normalized_title)
+    are rejected by a set lookup; otherwise an inverted index from word to
+    accepted titles restricts comparisons to titles sharing a word.
+    """
+
+    def __init__(self, threshold=0.8):
+        self.threshold = threshold
+        self._titles = []      # word sets of accepted titles
+        self._index = {}       # word -> positions in _titles
+        self._normalized = set()
+
+    def __len__(self):
+        return len(self._titles)
+
+    normalize = staticmethod(normalize_title)
+
+    def add(self, title):
+        """Record `title` and return True unless it is empty or a near-duplicate"""
+        if not (title or '').strip():
+            return False
+        normalized = self.normalize(title)
+        if not normalized:
+            # Nothing to compare on (punctuation only); keep it
+            return True
+        if normalized in self._normalized:
+            return False
+        words = set(normalized.split())
+        
+        shared = Counter()
+        for word in words:
+            shared.update(self._index.get(word, ()))
+        for position, overlap in shared.items():
+            union = len(words) + len(self._titles[position]) - overlap
+            if overlap / union > self.threshold:
+                return False
+        
+        position = len(self._titles)
+        self._titles.append(words)
+        self._normalized.add(normalized)
+        for word in words:
+            self._index.setdefault(word, []).append(position)
+        return True
 
 class PublicationScraper:
-    def __init__(self):
+    def __init__(self, scholar_pages=1, crossref_pages=1, crossref_index=None, name_index=None,
+                 scholar_url=None, crossref_url=None):
+        # requests and BeautifulSoup are imported on first use to keep
+        # worker and CLI startup free of them
+        import requests
+
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        self.scholar_url = scholar_url or SCHOLAR_URL
+        self.crossref_url = crossref_url or CROSSREF_API_URL
+        # Number of result pages fetched per source
+        self.scholar_pages = scholar_pages
+        self.crossref_pages = crossref_pages
+        # Local CrossRef snapshot answered before the live API, if one was imported
+        if crossref_index is None:
+            from scrapers.crossref_snapshot import CrossRefIndex
+            crossref_index = CrossRefIndex.open_default()
+        self.crossref_index = crossref_index
+        # Shared author-name variant index used for attribution
+        self.name_index = name_index or default_index()
 
-    def scrape_publications(self, faculty_name, department, college=""):
-        """Scrape real publications from multiple sources"""
-        print(f"Scraping real publications for {faculty_name} from {department}, {college}")
-        
-        all_publications = []
-        
-        # Try Google Scholar first
-        gs_publications = self.search_google_scholar(faculty_name, department, college)
-        all_publications.extend(gs_publications)
+    def scrape_publications(self, faculty_name, department, college="", progress=None):
+        """
+        Scrape real publications from multiple sources.
+
+        Collects stream_publications() into a list; `progress` receives the
+        same events.
+        """
+        unique_publications = list(self.stream_publications(faculty_name, department, college, progress=progress))
         
-        # Try CrossRef API for additional publications
-        crossref_publications = self.search_crossref(faculty_name)
-        all_publications.extend(crossref_publications)
+        logger.info("Found %d publications for %s", len(unique_publications), faculty_name)
+        return unique_publications
+
+    def stream_publications(self, faculty_name, department, college="", progress=None,
+                            prefetch_pages=PREFETCH_PAGES):
+        """
+        Yield unique publications as source pages arrive.
+
+        Google Scholar pages are followed by CrossRef pages. Pages are fetched
+        in a background thread at most `prefetch_pages` ahead of the consumer
+        (0 fetches inline), and titles are deduplicated incrementally, so
+        memory stays bounded by one page plus the seen-title index.
+        `progress`, if given, is called as progress(event, data) in the
+        consuming thread after every source page ('scholar_page',
+        'crossref_page') and once the stream is exhausted ('deduplicated').
+        """
+        pages = chain(
+            self.iter_scholar_pages(faculty_name, department, college),
+            self.iter_crossref_pages(faculty_name)
+        )
+        if prefetch_pages:
+            pages = prefetch(pages, maxsize=prefetch_pages)
         
-        # Remove duplicates
-        unique_publications = self.resolve_ambiguity(all_publications)
+        deduplicator = TitleDeduplicator()
+        seen = 0
+        for source, page, page_publications in pages:
+            if progress:
+                progress(f'{source}_page', {'page': page, 'publications': page_publications})
+            
+            for pub in page_publications:
+                seen += 1
+                if deduplicator.add(pub.get('title', '')):
+                    yield pub
         
-        print(f"Found {len(unique_publications)} real publications for {faculty_name}")
-        return unique_publications
+        logger.debug("Deduplicated %d publications to %d", seen, len(deduplicator))
+        if progress:
+            progress('deduplicated', {'before': seen, 'after': len(deduplicator)})
 
-    def search_google_scholar(self, faculty_name, department, college=""):
+    def search_google_scholar(self, faculty_name, department, college="", progress=None):
         """Search Google Scholar for real publications"""
+        publications = []
+        for _, page, page_publications in self.iter_scholar_pages(faculty_name, department, college):
+            publications.extend(page_publications)
+            if progress:
+                progress('scholar_page', {'page': page, 'publications': page_publications})
+        
+        logger.info("Found %d publications from Google Scholar", len(publications))
+        return publications
+
+    def iter_scholar_pages(self, faculty_name, department, college=""):
+        """Yield ('scholar', page, publications) for each Google Scholar result page"""
+        from bs4 import BeautifulSoup
+
         try:
             # Construct search query
             query_parts = [faculty_name]
@@ -46,168 +168,243 @@ class PublicationScraper:
             query = " ".join(query_parts)
             encoded_query = urllib.parse.quote(query)
             
-            # Google Scholar search URL
-            url = f"https://scholar.google.com/scholar?q={encoded_query}&hl=en"
-            
-            print(f"Searching Google Scholar: {url}")
-            
-            response = self.session.get(url)
-            if response.status_code != 200:
-                print(f"Failed to fetch Google Scholar results: {response.status_code}")
-                return []
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            publications = []
-            
-            # Parse Google Scholar results
-            results = soup.find_all('div', class_='gs_ri')
+            for page in range(1, self.scholar_pages + 1):
+                # Google Scholar search URL (10 results per page)
+                url = f"{self.scholar_url}?q={encoded_query}&hl=en"
+                if page > 1:
+                    url += f"&start={(page - 1) * 10}"
+                
+                response = self._fetch('scholar', url)
+                if response.status_code != 200:
+                    logger.warning("Google Scholar returned HTTP %s for page %d", response.status_code, page)
+                    return
+                
+                soup = BeautifulSoup(response.content, 'html.parser')
+                results = soup.find_all('div', class_='gs_ri')
+                yield 'scholar', page, self._parse_scholar_results(results[:10], faculty_name)  # Limit to top 10 results
+                
+                if len(results) < 10:
+                    return
             
-            for result in results[:10]:  # Limit to top 10 results
-                try:
-                    # Extract title
-                    title_elem = result.find('h3', class_='gs_rt')
-                    if not title_elem:
-                        continue
-                    
-                    title_link = title_elem.find('a')
-                    title = title_link.text if title_link else title_elem.text
-                    title = re.sub(r'\[.*?\]', '', title).strip()  # Remove [PDF] etc.
-                    
-                    # Extract authors and publication info
-                    authors_elem = result.find('div', class_='gs_a')
-                    authors_text = authors_elem.text if authors_elem else ""
-                    
-                    # Parse authors and year
-                    authors = ""
-                    year = None
-                    if authors_text:
-                        # Extract year (usually at the end)
-                        year_match = re.search(r'\b(19|20)\d{2}\b', authors_text)
-                        if year_match:
-                            year = int(year_match.group())
-                        
-                        # Extract authors (before the year and venue)
-                        authors_part = re.split(r'\s*-\s*', authors_text)[0]
-                        authors = authors_part.strip()
-                    
-                    # Extract citation count
-                    citations = 0
-                    citation_elem = result.find('a', string=re.compile(r'Cited by \d+'))
-                    if citation_elem:
-                        citation_match = re.search(r'Cited by (\d+)', citation_elem.text)
-                        if citation_match:
-                            citations = int(citation_match.group(1))
-                    
-                    # Extract journal/venue
-                    journal = ""
-                    if authors_text and '-' in authors_text:
-                        parts = authors_text.split('-')
-                        if len(parts) > 1:
-                            journal = parts[1].strip()
-                            # Remove year from journal name
-                            journal = re.sub(r'\b(19|20)\d{2}\b', '', journal).strip()
+        except Exception as e:
+            logger.warning("Error searching Google Scholar: %s", e)
+
+    def _fetch(self, source, url, **kwargs):
+        """GET an upstream page, recording its latency and status under `source`"""
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, **kwargs)
+        except Exception:
+            SCRAPE_REQUESTS.labels(source, 'error').inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            SCRAPE_LATENCY.labels(source).observe(elapsed)
+            record_scrape(elapsed)
+        SCRAPE_REQUESTS.labels(source, response.status_code).inc()
+        logger.debug("GET %s -> %s in %.0f ms", url, response.status_code, elapsed * 1000)
+        return response
+
+    def _parse_scholar_results(self, results, faculty_name):
+        """Parse one page of Google Scholar result blocks"""
+        publications = []
+        
+        for result in results:
+            try:
+                # Extract title
+                title_elem = result.find('h3', class_='gs_rt')
+                if not title_elem:
+                    continue
+                
+                title_link = title_elem.find('a')
+                title = title_link.text if title_link else title_elem.text
+                title = re.sub(r'\[.*?\]', '', title).strip()  # Remove [PDF] etc.
+                
+                # Extract authors and publication info
+                authors_elem = result.find('div', class_='gs_a')
+                authors_text = authors_elem.text if authors_elem else ""
+                
+                # Parse authors and year
+                authors = ""
+                year = None
+                if authors_text:
+                    # Extract year (usually at the end)
+                    year_match = re.search(r'\b(19|20)\d{2}\b', authors_text)
+                    if year_match:
+                        year = int(year_match.group())
                     
-                    # Only include if faculty name appears in authors
-                    if faculty_name.lower() in authors.lower():
-                        publications.append({
-                            'title': title,
-                            'authors': authors,
-                            'journal': journal,
-                            'year': year or 0,
-                            'citations': citations,
-                            'doi': '',
-                            'source': 'Google Scholar'
-                        })
+                    # Extract authors (before the year and venue)
+                    authors_part = re.split(r'\s*-\s*', authors_text)[0]
+                    authors = authors_part.strip()
+                
+                # Extract citation count
+                citations = 0
+                citation_elem = result.find('a', string=re.compile(r'Cited by \d+'))
+                if citation_elem:
+                    citation_match = re.search(r'Cited by (\d+)', citation_elem.text)
+                    if citation_match:
+                        citations = int(citation_match.group(1))
+                
+                # Extract journal/venue
+                journal = ""
+                if authors_text and '-' in authors_text:
+                    parts = authors_text.split('-')
+                    if len(parts) > 1:
+                        journal = parts[1].strip()
+                        # Remove year from journal name
+                        journal = re.sub(r'\b(19|20)\d{2}\b', '', journal).strip()
                 
-                except Exception as e:
-                    print(f"Error parsing Google Scholar result: {e}")
+                # Only include if one of the authors is the faculty member
+                if not self.name_index.matches(faculty_name, authors.split(',')):
+                    SCRAPE_RESULTS.labels('scholar', 'author_filtered').inc()
                     continue
+                
+                SCRAPE_RESULTS.labels('scholar', 'parsed').inc()
+                publications.append({
+                    'title': title,
+                    'authors': authors,
+                    'journal': journal,
+                    'year': year or 0,
+                    'citations': citations,
+                    'doi': '',
+                    'source': 'Google Scholar'
+                })
             
-            print(f"Found {len(publications)} publications from Google Scholar")
-            return publications
-            
-        except Exception as e:
-            print(f"Error searching Google Scholar: {e}")
-            return []
+            except Exception as e:
+                SCRAPE_RESULTS.labels('scholar', 'parse_error').inc()
+                logger.debug("Error parsing Google Scholar result: %s", e)
+                continue
+        
+        return publications
+
+    def search_crossref(self, faculty_name, progress=None):
+        """Search CrossRef API for publications, following the deep-paging cursor"""
+        publications = []
+        for _, page, page_publications in self.iter_crossref_pages(faculty_name):
+            publications.extend(page_publications)
+            if progress:
+                progress('crossref_page', {'page': page, 'publications': page_publications})
+        
+        logger.info("Found %d publications from CrossRef", len(publications))
+        return publications
+
+    def iter_crossref_pages(self, faculty_name):
+        """
+        Yield ('crossref', page, publications) for each CrossRef page.
 
-    def search_crossref(self, faculty_name):
-        """Search CrossRef API for publications"""
+        Works in the local snapshot index come first; the live API is then
+        only asked for works indexed since the snapshot.
+        """
+        page = 0
+        indexed_since = None
+        try:
+            if self.crossref_index:
+                indexed_since = self.crossref_index.snapshot_date()
+                for items in self.crossref_index.iter_works_for_author(faculty_name):
+                    page += 1
+                    yield 'crossref', page, self._parse_crossref_items(items, faculty_name)
+                logger.debug("Read %d pages from the local CrossRef snapshot", page)
+        except Exception as e:
+            logger.warning("Error reading local CrossRef snapshot: %s", e)
+            indexed_since = None
+        
         try:
             # CrossRef API search
-            url = "https://api.crossref.org/works"
+            url = self.crossref_url
             params = {
                 'query.author': faculty_name,
                 'rows': 20,
-                'sort': 'relevance'
+                'sort': 'relevance',
+                'cursor': '*'
             }
+            if indexed_since:
+                params['filter'] = f'from-index-date:{indexed_since}'
             
-            print(f"Searching CrossRef API for {faculty_name}")
-            
-            response = self.session.get(url, params=params)
-            if response.status_code != 200:
-                print(f"Failed to fetch CrossRef results: {response.status_code}")
-                return []
-            
-            data = response.json()
-            publications = []
+            for _ in range(self.crossref_pages):
+                page += 1
+                response = self._fetch('crossref', url, params=params)
+                if response.status_code != 200:
+                    logger.warning("CrossRef returned HTTP %s for page %d", response.status_code, page)
+                    return
+                
+                message = response.json().get('message', {})
+                items = message.get('items', [])
+                yield 'crossref', page, self._parse_crossref_items(items, faculty_name)
+                
+                if not items or not message.get('next-cursor'):
+                    return
+                params['cursor'] = message['next-cursor']
             
-            for item in data.get('message', {}).get('items', []):
-                try:
-                    # Extract publication details
-                    title = item.get('title', [''])[0] if item.get('title') else ''
-                    
-                    # Extract authors
-                    authors_list = []
-                    for author in item.get('author', []):
-                        given = author.get('given', '')
-                        family = author.get('family', '')
-                        if given and family:
-                            authors_list.append(f"{given} {family}")
-                        elif family:
-                            authors_list.append(family)
-                    
-                    authors = ', '.join(authors_list)
-                    
-                    # Multi-factor verification for accurate attribution
-                    if not self.verify_publication_attribution(item, faculty_name, department, college):
-                        continue
-                    
-                    # Extract other details
-                    journal = item.get('container-title', [''])[0] if item.get('container-title') else ''
-                    
-                    # Extract year
-                    year = 0
-                    if item.get('published-print'):
-                        year = item['published-print']['date-parts'][0][0]
-                    elif item.get('published-online'):
-                        year = item['published-online']['date-parts'][0][0]
-                    
-                    # Extract DOI
-                    doi = item.get('DOI', '')
-                    
-                    # Extract citation count (if available)
-                    citations = item.get('is-referenced-by-count', 0)
-                    
-                    publications.append({
-                        'title': title,
-                        'authors': authors,
-                        'journal': journal,
-                        'year': year,
-                        'citations': citations,
-                        'doi': doi,
-                        'source': 'CrossRef'
-                    })
+        except Exception as e:
+            logger.warning("Error searching CrossRef: %s", e)
+
+    def _parse_crossref_items(self, items, faculty_name):
+        """Parse one page of CrossRef work items"""
+        publications = []
+        
+        for item in items:
+            try:
+                # Extract publication details
+                title = item.get('title', [''])[0] if item.get('title') else ''
                 
-                except Exception as e:
-                    print(f"Error parsing CrossRef result: {e}")
+                # Extract authors
+                authors_list = []
+                for author in item.get('author', []):
+                    given = author.get('given', '')
+                    family = author.get('family', '')
+                    if given and family:
+                        authors_list.append(f"{given} {family}")
+                    elif family:
+                        authors_list.append(family)
+                
+                authors = ', '.join(authors_list)
+                
+                # Only include if one of the authors is the faculty member
+                if not self.verify_publication_attribution(item, faculty_name):
+                    SCRAPE_RESULTS.labels('crossref', 'author_filtered').inc()
                     continue
+                
+                # Extract other details
+                journal = item.get('container-title', [''])[0] if item.get('container-title') else ''
+                
+                # Extract year
+                year = 0
+                if item.get('published-print'):
+                    year = item['published-print']['date-parts'][0][0]
+                elif item.get('published-online'):
+                    year = item['published-online']['date-parts'][0][0]
+                
+                # Extract DOI
+                doi = item.get('DOI', '')
+                
+                # Extract citation count (if available)
+                citations = item.get('is-referenced-by-count', 0)
+                
+                SCRAPE_RESULTS.labels('crossref', 'parsed').inc()
+                publications.append({
+                    'title': title,
+                    'authors': authors,
+                    'journal': journal,
+                    'year': year,
+                    'citations': citations,
+                    'doi': doi,
+                    'source': 'CrossRef'
+                })
             
-            print(f"Found {len(publications)} publications from CrossRef")
-            return publications
-            
-        except Exception as e:
-            print(f"Error searching CrossRef: {e}")
-            return []
+            except Exception as e:
+                SCRAPE_RESULTS.labels('crossref', 'parse_error').inc()
+                logger.debug("Error parsing CrossRef result: %s", e)
+                continue
+        
+        return publications
+
+    def verify_publication_attribution(self, item, faculty_name):
+        """Whether a CrossRef work lists the faculty member among its authors"""
+        mentions = [
+            f"{author.get('given', '')} {author.get('family', '')}"
+            for author in item.get('author', [])
+        ]
+        return self.name_index.matches(faculty_name, mentions)
 
     def search_researchgate(self, faculty_name, department, college=""):
         """ResearchGate search - simplified due to anti-scraping measures"""
@@ -217,34 +414,8 @@ class PublicationScraper:
 
     def resolve_ambiguity(self, publications):
         """Remove duplicate publications by title similarity"""
-        if not publications:
-            return []
-        
-        unique_publications = []
-        seen_titles = set()
-        
-        for pub in publications:
-            title = pub.get('title', '').lower().strip()
-            if not title:
-                continue
-            
-            # Create a normalized title for comparison
-            normalized_title = re.sub(r'[^\w\s]', '', title)
-            normalized_title = ' '.join(normalized_title.split())
-            
-            # Check if we've seen a similar title
-            is_duplicate = False
-            for seen_title in seen_titles:
-                # Simple similarity check - if titles are very similar, consider duplicate
-                if self.title_similarity(normalized_title, seen_title) > 0.8:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                seen_titles.add(normalized_title)
-                unique_publications.append(pub)
-        
-        return unique_publications
+        deduplicator = TitleDeduplicator()
+        return [pub for pub in publications if deduplicator.add(pub.get('title', ''))]
 
     def title_similarity(self, title1, title2):
         """Calculate similarity between two titles"""
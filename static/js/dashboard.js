@@ -3,11 +3,11 @@ Plotly.setPlotConfig({
     responsive: true
 });
 
-// Fetch dashboard data
+// Fetch dashboard data once (fallback for browsers without EventSource)
 async function fetchDashboardData() {
     console.log('Fetching dashboard data...');
     try {
-        const response = await fetch('/api/dashboard');
+        const response = await fetch(`/api/dashboard${filterQuery()}`);
         console.log('Response status:', response.status);
         
         if (!response.ok) {
@@ -138,19 +138,99 @@ function updateTopPublications(publications) {
     });
 }
 
-// Fetch data on page load and every 5 minutes
-document.addEventListener('DOMContentLoaded', () => {
-    console.log('DOM loaded, fetching dashboard data...');
-    fetchDashboardData();
-    setInterval(fetchDashboardData, 300000); // 5 minutes
-});
+// Latest dashboard state; deltas from the server are merged into it
+let dashboardState = {};
+let dashboardSource = null;
+
+// Current college/department filter as a query string
+function filterQuery() {
+    const params = new URLSearchParams();
+    const college = document.getElementById('collegeFilter');
+    const department = document.getElementById('departmentFilter');
+    if (college && college.value) params.set('college', college.value);
+    if (department && department.value) params.set('department', department.value);
+    const query = params.toString();
+    return query ? `?${query}` : '';
+}
+
+// Subscribe to server-pushed updates. The server sends one snapshot and
+// afterwards only the fields that changed, so an idle dashboard costs nothing.
+function subscribeDashboard() {
+    if (!window.EventSource) {
+        fetchDashboardData();
+        return;
+    }
+    
+    if (dashboardSource) {
+        dashboardSource.close();
+    }
+    const source = new EventSource(`/api/dashboard/stream${filterQuery()}`);
+    dashboardSource = source;
+    
+    source.addEventListener('snapshot', event => {
+        dashboardState = JSON.parse(event.data);
+        updateDashboard(dashboardState);
+    });
+    
+    source.addEventListener('delta', event => {
+        const delta = JSON.parse(event.data);
+        console.log('Dashboard delta received:', Object.keys(delta));
+        dashboardState = Object.assign({}, dashboardState, delta);
+        updateDashboard(dashboardState);
+    });
+    
+    // The server closes the stream every few minutes and EventSource reconnects
+    // with the last version seen; a snapshot is resent only if data changed
+    source.onerror = () => console.warn('Dashboard stream interrupted, reconnecting...');
+}
+
+// Fill the college/department selects from the rollup cube
+async function loadFilters() {
+    const collegeSelect = document.getElementById('collegeFilter');
+    const departmentSelect = document.getElementById('departmentFilter');
+    if (!collegeSelect || !departmentSelect) return;
+    
+    let departments = [];
+    try {
+        const response = await fetch('/api/departments');
+        departments = await response.json();
+    } catch (error) {
+        console.error('Error loading dashboard filters:', error);
+        return;
+    }
+    
+    const addOption = (select, value) => {
+        const option = document.createElement('option');
+        option.value = value;
+        option.textContent = value;
+        select.appendChild(option);
+    };
+    
+    [...new Set(departments.map(d => d.college))].forEach(college => addOption(collegeSelect, college));
+    
+    const fillDepartments = () => {
+        departmentSelect.length = 1;
+        departments
+            .filter(d => !collegeSelect.value || d.college === collegeSelect.value)
+            .forEach(d => addOption(departmentSelect, d.department));
+    };
+    fillDepartments();
+    
+    collegeSelect.addEventListener('change', () => {
+        fillDepartments();
+        subscribeDashboard();
+    });
+    departmentSelect.addEventListener('change', subscribeDashboard);
+}
+
+function initDashboard() {
+    loadFilters();
+    subscribeDashboard();
+}
 
-// Also try to fetch data immediately when script loads
 console.log('Dashboard script loaded');
 if (document.readyState === 'loading') {
-    document.addEventListener('DOMContentLoaded', fetchDashboardData);
+    document.addEventListener('DOMContentLoaded', initDashboard);
 } else {
-    // DOM is already loaded
-    console.log('DOM already loaded, fetching data immediately');
-    fetchDashboardData();
+    initDashboard();
 }
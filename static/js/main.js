@@ -1,6 +1,138 @@
+const JOB_POLL_INTERVAL = 1000; // 1 second
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+// Poll a search job until it is done or failed, showing its progress
+async function waitForJob(statusUrl) {
+    const stageElement = document.querySelector('#searchResults p');
+    
+    while (true) {
+        const response = await fetch(statusUrl);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        const job = await response.json();
+        if (job.status === 'done' || job.status === 'failed') {
+            return job;
+        }
+        
+        if (stageElement && job.stage) {
+            stageElement.textContent = `${job.stage} (${job.progress || 0}%)`;
+        }
+        await sleep(JOB_POLL_INTERVAL);
+    }
+}
+
+function addProgressLine(text) {
+    const list = document.getElementById('searchProgress');
+    if (!list) return;
+    
+    const item = document.createElement('li');
+    item.textContent = text;
+    list.appendChild(item);
+}
+
+// Show publications as soon as a source page has been parsed
+function addPreviewPublications(publications) {
+    const list = document.getElementById('searchPreview');
+    if (!list) return;
+    
+    publications.forEach(pub => {
+        const item = document.createElement('li');
+        item.className = 'list-group-item bg-dark text-light';
+        
+        const title = document.createElement('div');
+        title.className = 'fw-bold';
+        title.textContent = pub.title;
+        
+        const details = document.createElement('small');
+        details.className = 'text-muted';
+        details.textContent = `${pub.journal || pub.source} (${pub.year || '-'}) - ${pub.citations || 0} citations`;
+        
+        item.appendChild(title);
+        item.appendChild(details);
+        list.appendChild(item);
+    });
+}
+
+// Follow a search job over Server-Sent Events; resolves with the job's result
+function streamJob(eventsUrl) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(eventsUrl);
+        const listen = (name, handler) => source.addEventListener(name, event => {
+            handler(JSON.parse(event.data));
+        });
+        
+        listen('stage', data => addProgressLine(`${data.stage} (${data.progress}%)`));
+        listen('scholar_page', data => {
+            addProgressLine(`Google Scholar page ${data.page} fetched: ${data.publications.length} publications`);
+            addPreviewPublications(data.publications);
+        });
+        listen('crossref_page', data => {
+            addProgressLine(`CrossRef cursor page ${data.page} fetched: ${data.publications.length} publications`);
+            addPreviewPublications(data.publications);
+        });
+        listen('deduplicated', data => addProgressLine(`${data.after} unique publications after deduplication`));
+        listen('stored', data => addProgressLine(`${data.added} new publications saved so far`));
+        listen('committed', data => addProgressLine(`${data.added} new publications saved`));
+        listen('done', data => {
+            source.close();
+            resolve(data);
+        });
+        listen('failed', data => {
+            source.close();
+            resolve({ status: 'error', message: data.error });
+        });
+        
+        source.onerror = () => {
+            // Let the caller fall back to polling if the stream cannot be opened
+            if (source.readyState === EventSource.CLOSED) {
+                reject(new Error('Event stream closed'));
+            }
+        };
+    });
+}
+
+function handleSearchResult(data) {
+    if (data && data.status === 'success') {
+        // Redirect to faculty-specific results page
+        if (data.redirect_url) {
+            window.location.href = data.redirect_url;
+        } else {
+            // Fallback to faculty results page using faculty_id
+            window.location.href = `/faculty/${data.faculty_id}`;
+        }
+    } else {
+        alert(`Error searching publications: ${(data && data.message) || 'Unknown error'}`);
+    }
+}
+
+async function followJob(data) {
+    const statusUrl = data.status_url || `/jobs/${data.job_id}`;
+    
+    if (window.EventSource) {
+        try {
+            return await streamJob(`${statusUrl}/events`);
+        } catch (error) {
+            console.error('Progress stream failed, polling instead:', error);
+        }
+    }
+    
+    const job = await waitForJob(statusUrl);
+    return job.status === 'done' ? job.result : {
+        status: 'error',
+        message: job.error
+    };
+}
+
 document.addEventListener('DOMContentLoaded', function() {
     const searchForm = document.getElementById('searchForm');
     const searchResults = document.getElementById('searchResults');
+    if (!searchForm) return;
+    const submitButton = searchForm.querySelector('button[type="submit"]');
 
     searchForm.addEventListener('submit', async function(e) {
         e.preventDefault();
@@ -15,6 +147,8 @@ document.addEventListener('DOMContentLoaded', function() {
         }
 
         searchResults.style.display = 'block';
+        // One search at a time; resubmitting would only queue duplicate work
+        submitButton.disabled = true;
         
         try {
             const response = await fetch('/search', {
@@ -31,20 +165,17 @@ document.addEventListener('DOMContentLoaded', function() {
 
             const data = await response.json();
             
-            if (data.status === 'success') {
-                // Redirect to faculty-specific results page
-                if (data.redirect_url) {
-                    window.location.href = data.redirect_url;
-                } else {
-                    // Fallback to faculty results page using faculty_id
-                    window.location.href = `/faculty/${data.faculty_id}`;
-                }
+            if (response.status === 202 && data.job_id) {
+                // The search runs in the background; follow the job until it finishes
+                handleSearchResult(await followJob(data));
             } else {
-                alert(`Error searching publications: ${data.message || 'Unknown error'}`);
+                handleSearchResult(data);
             }
         } catch (error) {
             console.error('Error:', error);
             alert('An error occurred while searching');
+        } finally {
+            submitButton.disabled = false;
         }
     });
 });
@@ -0,0 +1,54 @@
+"""
+Application factory: background threads run in the app that started them.
+"""
+
+import time
+
+from app import create_app, db, init_schema, bump_data_version, SchedulerLease, SearchJob
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+def test_threads_use_the_factory_database(tmp_path, monkeypatch):
+    from core.dashboard import VersionWatcher
+    from core.jobs import QUEUED, DONE, SearchWorkerPool
+    from scheduler.lease import Lease
+
+    factory_app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'factory.db')})
+    monkeypatch.setattr('core.jobs.run_faculty_search',
+                        lambda name, department, college, progress=None: {'status': 'success'})
+
+    with factory_app.app_context():
+        init_schema()
+        for _ in range(7):
+            bump_data_version(db.session)
+        db.session.add(SearchJob(id='factory-job', search_key='factory|job|key', name='Factory Job',
+                                 department='Factories', college='Factory College', status=QUEUED))
+        db.session.commit()
+
+        # Started from inside the factory app's context
+        pool = SearchWorkerPool(1)
+        pool.start()
+        lease = Lease('factory-lease', ttl=30)
+        assert lease.acquire()
+        first_beat = db.session.get(SchedulerLease, 'factory-lease').heartbeat_at
+        db.session.remove()
+        with lease.keep_alive(interval=0.05):
+            time.sleep(0.3)
+
+    watcher = VersionWatcher(interval=0.05)
+    watcher.start(factory_app)
+    assert watcher.wait_for_change(None, timeout=5) == 7
+
+    def job_done():
+        with factory_app.app_context():
+            return db.session.get(SearchJob, 'factory-job').status == DONE
+    assert wait_until(job_done)
+
+    with factory_app.app_context():
+        assert db.session.get(SchedulerLease, 'factory-lease').heartbeat_at > first_beat
@@ -0,0 +1,31 @@
+"""
+Roster batches: uploads are parsed by the format their file name gives.
+"""
+
+import io
+
+import pytest
+
+from app import app, db, SearchJob
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+ROSTER = b'name,department,college\nBea Batch,Rosters,Batch College\n'
+
+def upload(filename):
+    return app.test_client().post('/search/batch', content_type='multipart/form-data',
+                                  data={'roster': (io.BytesIO(ROSTER), filename)})
+
+def test_upload_with_a_known_extension_is_queued():
+    response = upload('roster.CSV')
+    assert response.status_code == 202
+    assert response.get_json()['rows'] == 1
+    # Leave no queued job behind for other tests' workers to claim
+    SearchJob.query.filter_by(name='Bea Batch').delete()
+    db.session.commit()
+
+@pytest.mark.parametrize('filename', ['', 'roster', 'roster.xlsx'])
+def test_upload_without_a_usable_file_name_is_rejected(filename):
+    response = upload(filename)
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
@@ -0,0 +1,78 @@
+"""
+Co-authorship graph: collaborators are linked to stored faculty members by
+block key, and a partial refresh re-links other members' edges.
+"""
+
+import sqlite3
+
+import pytest
+
+from app import db, CoauthorEdge, Faculty
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+def coauthored(name, coauthors):
+    return [{'title': f'{name} with friends', 'authors': ', '.join([name] + coauthors)}]
+
+def edge(faculty_id, key):
+    return CoauthorEdge.query.filter_by(faculty_id=faculty_id, collaborator_key=key).one()
+
+def test_faculty_rows_carry_their_block_key(add_member):
+    member_id = add_member('Ursula Kumar Vance', coauthored('Ursula Kumar Vance', [])).id
+    assert db.session.get(Faculty, member_id).block_key == 'u vance'
+
+def test_roster_imports_carry_their_block_key():
+    from core.batch import create_faculty
+
+    create_faculty([{'name': 'Ines Roster Ortiz', 'department': 'Edges', 'college': 'Graph College'}])
+    assert Faculty.query.filter_by(name='Ines Roster Ortiz').one().block_key == 'i ortiz'
+
+def test_partial_refresh_links_both_directions(add_member):
+    from core.coauthors import refresh_coauthors
+
+    olga = add_member('Olga Quist', coauthored('Olga Quist', ['Pavel Quade', 'Nobody Outside'])).id
+    refresh_coauthors([olga])
+    assert edge(olga, 'p quade').collaborator_faculty_id is None
+
+    pavel = add_member('Pavel Quade', coauthored('Pavel Quade', ['O. Quist'])).id
+    refresh_coauthors([pavel])
+    assert edge(pavel, 'o quist').collaborator_faculty_id == olga
+    # Olga's existing edge now points at the newly stored member
+    assert edge(olga, 'p quade').collaborator_faculty_id == pavel
+    assert edge(olga, 'n outside').collaborator_faculty_id is None
+
+def test_namesakes_stay_unlinked_and_unkeyed_rows_are_backfilled(add_member):
+    from core.coauthors import refresh_coauthors
+
+    first = add_member('Rhea Stone', coauthored('Rhea Stone', ['Tom Quill'])).id
+    second = add_member('Rosa Stone', coauthored('Rosa Stone', [])).id
+    writer = add_member('Tom Quill', coauthored('Tom Quill', ['R. Stone'])).id
+    # A row written without the ORM has no key yet
+    Faculty.query.filter_by(id=second).update({'block_key': None}, synchronize_session=False)
+    db.session.commit()
+
+    refresh_coauthors([first, second, writer])
+    assert db.session.get(Faculty, second).block_key == 'r stone'
+    assert edge(writer, 'r stone').collaborator_faculty_id is None
+    assert edge(first, 't quill').collaborator_faculty_id == writer
+
+def test_graph_queries_look_up_faculty_in_chunks(add_member, monkeypatch):
+    from core.coauthors import connected_components, department_collaboration, refresh_coauthors
+
+    monkeypatch.setattr('core.coauthors.KEY_CHUNK', 1)
+    first = add_member('Vera Chunk', coauthored('Vera Chunk', ['Wade Piece']), college='Chunk College').id
+    second = add_member('Wade Piece', coauthored('Wade Piece', ['V. Chunk']), college='Chunk College').id
+    refresh_coauthors([first, second])
+
+    # One bound parameter per statement: an unchunked IN (...) over both members fails
+    connection = db.session.connection().connection.driver_connection
+    limit = connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 1)
+    try:
+        collaboration = department_collaboration('Chunk College')
+        components = connected_components()
+    finally:
+        connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, limit)
+
+    assert collaboration['intra_department'] == {'pairs': 1, 'papers': 1}
+    group = next(group for group in components if first in [m['faculty_id'] for m in group['members']])
+    assert [member['name'] for member in group['members']] == ['Vera Chunk', 'Wade Piece']
@@ -0,0 +1,41 @@
+"""
+Refresh comparison reports: stored publications are read as column rows,
+once, for both the comparison and the metrics.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app import db, Publication
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+def test_report_reads_columns_not_orm_objects(add_member, monkeypatch):
+    from core.comparison import PublicationComparator
+
+    member_id = add_member('Cora Compare', [
+        {'title': 'Cited Paper', 'citations': 12, 'journal': 'J', 'year': 2019},
+        {'title': 'Quiet Paper', 'citations': 1, 'journal': 'J', 'year': 2021}
+    ]).id
+    db.session.expunge_all()
+
+    comparator = PublicationComparator()
+    monkeypatch.setattr(comparator.scraper, 'scrape_publications', lambda name, department: [
+        {'title': 'Cited Paper', 'citations': 15, 'journal': 'J', 'year': 2019},
+        {'title': 'Fresh Paper', 'citations': 0, 'journal': 'J', 'year': 2024}
+    ])
+    loaded = []
+    def on_load(target, context):
+        loaded.append(target)
+    event.listen(Publication, 'load', on_load)
+    try:
+        report = comparator.generate_comparison_report(member_id)
+    finally:
+        event.remove(Publication, 'load', on_load)
+
+    assert loaded == []
+    assert report['name'] == 'Cora Compare'
+    assert report['metrics']['total_publications'] == 2
+    assert report['metrics']['total_citations'] == 13
+    assert [pub['title'] for pub in report['changes']['added']] == ['Fresh Paper']
+    assert report['changes']['removed'] == ['Quiet Paper']
@@ -0,0 +1,72 @@
+"""
+Authorship disambiguation: re-attribution needs the new owner's name in the
+author list and never duplicates a paper.
+"""
+
+import pytest
+
+from app import db, DataVersion, Faculty, Publication, PUBLICATIONS_VERSION
+from core.titles import title_fingerprint
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+def papers(name, count, coauthors, journal, first_year):
+    return [{'title': f'{name} study {n}', 'authors': ', '.join([name] + coauthors),
+             'journal': journal, 'year': first_year + n, 'citations': n} for n in range(count)]
+
+def owner_of(title):
+    return db.session.query(Publication.faculty_id).filter_by(title=title).scalar()
+
+def test_namesake_missing_from_author_list_does_not_take_the_paper(add_member):
+    from core.disambiguation import run_disambiguation
+
+    add_member('Ken Park', papers('Ken Park', 4, ['Alice Walker', 'Bob Brown'], 'Journal of Graphs', 2010))
+    kim = add_member('Kim Park', papers('Kim Park', 4, ['Carol White'], 'Journal of Cells', 1990) + [
+        # Ken's co-authors and venue, but the author list names Kim
+        {'title': 'Graph paper by Kim', 'authors': 'Kim Park, Alice Walker, Bob Brown',
+         'journal': 'Journal of Graphs', 'year': 2011}
+    ]).id
+
+    run_disambiguation()
+    assert owner_of('Graph paper by Kim') == kim
+
+def test_reattribution_merges_duplicates(add_member):
+    from core.disambiguation import run_disambiguation
+
+    lou = add_member('Lou Reed', papers('Lou Reed', 4, ['Alice Walker', 'Bob Brown'], 'Journal of Graphs', 2010)).id
+    lea = add_member('Lea Reed', papers('Lea Reed', 4, ['Carol White', 'Dan Green'], 'Journal of Cells', 1990) + [
+        {'title': 'Misattributed graph paper', 'authors': 'L. Reed, Alice Walker',
+         'journal': 'Journal of Graphs', 'year': 2011},
+        # A copy of a paper Lou already has
+        {'title': 'Lou Reed study 0', 'authors': 'L. Reed, Bob Brown', 'year': 2010}
+    ]).id
+
+    stats = run_disambiguation()
+    assert stats['reattributed'] >= 1 and stats['merged'] >= 1
+    assert owner_of('Misattributed graph paper') == lou
+
+    fingerprints = [fingerprint for fingerprint, in db.session.query(Publication.fingerprint).filter_by(faculty_id=lou)]
+    assert fingerprints.count(title_fingerprint('Lou Reed study 0')) == 1
+    assert Publication.query.filter_by(faculty_id=lea, title='Lou Reed study 0').count() == 0
+
+def test_rerun_without_changes_writes_nothing(add_member):
+    from core.disambiguation import run_disambiguation
+
+    add_member('Ned Stable', papers('Ned Stable', 3, ['Ola Steady'], 'Journal of Rest', 2000))
+    run_disambiguation()
+    version = db.session.get(DataVersion, PUBLICATIONS_VERSION).version
+
+    stats = run_disambiguation()
+    assert stats['reattributed'] == 0
+    assert db.session.get(DataVersion, PUBLICATIONS_VERSION).version == version
+
+def test_orphaned_publications_are_skipped():
+    from core.disambiguation import run_disambiguation
+
+    missing_id = db.session.query(db.func.max(Faculty.id)).scalar() + 1000
+    db.session.add(Publication(title='Orphaned paper', authors='Gone Member', faculty_id=missing_id))
+    db.session.commit()
+
+    stats = run_disambiguation()
+    assert stats['publications'] == Publication.query.filter(Publication.faculty_id != missing_id).count()
+    assert owner_of('Orphaned paper') == missing_id
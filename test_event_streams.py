@@ -0,0 +1,62 @@
+"""
+Server-Sent Event streams end after a bounded time and resume from Last-Event-ID.
+"""
+
+import re
+
+import pytest
+
+from app import app, db, init_schema, SearchJob
+
+@pytest.fixture(autouse=True)
+def short_streams(monkeypatch):
+    with app.app_context():
+        init_schema()
+    # No process-wide watcher thread: its polls would land in other tests' statement counts
+    monkeypatch.setattr('core.dashboard.watcher.start', lambda app=None: None)
+    monkeypatch.setattr('core.dashboard.STREAM_MAX_DURATION', 0.3)
+    monkeypatch.setattr('core.dashboard.KEEPALIVE_INTERVAL', 0.1)
+    monkeypatch.setattr('core.jobs.EVENT_STREAM_MAX_DURATION', 0.3)
+    monkeypatch.setattr('core.jobs.EVENT_POLL_INTERVAL', 0.05)
+    monkeypatch.setattr('core.jobs.EVENT_KEEPALIVE', 0.1)
+
+def event_ids(body):
+    return [int(i) for i in re.findall(r'^id: (\d+)$', body, re.M)]
+
+def test_dashboard_stream_ends_and_skips_unchanged_snapshot():
+    client = app.test_client()
+    body = client.get('/api/dashboard/stream').get_data(as_text=True)
+    assert 'event: snapshot' in body
+    version = event_ids(body)[0]
+
+    resumed = client.get('/api/dashboard/stream', headers={'Last-Event-ID': str(version)}).get_data(as_text=True)
+    assert 'event: snapshot' not in resumed
+    assert ': keep-alive' in resumed
+
+def test_job_stream_ends_and_replays_after_last_event_id():
+    from core.jobs import RUNNING, record_event
+
+    with app.app_context():
+        db.session.add(SearchJob(id='stream-job', search_key='stream|job|key', name='Stream Job',
+                                 department='Streams', college='Stream College', status=RUNNING))
+        db.session.commit()
+        record_event('stream-job', 'stage', {'stage': 'Scraping publications', 'progress': 10})
+
+    client = app.test_client()
+    body = client.get('/jobs/stream-job/events').get_data(as_text=True)
+    assert 'Scraping publications' in body
+    first = event_ids(body)
+
+    with app.app_context():
+        record_event('stream-job', 'stage', {'stage': 'Updating metrics', 'progress': 90})
+    resumed = client.get('/jobs/stream-job/events', headers={'Last-Event-ID': str(first[-1])}).get_data(as_text=True)
+    assert 'Scraping publications' not in resumed
+    assert 'Updating metrics' in resumed
+
+def test_job_stream_ends_when_the_job_is_gone():
+    from core.jobs import stream_job_events
+
+    with app.app_context():
+        body = ''.join(stream_job_events('pruned-job', 0))
+    assert body.startswith('event: failed\n')
+    assert 'Job not found' in body
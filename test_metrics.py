@@ -0,0 +1,83 @@
+"""
+Vectorized bibliometrics must match a straightforward per-faculty computation.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core.metrics import METRIC_FIELDS, citation_metrics, compute_metrics
+
+CURRENT_YEAR = 2024
+
+def reference_metrics(citations, years, current_year=CURRENT_YEAR):
+    ranked = sorted(citations, reverse=True)
+    h_index = max([rank for rank, count in enumerate(ranked, 1) if count >= rank], default=0)
+    g_index = max([g for g in range(1, len(ranked) + 1) if sum(ranked[:g]) >= g * g], default=0)
+    known = [year for year in years if year > 0]
+    first_year = min(known) if known else 0
+    career_years = current_year - first_year + 1 if known else 1
+    return {
+        'total_publications': len(citations),
+        'total_citations': sum(citations),
+        'h_index': h_index,
+        'i10_index': sum(1 for count in citations if count >= 10),
+        'g_index': g_index,
+        'citations_per_year': sum(citations) / career_years,
+        'm_quotient': h_index / career_years if known else 0.0,
+        'first_year': first_year
+    }
+
+CASES = {
+    'all zeros': ([0, 0, 0], [2010, 2011, 2012]),
+    'single paper': ([7], [2020]),
+    'ties at h': ([3, 3, 3, 3], [2015, 2016, 2017, 2018]),
+    'ties across h': ([5, 4, 4, 4, 1], [2001, 2002, 2003, 2004, 2005]),
+    'h limited by papers': ([100, 90], [2019, 2020]),
+    'g above h': ([40, 2, 1, 0, 0, 0], [2000, 0, 0, 0, 0, 0]),
+    'i10 boundary': ([9, 10, 11, 10], [2018, 2018, 2019, 2019]),
+    'unknown years': ([12, 3, 1], [0, 0, 0]),
+    'unsorted': ([1, 8, 3, 20, 0, 5, 5], [2012, 2009, 2021, 2010, 2022, 2015, 2015]),
+}
+
+def assert_matches(result, expected):
+    for field in METRIC_FIELDS:
+        assert result[field] == pytest.approx(expected[field]), field
+
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_single_lists_match_reference(case):
+    citations, years = CASES[case]
+    result = compute_metrics(np.zeros(len(citations)), citations, years, current_year=CURRENT_YEAR)
+    assert_matches({field: result[field][0].item() for field in METRIC_FIELDS},
+                   reference_metrics(citations, years))
+
+def test_empty_list():
+    assert citation_metrics([], []) == {field: 0 for field in METRIC_FIELDS}
+    result = compute_metrics([], [], [])
+    assert result['faculty_id'].size == 0
+
+def test_many_faculty_in_one_pass_match_reference():
+    rng = random.Random(32)
+    faculty_ids, citations, years, expected = [], [], [], {}
+    for faculty_id in rng.sample(range(1, 1000), 40):
+        counts = [rng.choice([0, 0, 1, 2, 5, 9, 10, 11, 30, 150]) for _ in range(rng.randint(1, 25))]
+        pub_years = [rng.choice([0, 1995, 2005, 2015, 2023]) for _ in counts]
+        expected[faculty_id] = reference_metrics(counts, pub_years)
+        faculty_ids += [faculty_id] * len(counts)
+        citations += counts
+        years += pub_years
+    # Interleave the faculty members' rows
+    order = list(range(len(faculty_ids)))
+    rng.shuffle(order)
+
+    result = compute_metrics([faculty_ids[i] for i in order], [citations[i] for i in order],
+                             [years[i] for i in order], current_year=CURRENT_YEAR)
+    assert result['faculty_id'].tolist() == sorted(expected)
+    for i, faculty_id in enumerate(result['faculty_id'].tolist()):
+        assert_matches({field: result[field][i].item() for field in METRIC_FIELDS}, expected[faculty_id])
+
+def test_missing_values_count_as_zero():
+    result = compute_metrics([1, 1], [np.nan, 12], [None, 2020], current_year=CURRENT_YEAR)
+    assert_matches({field: result[field][0].item() for field in METRIC_FIELDS},
+                   reference_metrics([0, 12], [0, 2020]))
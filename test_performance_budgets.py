@@ -0,0 +1,176 @@
+"""
+Performance budgets: SQL statement counts and latency per endpoint.
+
+Runs against the temporary database set up in conftest.py. Scraper HTTP is
+stubbed at requests.Session.get with canned CrossRef pages, so searches go
+through the real parsing, attribution and storage code.
+"""
+
+import time
+from contextlib import contextmanager
+
+import pytest
+import requests
+from sqlalchemy import event
+
+from app import app, db, init_schema, bump_data_version, Faculty, Publication
+
+@pytest.fixture(scope='module', autouse=True)
+def schema():
+    with app.app_context():
+        init_schema()
+    yield
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+@contextmanager
+def count_statements():
+    """Collect the SQL statements executed inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+def add_faculty(prefix, faculty, publications_each, college='Budget College', department='Physics'):
+    """Bulk insert faculty with publications and refresh the derived tables"""
+    from core.metrics import refresh_metrics
+    from core.rollups import refresh_rollups
+
+    with app.app_context():
+        rows = [Faculty(name=f'{prefix} Member{i}', college=college, department=department) for i in range(faculty)]
+        db.session.add_all(rows)
+        db.session.flush()
+        db.session.bulk_insert_mappings(Publication, [{
+            'title': f'{prefix} paper {member.id}-{n}',
+            'authors': member.name,
+            'journal': 'Journal of Budgets',
+            'year': 2000 + n % 25,
+            'citations': n,
+            'faculty_id': member.id
+        } for member in rows for n in range(publications_each)])
+        bump_data_version(db.session)
+        db.session.commit()
+        refresh_metrics([member.id for member in rows])
+        refresh_rollups([(college, department)])
+        return [member.id for member in rows]
+
+def cold_statements(client, url):
+    """Statements of a request made right after the data version moved"""
+    with app.app_context():
+        bump_data_version(db.session)
+        db.session.commit()
+    with count_statements() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(statements)
+
+@pytest.mark.parametrize('url', ['/api/dashboard', '/api/dashboard?college=Budget+College'])
+def test_api_dashboard_statements_do_not_grow_with_rows(client, url):
+    add_faculty('Small', faculty=2, publications_each=5)
+    small = cold_statements(client, url)
+
+    add_faculty('Large', faculty=20, publications_each=50)
+    large = cold_statements(client, url)
+
+    assert large == small
+    assert small <= 10
+
+def test_api_dashboard_cached_request_is_one_statement(client):
+    client.get('/api/dashboard')
+    with count_statements() as statements:
+        assert client.get('/api/dashboard').status_code == 200
+    # Only the data version check
+    assert len(statements) == 1
+
+def test_api_dashboard_cached_latency(client):
+    client.get('/api/dashboard')
+    latencies = []
+    for _ in range(20):
+        start = time.perf_counter()
+        client.get('/api/dashboard')
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    assert latencies[int(len(latencies) * 0.95) - 1] < 0.25
+
+def test_faculty_page_statements_do_not_grow_with_publications(client):
+    light, = add_faculty('Light', faculty=1, publications_each=2)
+    heavy, = add_faculty('Heavy', faculty=1, publications_each=200)
+
+    counts = []
+    for faculty_id in (light, heavy):
+        with count_statements() as statements:
+            assert client.get(f'/faculty/{faculty_id}').status_code == 200
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, content=b''):
+        self.status_code = status_code
+        self._payload = payload
+        self.content = content
+
+    def json(self):
+        return self._payload
+
+@pytest.fixture
+def stub_upstream(monkeypatch):
+    """Stub scraper HTTP: an empty Scholar page and one CrossRef page of `count` works"""
+    state = {'count': 0, 'name': ''}
+
+    def get(session, url, params=None, **kwargs):
+        if 'crossref' not in url:
+            return FakeResponse(content=b'<html><body></body></html>')
+        given, family = state['name'].split(' ', 1)
+        return FakeResponse(payload={'message': {'items': [{
+            'title': [f"{state['name']} stubbed work {n}"],
+            'author': [{'given': given, 'family': family}, {'given': 'Co', 'family': f'Author{n % 7}'}],
+            'container-title': ['Journal of Stubs'],
+            'published-print': {'date-parts': [[2010 + n % 10]]},
+            'DOI': f"10.1234/{state['name'].replace(' ', '-').lower()}.{n}",
+            'is-referenced-by-count': n
+        } for n in range(state['count'])], 'next-cursor': None}})
+
+    monkeypatch.setattr(requests.Session, 'get', get)
+    return state
+
+def search_statements(client, stub_upstream, name, publications):
+    """Queue a search through /search and count the statements of running it"""
+    from core.jobs import claim_next_job, run_job
+
+    stub_upstream.update(count=publications, name=name)
+    response = client.post('/search', json={'name': name, 'department': 'Physics', 'college': 'Budget College'})
+    assert response.status_code == 202
+
+    with app.app_context():
+        with count_statements() as statements:
+            run_job(claim_next_job('budget-test'))
+        added = Publication.query.join(Faculty).filter(Faculty.name == name).count()
+    assert added == publications
+    return len(statements)
+
+def test_search_ingestion_statements_are_constant_within_a_chunk(client, stub_upstream, monkeypatch):
+    from core.works import INSERT_CHUNK_SIZE
+
+    monkeypatch.setattr('core.search.STORE_CHUNK_SIZE', INSERT_CHUNK_SIZE)
+    few = search_statements(client, stub_upstream, 'Ada Fewpapers', 5)
+    many = search_statements(client, stub_upstream, 'Ada Manypapers', INSERT_CHUNK_SIZE)
+    assert many == few
+
+def test_search_ingestion_statements_grow_per_chunk_not_per_publication(client, stub_upstream, monkeypatch):
+    monkeypatch.setattr('core.search.STORE_CHUNK_SIZE', 50)
+    two = search_statements(client, stub_upstream, 'Bea Twochunks', 100)
+    four = search_statements(client, stub_upstream, 'Bea Fourchunks', 200)
+    six = search_statements(client, stub_upstream, 'Bea Sixchunks', 300)
+    per_chunk = (four - two) / 2
+    assert six - four == four - two
+    assert per_chunk <= 15
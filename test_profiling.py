@@ -0,0 +1,57 @@
+"""
+Job profiling: scraping happens in background jobs, so their scrape and SQL
+time is attributed to the job and reported like a slow request.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import app, db, init_schema, SearchJob
+
+@pytest.fixture(autouse=True)
+def job_profiling(monkeypatch, tmp_path):
+    from core import profiling
+
+    with app.app_context():
+        init_schema()
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setattr(profiling, 'PROFILE_JOB_THRESHOLD_MS', 0)
+    profiling.init_app(app, enabled=False, jobs=True)
+    yield
+    profiling._jobs_enabled = False
+    event.remove(Engine, 'before_cursor_execute', profiling._before_cursor_execute)
+    event.remove(Engine, 'after_cursor_execute', profiling._after_cursor_execute)
+
+def test_search_job_reports_its_scrape_and_sql_time(monkeypatch, tmp_path):
+    from core.jobs import RUNNING, run_job
+    from core.profiling import record_scrape
+
+    def fake_search(name, department, college, progress=None):
+        record_scrape(0.25)
+        record_scrape(0.5)
+        db.session.query(SearchJob).count()
+        return {'status': 'success'}
+    monkeypatch.setattr('core.jobs.run_faculty_search', fake_search)
+
+    with app.app_context():
+        job = SearchJob(id='profiled-job', search_key='profiled|job|key', name='Profiled Job',
+                        department='Timing', college='Profile College', status=RUNNING)
+        db.session.add(job)
+        db.session.commit()
+        run_job(job)
+
+    reports = list(tmp_path.glob('*job-search_profiled-job*.txt'))
+    assert len(reports) == 1
+    report = reports[0].read_text()
+    assert report.startswith('job search profiled-job')
+    assert 'scrape 2 requests, 750.0 ms' in report
+    assert 'sql 0 statements' not in report
+
+def test_scrapes_outside_a_job_are_not_attributed():
+    from core.profiling import profile_job, record_scrape
+
+    record_scrape(1.0)
+    with profile_job('empty') as profile:
+        pass
+    assert profile.scrape_count == 0
@@ -0,0 +1,35 @@
+"""
+Scheduled refreshes apply only the differences to a member's stored publications.
+"""
+
+import pytest
+
+from app import Publication
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+def stored(faculty_id):
+    return {pub.title: pub for pub in Publication.query.filter_by(faculty_id=faculty_id)}
+
+def test_refresh_keeps_unchanged_publications(add_member, monkeypatch):
+    from automation.update_publications import comparator, refresh_faculty
+
+    member = add_member('Rory Refresh', [
+        {'title': 'Kept As Is', 'citations': 2, 'journal': 'J', 'year': 2018},
+        {'title': 'Cited Since', 'citations': 1, 'journal': 'J', 'year': 2019},
+        {'title': 'Withdrawn Paper', 'citations': 3, 'journal': 'J', 'year': 2017}
+    ])
+    before = {title: pub.id for title, pub in stored(member.id).items()}
+
+    monkeypatch.setattr(comparator.scraper, 'scrape_publications', lambda name, department: [
+        {'title': 'Kept As Is', 'citations': 2, 'journal': 'J', 'year': 2018},
+        {'title': 'Cited Since', 'citations': 9, 'journal': 'Journal of Updates', 'year': 2019},
+        {'title': 'Brand New Paper', 'citations': 0, 'journal': 'J', 'year': 2024}
+    ])
+    refresh_faculty(member)
+
+    after = stored(member.id)
+    assert sorted(after) == ['Brand New Paper', 'Cited Since', 'Kept As Is']
+    assert after['Kept As Is'].id == before['Kept As Is']
+    assert after['Cited Since'].id == before['Cited Since']
+    assert (after['Cited Since'].citations, after['Cited Since'].journal) == (9, 'Journal of Updates')
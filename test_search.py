@@ -5,6 +5,7 @@ Test script to directly test the search endpoint
 
 import requests
 import json
+import time
 
 def test_search():
     """Test the search endpoint directly"""
@@ -26,8 +27,16 @@ def test_search():
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         
-        if response.status_code == 200:
-            result = response.json()
+        if response.status_code == 202:
+            # Searches run as background jobs; poll until the job finishes
+            status_url = "http://127.0.0.1:5000" + response.json()['status_url']
+            job = requests.get(status_url).json()
+            while job['status'] not in ('done', 'failed'):
+                print(f"Job {job['job_id']}: {job['stage']} ({job['progress']}%)")
+                time.sleep(1)
+                job = requests.get(status_url).json()
+            
+            result = job['result'] or {'status': 'error', 'message': job['error']}
             print(f"Status: {result.get('status')}")
             print(f"Message: {result.get('message')}")
             print(f"Publications Found: {result.get('publications_found', 'N/A')}")
@@ -0,0 +1,112 @@
+"""
+Columnar snapshot: incremental refreshes must match a full rebuild.
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from app import db, bump_data_version, DataVersion, Faculty, Publication, PUBLICATIONS_VERSION
+from core.snapshot import build_snapshot, publication_snapshot, reset_snapshot
+
+@pytest.fixture(autouse=True)
+def context(app_context):
+    reset_snapshot()
+
+@pytest.fixture
+def add_faculty(add_member):
+    """Factory: a faculty member with publications written as plain ORM inserts"""
+    def add(name, publications):
+        member = add_member(name)
+        db.session.add_all([Publication(title=f'{name} paper {n}', journal=f'Journal {n % 3}', year=2000 + n,
+                                        citations=n, faculty_id=member.id) for n in range(publications)])
+        db.session.commit()
+        return member.id
+    return add
+
+def assert_matches_rebuild(snapshot):
+    rebuilt = build_snapshot(snapshot.version, snapshot.deletes_version)
+    for column in ('ids', 'faculty_ids', 'years', 'citations'):
+        assert np.array_equal(getattr(snapshot, column), getattr(rebuilt, column)), column
+    names = [snapshot.journal_name(i) for i in snapshot.journal_ids]
+    assert names == [rebuilt.journal_name(i) for i in rebuilt.journal_ids]
+
+def test_incremental_refresh_matches_rebuild(add_faculty):
+    faculty_id = add_faculty('Snap Shot', 10)
+    first = publication_snapshot()
+    assert publication_snapshot() is first
+
+    # ORM update, bulk updates, plain and bulk inserts
+    publication = Publication.query.filter_by(faculty_id=faculty_id).first()
+    publication.citations = 999
+    publication.journal = 'Brand New Journal'
+    db.session.commit()
+    Publication.query.filter(Publication.faculty_id == faculty_id, Publication.year < 2003) \
+        .update({'year': 1999}, synchronize_session=False)
+    db.session.commit()
+    last = Publication.query.filter_by(faculty_id=faculty_id).order_by(Publication.id.desc()).first()
+    db.session.execute(update(Publication), [{'id': last.id, 'citations': 7, 'faculty_id': faculty_id}])
+    db.session.commit()
+    add_faculty('Snap Later', 3)
+    db.session.bulk_insert_mappings(Publication, [{'title': 'bulk', 'year': 2020, 'citations': 5,
+                                                   'faculty_id': faculty_id}])
+    bump_data_version(db.session)
+    db.session.commit()
+
+    second = publication_snapshot()
+    assert second is not first
+    assert second.deletes_version == first.deletes_version
+    assert len(second) == len(first) + 4
+    assert_matches_rebuild(second)
+    assert second.totals() == (Publication.query.count(),
+                               sum(pub.citations for pub in Publication.query))
+
+def test_inserts_committed_late_with_lower_ids_are_found(add_faculty):
+    faculty_id = add_faculty('Snap Late', 2)
+    gap = Publication.query.order_by(Publication.id.desc()).first().id + 1
+    # Committed first, with a higher id than the insert below
+    db.session.add(Publication(id=gap + 10, title='committed early', citations=1, faculty_id=faculty_id))
+    db.session.commit()
+    first = publication_snapshot()
+
+    db.session.bulk_insert_mappings(Publication, [{'id': gap, 'title': 'committed late', 'citations': 3,
+                                                   'faculty_id': faculty_id}])
+    bump_data_version(db.session)
+    db.session.commit()
+
+    second = publication_snapshot()
+    assert len(second) == len(first) + 1
+    assert gap in second.ids
+    assert_matches_rebuild(second)
+
+def test_search_inserts_carry_their_data_version(add_faculty):
+    from core.search import _store_chunk
+
+    member = db.session.get(Faculty, add_faculty('Snap Search', 0))
+    before = db.session.get(DataVersion, PUBLICATIONS_VERSION).version
+    _store_chunk(member, [{'title': 'Stamped search result', 'citations': 2}])
+    stored = Publication.query.filter_by(faculty_id=member.id).one()
+    assert before < stored.row_version <= db.session.get(DataVersion, PUBLICATIONS_VERSION).version
+
+def test_deletes_force_a_rebuild(add_faculty):
+    faculty_id = add_faculty('Snap Deleted', 4)
+    first = publication_snapshot()
+    Publication.query.filter_by(faculty_id=faculty_id).delete()
+    db.session.commit()
+
+    second = publication_snapshot()
+    assert second.deletes_version > first.deletes_version
+    assert len(second) == len(first) - 4
+    assert_matches_rebuild(second)
+
+def test_dashboard_matches_sql_aggregates(add_faculty):
+    from core.dashboard import build_dashboard_payload
+
+    add_faculty('Snap Dash', 6)
+    payload = build_dashboard_payload()
+    assert payload['totalPublications'] == Publication.query.count()
+    trends = {row['year']: row['count'] for row in payload['publicationTrends']}
+    assert sum(trends.values()) == payload['totalPublications']
+    top = max(pub.citations for pub in Publication.query)
+    assert payload['topPublications'][0]['citations'] == top
+    assert db.session.get(DataVersion, PUBLICATIONS_VERSION).version == publication_snapshot().version
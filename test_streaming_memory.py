@@ -0,0 +1,86 @@
+"""
+Memory budgets: publication scans must run in bounded memory.
+
+Peak Python allocation (tracemalloc) of the dashboard pages and a full
+metrics rebuild is measured before and after the table grows tenfold; with
+streamed, column-only reads it must stay roughly flat.
+"""
+
+import tracemalloc
+
+import pytest
+
+from app import app, db, init_schema, bump_data_version, Faculty, Publication
+
+@pytest.fixture(scope='module', autouse=True)
+def schema():
+    with app.app_context():
+        init_schema()
+    yield
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    # Both table sizes span several batches, so the comparison measures growth with rows
+    monkeypatch.setattr('core.streaming.STREAM_BATCH_SIZE', 200)
+
+def add_publications(faculty_id, count, offset=0):
+    with app.app_context():
+        db.session.bulk_insert_mappings(Publication, [{
+            'title': f'Memory budget paper {faculty_id}-{n} with a reasonably long title',
+            'authors': 'Memory Member, Co Author, Another Author',
+            'journal': 'Journal of Bounded Memory',
+            'year': 1990 + n % 30,
+            'citations': n % 997,
+            'faculty_id': faculty_id
+        } for n in range(offset, offset + count)])
+        bump_data_version(db.session)
+        db.session.commit()
+
+def add_faculty(count, publications_each):
+    with app.app_context():
+        rows = [Faculty(name=f'Memory Member{i}', college='Memory College', department='Storage')
+                for i in range(count)]
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = [member.id for member in rows]
+    for faculty_id in ids:
+        add_publications(faculty_id, publications_each)
+    return ids
+
+def peak_allocation(action):
+    """Peak traced bytes while running action(), after one warm-up call"""
+    action()
+    tracemalloc.start()
+    try:
+        action()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+@pytest.mark.parametrize('path', ['/dashboard', '/faculty/{id}'])
+def test_dashboard_peak_memory_is_flat_as_rows_grow(path):
+    client = app.test_client()
+    faculty_id, = add_faculty(1, 1000)
+    url = path.format(id=faculty_id)
+
+    def render():
+        assert client.get(url).status_code == 200
+
+    small = peak_allocation(render)
+    add_publications(faculty_id, 9000, offset=1000)
+    large = peak_allocation(render)
+    assert large < small * 1.5
+
+def test_metrics_rebuild_peak_memory_is_flat_as_rows_grow():
+    from core.metrics import refresh_metrics
+
+    def rebuild():
+        with app.app_context():
+            refresh_metrics()
+
+    faculty_ids = add_faculty(20, 100)
+    small = peak_allocation(rebuild)
+    for faculty_id in faculty_ids:
+        add_publications(faculty_id, 900, offset=100)
+    large = peak_allocation(rebuild)
+    assert large < small * 1.5
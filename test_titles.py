@@ -0,0 +1,62 @@
+"""
+Stored title fingerprints: populated on insert and used for duplicate checks.
+"""
+
+import pytest
+
+from app import db, Publication
+from core.titles import normalize_title, title_columns, title_fingerprint
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+def test_normalization():
+    assert normalize_title('  Deep   Learning: A Survey! ') == 'deep learning a survey'
+    assert title_fingerprint('Deep Learning - a survey') == title_fingerprint('deep learning: A SURVEY')
+    assert title_columns('X')['fingerprint'] == title_fingerprint('x')
+
+def test_columns_are_set_on_insert_and_title_change(add_member):
+    member = add_member('Tia Title')
+    publication = Publication(title='Graph Neural Networks, Revisited', faculty_id=member.id)
+    db.session.add(publication)
+    db.session.commit()
+    assert publication.normalized_title == 'graph neural networks revisited'
+    assert publication.fingerprint == title_fingerprint(publication.title)
+
+    publication.citations = 3
+    db.session.commit()
+    assert publication.normalized_title == 'graph neural networks revisited'
+
+    publication.title = 'Graph Networks'
+    db.session.commit()
+    assert publication.fingerprint == title_fingerprint('Graph Networks')
+
+def test_search_skips_titles_differing_only_in_case_and_punctuation(add_member):
+    from core.search import _store_chunk
+
+    member = add_member('Tom Title')
+    assert _store_chunk(member, [{'title': 'Sparse Attention for Long Documents', 'citations': 1}]) == 1
+    assert _store_chunk(member, [{'title': 'sparse attention, for long documents.', 'citations': 1},
+                                 {'title': 'A Different Paper', 'citations': 2}]) == 1
+    rows = Publication.query.filter_by(faculty_id=member.id).all()
+    assert sorted(pub.title for pub in rows) == ['A Different Paper', 'Sparse Attention for Long Documents']
+    assert all(pub.fingerprint == title_fingerprint(pub.title) for pub in rows)
+
+def test_compare_publications_matches_by_fingerprint(add_member):
+    from core.comparison import PublicationComparator
+
+    member = add_member('Tess Title')
+    db.session.add_all([
+        Publication(title='Kept Paper', citations=1, journal='J', year=2020, faculty_id=member.id),
+        Publication(title='Dropped Paper', citations=1, journal='J', year=2020, faculty_id=member.id)
+    ])
+    db.session.commit()
+
+    comparator = PublicationComparator()
+    old = Publication.query.filter_by(faculty_id=member.id).all()
+    changes = comparator.compare_publications(old, [
+        {'title': 'KEPT PAPER.', 'citations': 5, 'journal': 'J', 'year': 2020},
+        {'title': 'New Paper', 'citations': 0, 'journal': 'J', 'year': 2021}
+    ])
+    assert [pub['title'] for pub in changes['added']] == ['New Paper']
+    assert changes['updated'][0]['old']['citations'] == 1
+    assert changes['removed'] == ['Dropped Paper']
@@ -0,0 +1,43 @@
+"""
+Canonical works: co-authors' publication rows share one Work and its citations.
+"""
+
+import pytest
+
+from app import db, Publication, Work
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+def rows(title):
+    return Publication.query.filter_by(title=title).all()
+
+def test_coauthors_share_one_work(add_member):
+    from core.search import _store_chunk
+
+    paper = {'title': 'Shared Paper', 'doi': 'https://doi.org/10.1/SHARED', 'citations': 4}
+    for name in ('Wes Works', 'Wil Works'):
+        _store_chunk(add_member(name), [dict(paper)])
+
+    assert len({pub.work_id for pub in rows('Shared Paper')}) == 1
+    assert Work.query.filter_by(doi='10.1/shared').count() == 1
+
+def test_citation_updates_reach_every_authorship_row(add_member):
+    from core.works import sync_publication_citations, upsert_works
+
+    paper = {'title': 'Cited Together', 'doi': '10.1/together', 'citations': 1}
+    add_member('Wanda Works', [paper])
+    add_member('Walt Works', [paper])
+
+    work_ids = upsert_works([dict(paper, citations=30)])
+    sync_publication_citations(work_ids)
+    db.session.commit()
+    assert [pub.citations for pub in rows('Cited Together')] == [30, 30]
+
+def test_skipped_duplicates_are_not_stored(add_member):
+    from core.search import _store_chunk
+
+    member = add_member('Wyn Works')
+    _store_chunk(member, [{'title': 'Linked Paper', 'doi': '10.1/linked-a', 'citations': 1}])
+    # Same title under another DOI resolves to a different work, but is a duplicate row
+    _store_chunk(member, [{'title': 'LINKED PAPER.', 'doi': '10.1/linked-b', 'citations': 1}])
+    assert Publication.query.filter_by(faculty_id=member.id).count() == 1